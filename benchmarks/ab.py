@@ -0,0 +1,318 @@
+import os
+import sys
+import json
+import glob
+import time
+import shutil
+import argparse
+import resource
+import tempfile
+import subprocess
+
+from datetime import date, datetime
+from collections import Counter
+
+from utils.archive import ARCHIVE_DIR, archived_runs
+from utils.codec import decode_body
+from utils.dates import IST
+from utils.jobs import SCRAPERS
+from utils.records import FIELDS
+from utils.urls import article_id
+from benchmarks.sites import SiteConfig, start_server
+
+
+# --------------------- Constants ---------------------
+
+
+# The sequential path every performance change is compared against. These
+# are settings of the current code, use `--baseline` to compare with the
+# code of an earlier revision
+LEGACY = {
+    "HISTRAL_FETCH_WORKERS": "1",
+    "HISTRAL_LISTING_WORKERS": "1",
+    "HISTRAL_RUN_BUDGET": "0",
+    "HISTRAL_BATCH_SUMMARY": "0",
+    "HISTRAL_AMP": "0",
+    "HISTRAL_CODEC": "default",
+}
+
+# Settings both engines share, every run starts from a clean state
+COMMON = {
+    "HISTRAL_SINK": "jsonl",
+    "HISTRAL_LOG_FORMAT": "json",
+    "HISTRAL_ARTICLE_CACHE": "0",
+    "HISTRAL_SEARCH_INDEX": "0",
+    "HISTRAL_DEFER_FLUSH": "0",
+}
+
+# Differences shown per scraper
+EXAMPLES = 3
+
+
+# --------------------- Engines ---------------------
+
+
+def settings(pairs: list) -> dict:
+    """
+    Environment of `KEY=VALUE` [pairs]
+    """
+    return dict(pair.split("=", 1) for pair in pairs)
+
+
+def run_summary(stderr: str) -> dict:
+    """
+    Summary record of a run logged with `HISTRAL_LOG_FORMAT=json`
+    """
+    for line in reversed(stderr.splitlines()):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+
+        if "summary" in record:
+            return record["summary"]
+
+    return {}
+
+
+def load_articles(export_dir: str) -> dict:
+    """
+    Articles exported by a run, by article id, with decoded bodies
+    """
+    articles = {}
+
+    for path in glob.glob(os.path.join(export_dir, "*", "*.jsonl")):
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                article = json.loads(line)
+
+                if article.get("body"):
+                    article["body"] = decode_body(article["body"])
+
+                articles[article_id(article["src"])] = article
+
+    return articles
+
+
+def checkout(revision: str) -> str:
+    """
+    Detached git worktree of [revision] in a scratch directory
+    """
+    path = tempfile.mkdtemp(prefix="histral-baseline-")
+    subprocess.run(
+        ["git", "worktree", "add", "--detach", path, revision],
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    return path
+
+
+def remove_checkout(path: str) -> None:
+    subprocess.run(["git", "worktree", "remove", "--force", path], check=False)
+
+
+def run_engine(scraper: str, env: dict, server=None, cwd: str = None) -> dict:
+    """
+    Run [scraper] once with [env] into a scratch directory, returns its
+    measures and the articles it wrote. With [cwd] the scraper is imported
+    from that checkout instead of the current tree.
+    """
+    scratch = tempfile.mkdtemp(prefix="histral-ab-")
+    env = dict(
+        env,
+        HISTRAL_EXPORT_DIR=os.path.join(scratch, "exports"),
+        HISTRAL_STATE_DIR=os.path.join(scratch, "state"),
+    )
+
+    if server:
+        server.stats.reset()
+
+    before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-m", scraper],
+        env=env,
+        cwd=cwd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    wall = time.perf_counter() - start
+    after = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    events = run_summary(result.stderr).get("events", {})
+    articles = load_articles(env["HISTRAL_EXPORT_DIR"])
+    shutil.rmtree(scratch, ignore_errors=True)
+
+    # The synthetic sites see every request, replays only go through
+    # `fetch_bytes`
+    if server:
+        requests, size = sum(server.stats.requests.values()), server.stats.bytes
+    else:
+        requests, size = events.get("requests", 0), events.get("bytes", 0)
+
+    return {
+        "wall": wall,
+        "cpu": (after.ru_utime + after.ru_stime) - (before.ru_utime + before.ru_stime),
+        "requests": requests,
+        "megabytes": size / 2**20,
+        "code": result.returncode,
+        "articles": articles,
+    }
+
+
+# --------------------- Comparison ---------------------
+
+
+def diff_articles(legacy: dict, candidate: dict) -> dict:
+    """
+    Field by field differences between the articles of both engines
+    """
+    fields = Counter()
+    examples = []
+
+    for key in legacy.keys() & candidate.keys():
+        for field in FIELDS:
+            before, after = legacy[key].get(field), candidate[key].get(field)
+
+            if before != after:
+                fields[field] += 1
+                examples.append((legacy[key]["src"], field, before, after))
+
+    return {
+        "missing": sorted(
+            legacy[key]["src"] for key in legacy.keys() - candidate.keys()
+        ),
+        "extra": sorted(
+            candidate[key]["src"] for key in candidate.keys() - legacy.keys()
+        ),
+        "fields": fields,
+        "examples": examples[:EXAMPLES],
+    }
+
+
+def short(value, width: int = 60) -> str:
+    text = json.dumps(value, ensure_ascii=False, default=str)
+    return text if len(text) <= width else text[: width - 3] + "..."
+
+
+def report(scraper: str, legacy: dict, candidate: dict, label: str = "legacy") -> bool:
+    """
+    Print the measures and differences of both engines, returns whether
+    they wrote the same articles
+    """
+    print(f"\n{scraper}")
+
+    for name, row in ((label, legacy), ("candidate", candidate)):
+        print(
+            f"  {name:<10}{row['wall']:>9.2f}{row['cpu']:>9.2f}{row['requests']:>10}"
+            f"{row['megabytes']:>8.1f}{len(row['articles']):>10}{row['code']:>6}"
+        )
+
+    diff = diff_articles(legacy["articles"], candidate["articles"])
+    same = not (diff["missing"] or diff["extra"] or diff["fields"])
+
+    if same:
+        print(f"  identical, {legacy['wall'] / max(candidate['wall'], 1e-9):.2f}x wall")
+        return legacy["code"] == candidate["code"]
+
+    for label in ("missing", "extra"):
+        for src in diff[label][:EXAMPLES]:
+            print(f"  {label}: {src}")
+        if len(diff[label]) > EXAMPLES:
+            print(f"  {label}: ... {len(diff[label]) - EXAMPLES} more")
+
+    for field, changed in diff["fields"].items():
+        print(f"  {field}: {changed} articles differ")
+
+    for src, field, before, after in diff["examples"]:
+        print(f"    {src} {field}\n      - {short(before)}\n      + {short(after)}")
+
+    return False
+
+
+# --------------------- Main Execution ---------------------
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare the legacy and a candidate scraping engine"
+    )
+    parser.add_argument("--scrapers", nargs="+", default=list(SCRAPERS))
+    parser.add_argument(
+        "--candidate",
+        nargs="*",
+        default=["HISTRAL_FETCH_WORKERS=8", "HISTRAL_LISTING_WORKERS=4"],
+        help="KEY=VALUE settings of the candidate, on top of the legacy ones",
+    )
+    parser.add_argument(
+        "--legacy", nargs="*", default=[], help="KEY=VALUE overrides of the legacy"
+    )
+    parser.add_argument(
+        "--archive",
+        type=date.fromisoformat,
+        help="Replay the runs archived on this day instead of the synthetic sites",
+    )
+    parser.add_argument(
+        "--baseline",
+        metavar="REVISION",
+        help="Run the legacy engine from this git revision instead of the "
+        "current code",
+    )
+    parser.add_argument("--articles", type=int, default=10, help="Per listing")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds")
+    args = parser.parse_args()
+
+    legacy_env = {**os.environ, **COMMON, **LEGACY, **settings(args.legacy)}
+    candidate_env = {**legacy_env, **settings(args.candidate)}
+
+    if args.archive:
+        server = None
+        runs = {
+            scraper: fetched_at
+            for _, scraper, fetched_at in archived_runs(
+                args.archive, args.archive, args.scrapers
+            )
+        }
+        replay = {
+            "HISTRAL_REPLAY": "1",
+            "HISTRAL_ARCHIVE": "0",
+            "HISTRAL_ARCHIVE_DIR": os.path.abspath(ARCHIVE_DIR),
+        }
+    else:
+        server = start_server(
+            "127.0.0.1", 0, SiteConfig(args.articles, latency=args.latency)
+        )
+        now = time.time()
+        runs = {scraper: now for scraper in args.scrapers}
+        replay = {"HISTRAL_SITE_PROXY": server.url, "HISTRAL_DISCOVERY": "html"}
+
+    baseline = checkout(args.baseline) if args.baseline else None
+    label = "baseline" if baseline else "legacy"
+
+    print(
+        f"  {'engine':<10}{'wall s':>9}{'cpu s':>9}{'requests':>10}{'MB':>8}{'articles':>10}{'exit':>6}"
+    )
+    failed = 0
+
+    try:
+        for scraper, fetched_at in runs.items():
+            # Both engines see the same inputs and the same window
+            pinned = {
+                **replay,
+                "HISTRAL_RUN_TIME": datetime.fromtimestamp(fetched_at, IST).isoformat(),
+            }
+
+            legacy = run_engine(scraper, {**legacy_env, **pinned}, server, baseline)
+            candidate = run_engine(scraper, {**candidate_env, **pinned}, server)
+
+            failed += not report(scraper, legacy, candidate, label)
+    finally:
+        if server:
+            server.shutdown()
+
+        if baseline:
+            remove_checkout(baseline)
+
+    print(f"\n{len(runs) - failed} of {len(runs)} scrapers identical")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,92 @@
+import time
+import argparse
+
+from bs4 import BeautifulSoup
+
+from utils.http import fetch_bytes
+from utils.amp import amp_paragraphs
+from firstpost import common as firstpost
+from hindu import common as hindu
+from ndtv import common as ndtv
+
+
+# --------------------- Constants ---------------------
+
+
+# Outlet -> (AMP URL rewrite, full page body, AMP page body)
+OUTLETS = {
+    "firstpost": (firstpost.amp_url, "div.art-content p", firstpost.AMP_BODY),
+    "hindu": (hindu.amp_url, "div.articlebodycontent p", hindu.AMP_BODY),
+    "ndtv": (ndtv.amp_url, "div[itemprop=articleBody] p", ndtv.AMP_BODY),
+}
+
+
+# --------------------- Benchmark ---------------------
+
+
+def measure(data: bytes, selector: str, repeat: int) -> tuple:
+    """
+    Best parse and body extraction time of [data] over [repeat] runs,
+    along with the number of paragraphs found
+    """
+    best, found = float("inf"), 0
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        soup = BeautifulSoup(data, "html.parser")
+        found = len(amp_paragraphs(soup, selector))
+        best = min(best, time.perf_counter() - start)
+        soup.decompose()
+
+    return best, found
+
+
+# --------------------- Main Execution ---------------------
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark AMP vs full pages")
+    parser.add_argument("outlet", choices=OUTLETS)
+    parser.add_argument("urls", nargs="+", help="Article URLs of the outlet")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rewrite, full_body, amp_body = OUTLETS[args.outlet]
+    totals = [0, 0, 0.0, 0.0]
+
+    print(f"{'page':<8}{'full KB':>10}{'amp KB':>10}{'full ms':>10}{'amp ms':>10}")
+
+    for index, URL in enumerate(args.urls):
+        full_data = fetch_bytes(URL)
+        amp_data = fetch_bytes(rewrite(URL) or "")
+
+        if not full_data or not amp_data:
+            print(f"#{index:<7}unavailable: {URL}")
+            continue
+
+        full_time, full_found = measure(full_data, full_body, args.repeat)
+        amp_time, amp_found = measure(amp_data, amp_body, args.repeat)
+
+        if amp_found == 0:
+            print(f"#{index:<7}no AMP body found, would fall back: {URL}")
+
+        totals = [
+            totals[0] + len(full_data),
+            totals[1] + len(amp_data),
+            totals[2] + full_time,
+            totals[3] + amp_time,
+        ]
+        print(
+            f"#{index:<7}{len(full_data) / 1024:>10.1f}{len(amp_data) / 1024:>10.1f}"
+            f"{full_time * 1000:>10.1f}{amp_time * 1000:>10.1f}"
+        )
+
+    if totals[1] and totals[3]:
+        print(
+            f"{'total':<8}{totals[0] / 1024:>10.1f}{totals[1] / 1024:>10.1f}"
+            f"{totals[2] * 1000:>10.1f}{totals[3] * 1000:>10.1f}"
+        )
+        print(
+            f"AMP pages are {totals[0] / totals[1]:.1f}x smaller and parse "
+            f"{totals[2] / totals[3]:.1f}x faster"
+        )
@@ -0,0 +1,79 @@
+import time
+import random
+import argparse
+import tempfile
+
+from histral_core.encode import encode_text, decode_text
+
+from utils import codec
+from benchmarks.summary import make_articles
+
+
+# --------------------- Benchmark ---------------------
+
+
+def throughput(function, items: list) -> tuple:
+    """
+    Results of [function] over [items] and the MB of input handled per second
+    """
+    size = sum(len(item) for item in items)
+    start = time.perf_counter()
+    results = [function(item) for item in items]
+    elapsed = time.perf_counter() - start
+    return results, size / elapsed / 2**20
+
+
+def report(name: str, texts: list, encode, decode) -> None:
+    payloads, encode_speed = throughput(encode, texts)
+    decoded, decode_speed = throughput(decode, payloads)
+
+    assert decoded == texts, f"{name} does not round trip"
+
+    raw = sum(len(text.encode("utf-8")) for text in texts)
+    encoded = sum(len(payload) for payload in payloads)
+
+    print(
+        f"{name:<20}{encoded / len(texts):>10.0f}B{raw / encoded:>8.2f}x"
+        f"{encode_speed:>10.1f}{decode_speed:>10.1f}"
+    )
+
+
+# --------------------- Main Execution ---------------------
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark body codecs")
+    parser.add_argument("exports", nargs="*", help="JSONL exports, synthetic if none")
+    parser.add_argument("--articles", type=int, default=2000)
+    parser.add_argument("--dict-size", type=int, default=32 * 1024)
+    args = parser.parse_args()
+
+    if args.exports:
+        texts = codec.corpus(args.exports)
+    else:
+        # Summaries are a handful of sentences
+        texts = make_articles(args.articles, 6)
+
+    random.shuffle(texts)
+    train, test = texts[: len(texts) // 2], texts[len(texts) // 2 :]
+
+    # Trained in a scratch directory, the real dictionaries are left alone
+    codec.DICT_DIR = tempfile.mkdtemp()
+    dict_id = codec.train_dictionary(train, args.dict_size)
+
+    print(f"{len(test)} texts, {sum(map(len, test)) / len(test):.0f} chars on average")
+    print(f"{'codec':<20}{'avg size':>11}{'ratio':>9}{'enc MB/s':>10}{'dec MB/s':>10}")
+
+    report("encode_text", test, encode_text, decode_text)
+    report(
+        "zstd",
+        test,
+        lambda text: codec.zstd_encode(text, 0),
+        codec.decode_body,
+    )
+    report(
+        "zstd + dictionary",
+        test,
+        lambda text: codec.zstd_encode(text, dict_id),
+        codec.decode_body,
+    )
@@ -0,0 +1,106 @@
+import time
+import random
+import argparse
+
+from datetime import datetime, timedelta
+
+from utils import dates
+from utils.dates import IST, CURRENT_TIME_IST, YESTERDAY_8PM, TODAY_8PM
+
+
+# --------------------- Constants ---------------------
+
+
+# Outlet -> (strptime format used before `utils.dates`, listing format)
+FORMATS = {
+    dates.FP: ("%B %d, %Y, %H:%M:%S", "%B %d, %Y, %H:%M:%S IST"),
+    dates.HINDU: ("%B %d, %Y %I:%M %p", "%B %d, %Y %I:%M %p IST"),
+    dates.ISN: ("%d %b %Y %H:%M", "%d %b %Y %H:%M"),
+    dates.NDTV: ("%A %B %d %Y", "%A %B %d %Y"),
+    dates.NDTV_CRICKET: ("%b %d, %Y", "%b %d, %Y"),
+}
+
+
+# --------------------- Benchmark ---------------------
+
+
+def make_dates(listing_format: str, count: int, distinct: int) -> list:
+    """
+    [count] listing dates drawn from [distinct] publication times around
+    the window, listings repeat the same dates a lot
+    """
+    times = [
+        CURRENT_TIME_IST - timedelta(minutes=random.randint(0, 3 * 24 * 60))
+        for _ in range(distinct)
+    ]
+    return [random.choice(times).strftime(listing_format) for _ in range(count)]
+
+
+def legacy(date_strs: list, strptime_format: str) -> int:
+    """
+    Per item strptime, then ISO round trip and `astimezone` for the window
+    check, as the outlets did before
+    """
+    found = 0
+
+    for date_str in date_strs:
+        try:
+            date_object = datetime.strptime(
+                date_str.replace("IST", "").strip(), strptime_format
+            )
+            iso_time = IST.localize(date_object).isoformat()
+        except ValueError:
+            continue
+
+        date_timezone = datetime.fromisoformat(iso_time).astimezone(IST)
+
+        if YESTERDAY_8PM <= date_timezone <= TODAY_8PM:
+            found += 1
+
+    return found
+
+
+def unified(date_strs: list, outlet: str) -> int:
+    found = 0
+
+    for date_str in date_strs:
+        date_object = dates.parse_date(outlet, date_str)
+
+        if date_object is not None and dates.in_window(date_object):
+            found += 1
+
+    return found
+
+
+def timed(function, *args) -> tuple:
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+# --------------------- Main Execution ---------------------
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark date normalization")
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--distinct", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'outlet':<14}{'legacy':>12}{'unified':>12}{'speedup':>10}")
+
+    for outlet, (strptime_format, listing_format) in FORMATS.items():
+        date_strs = make_dates(listing_format, args.count, args.distinct)
+        dates.parse_date.cache_clear()
+
+        legacy_time, legacy_found = timed(legacy, date_strs, strptime_format)
+        unified_time, unified_found = timed(unified, date_strs, outlet)
+
+        # Day only formats are compared against the exact time by legacy
+        if outlet in (dates.FP, dates.HINDU, dates.ISN):
+            assert legacy_found == unified_found, (outlet, legacy_found, unified_found)
+
+        print(
+            f"{outlet:<14}{legacy_time * 1000:>10.1f}ms{unified_time * 1000:>10.1f}ms"
+            f"{legacy_time / unified_time:>9.1f}x"
+        )
@@ -0,0 +1,118 @@
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.jobs import SCRAPERS
+from benchmarks.sites import SiteConfig, start_server
+
+
+# --------------------- Load Test ---------------------
+
+
+def run_scraper(scraper: str, env: dict) -> tuple:
+    """
+    Run the entry point [scraper] against the synthetic sites, returns its
+    duration and exit code
+    """
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-m", scraper],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - start, result.returncode
+
+
+def run_scale(server, scrapers: list, parallel: int) -> dict:
+    """
+    Run [scrapers], [parallel] at a time, with the null sink and a scratch
+    directory for the local state and stores, so only the scraping path is
+    measured and nothing outside of it is written
+    """
+    server.stats.reset()
+
+    scratch = tempfile.mkdtemp(prefix="histral-load-")
+    env = dict(
+        os.environ,
+        HISTRAL_SITE_PROXY=server.url,
+        HISTRAL_SINK="null",
+        HISTRAL_DISCOVERY="html",
+        HISTRAL_SEARCH_INDEX="0",
+        HISTRAL_DEFER_FLUSH="0",
+        HISTRAL_EXPORT_DIR=os.path.join(scratch, "exports"),
+        HISTRAL_STATE_DIR=os.path.join(scratch, "state"),
+    )
+
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(parallel) as executor:
+        results = list(executor.map(lambda name: run_scraper(name, env), scrapers))
+
+    wall = time.perf_counter() - start
+    shutil.rmtree(scratch, ignore_errors=True)
+    articles = server.stats.requests["article"]
+
+    return {
+        "articles": articles,
+        "wall": wall,
+        "throughput": articles / wall,
+        "p50": server.stats.percentile(0.5),
+        "p95": server.stats.percentile(0.95),
+        "slowest": max(duration for duration, _ in results),
+        "failed": sum(1 for _, code in results if code != 0),
+        "megabytes": server.stats.bytes / 2**20,
+    }
+
+
+# --------------------- Main Execution ---------------------
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the scrapers locally")
+    parser.add_argument("--scrapers", nargs="+", default=list(SCRAPERS))
+    parser.add_argument(
+        "--scales", default="1,10", help="Multipliers of --articles, comma separated"
+    )
+    parser.add_argument("--articles", type=int, default=5, help="Per listing at 1x")
+    parser.add_argument("--pages", type=int, default=2, help="NDTV listing pages")
+    parser.add_argument("--paragraphs", type=int, default=12)
+    parser.add_argument("--words", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Seconds")
+    parser.add_argument("--parallel", type=int, default=4, help="Scrapers at once")
+    args = parser.parse_args()
+
+    config = SiteConfig(
+        args.articles,
+        args.pages,
+        args.paragraphs,
+        args.words,
+        args.latency,
+        args.jitter,
+    )
+    server = start_server("127.0.0.1", 0, config)
+
+    print(
+        f"{'scale':>6}{'articles':>10}{'MB':>8}{'wall s':>9}{'art/s':>9}"
+        f"{'p50 ms':>9}{'p95 ms':>9}{'slowest s':>11}{'failed':>8}"
+    )
+
+    for scale in map(int, args.scales.split(",")):
+        config.articles = args.articles * scale
+        row = run_scale(server, args.scrapers, args.parallel)
+
+        print(
+            f"{scale:>5}x{row['articles']:>10}{row['megabytes']:>8.1f}"
+            f"{row['wall']:>9.2f}{row['throughput']:>9.1f}"
+            f"{row['p50'] * 1000:>9.1f}{row['p95'] * 1000:>9.1f}"
+            f"{row['slowest']:>11.2f}{row['failed']:>8}"
+        )
+
+    server.shutdown()
@@ -0,0 +1,407 @@
+import json
+import time
+import random
+import argparse
+import threading
+
+from datetime import datetime
+from urllib.parse import parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.dates import IST, WINDOW_START, WINDOW_END
+from benchmarks.summary import WORDS
+
+
+# --------------------- Constants ---------------------
+
+
+# Last path segment of every generated article
+ARTICLE_PREFIX = "synthetic-"
+
+# Publication times are drawn up to this instant, so the same article is
+# served identically for the whole life of the server
+STARTED_AT = time.time()
+
+
+# --------------------- Site Config ---------------------
+
+
+class SiteConfig:
+    """
+    Shape of the generated sites, can be changed while the server runs
+    """
+
+    def __init__(
+        self,
+        articles: int = 20,
+        pages: int = 3,
+        paragraphs: int = 12,
+        words: int = 40,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        jsonld: bool = True,
+    ):
+        self.articles = articles
+        self.pages = pages
+        self.paragraphs = paragraphs
+        self.words = words
+        self.latency = latency
+        self.jitter = jitter
+        self.jsonld = jsonld
+
+
+class SiteStats:
+    """
+    Requests served by the synthetic sites, with their latencies
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self.lock:
+            self.requests = {"listing": 0, "article": 0, "missing": 0}
+            self.latencies = []
+            self.bytes = 0
+
+    def record(self, kind: str, latency: float, size: int) -> None:
+        with self.lock:
+            self.requests[kind] += 1
+            self.latencies.append(latency)
+            self.bytes += size
+
+    def percentile(self, share: float) -> float:
+        with self.lock:
+            latencies = sorted(self.latencies)
+
+        if not latencies:
+            return 0.0
+
+        return latencies[min(len(latencies) - 1, int(len(latencies) * share))]
+
+
+# --------------------- Content ---------------------
+
+
+def published(seed: int) -> datetime:
+    """
+    Publication time of article [seed], always inside the current window
+    """
+    start = WINDOW_START + 60
+    end = max(start, min(WINDOW_END, STARTED_AT) - 60)
+    return datetime.fromtimestamp(random.Random(seed).uniform(start, end), IST)
+
+
+def paragraphs(seed: int, config: SiteConfig) -> list:
+    generator = random.Random(seed)
+    result = []
+
+    for _ in range(config.paragraphs):
+        words = generator.choices(WORDS, k=config.words)
+        sentences = [
+            " ".join(words[index : index + 10]).capitalize() + "."
+            for index in range(0, len(words), 10)
+        ]
+        result.append(" ".join(sentences))
+
+    return result
+
+
+def jsonld(seed: int, title: str, config: SiteConfig) -> str:
+    if not config.jsonld:
+        return ""
+
+    data = {
+        "@context": "https://schema.org",
+        "@type": "NewsArticle",
+        "headline": title,
+        "datePublished": published(seed).isoformat(),
+        "dateModified": published(seed).isoformat(),
+        "author": [{"@type": "Person", "name": f"Reporter {seed % 17}"}],
+    }
+    return f'<script type="application/ld+json">{json.dumps(data)}</script>'
+
+
+def page(head: str, body: str) -> str:
+    return f"<!DOCTYPE html><html><head>{head}</head><body>{body}</body></html>"
+
+
+def article_seed(path: str) -> int:
+    name = path.rstrip("/").rsplit("/", 1)[-1]
+    return int("".join(c for c in name[len(ARTICLE_PREFIX) :] if c.isdigit()) or 0)
+
+
+def listing_page(path: str) -> tuple:
+    """
+    (section, page number) of a listing paginated with `/page/N/`
+    """
+    section, _, number = path.rstrip("/").partition("/page/")
+    return section or "/", int(number) if number.isdigit() else 1
+
+
+def listing_seeds(path: str, count: int, page_number: int = 1) -> list:
+    base = (sum(map(ord, path)) % 1000) * 100_000 + page_number * 1000
+    return [base + index for index in range(count)]
+
+
+# --------------------- Outlets ---------------------
+
+
+def firstpost(path: str, config: SiteConfig) -> tuple:
+    if not path.rsplit("/", 1)[-1].startswith(ARTICLE_PREFIX):
+        section, page_number = listing_page(path)
+
+        if page_number > config.pages:
+            return "listing", page("", "")
+
+        anchors = "".join(
+            f'<a class="en-nw-list" href="/india/{ARTICLE_PREFIX}{seed}.html">'
+            f"Story {seed}</a>"
+            for seed in listing_seeds(section, config.articles, page_number)
+        )
+        return "listing", page("", f"<div>{anchors}</div>")
+
+    seed = article_seed(path)
+    title = f"FirstPost story {seed}"
+    date = published(seed).strftime("%B %d, %Y, %H:%M:%S IST")
+    body = "".join(f"<p>{text}</p>" for text in paragraphs(seed, config))
+
+    return "article", page(
+        jsonld(seed, title, config),
+        f"<h1>{title}</h1>"
+        f'<div class="art-desc"><p><span>Summary of {title}.</span></p></div>'
+        f'<div class="art-dtls-info">Reporter {seed % 17} • {date}</div>'
+        f'<div class="art-content">{body}</div>'
+        f'<div class="tag-cont-wp">\nIndia\nPolitics\n</div>',
+    )
+
+
+def hindu(path: str, config: SiteConfig) -> tuple:
+    if not path.rsplit("/", 1)[-1].startswith(ARTICLE_PREFIX):
+        section, page_number = listing_page(path)
+
+        if page_number > config.pages:
+            return "listing", page("", "")
+
+        divs = "".join(
+            f'<div class="element row-element"><a href="https://www.thehindu.com'
+            f'{section.rstrip("/")}/{ARTICLE_PREFIX}{seed}.ece">Story {seed}</a></div>'
+            for seed in listing_seeds(section, config.articles, page_number)
+        )
+        return "listing", page("", divs)
+
+    seed = article_seed(path)
+    title = f"Hindu story {seed}"
+    date = published(seed).strftime("%B %d, %Y %I:%M %p IST")
+    body = "".join(f"<p>{text}</p>" for text in paragraphs(seed, config))
+
+    return "article", page(
+        jsonld(seed, title, config),
+        f'<h1 class="title">{title}</h1>'
+        f'<h2 class="sub-title">Summary of {title}.</h2>'
+        f'<p class="publish-time-new">Published - {date}</p>'
+        f'<div class="author">Reporter {seed % 17}</div>'
+        f'<div class="articlebodycontent">{body}</div>',
+    )
+
+
+def ndtv(path: str, config: SiteConfig) -> tuple:
+    last = path.rstrip("/").rsplit("/", 1)[-1]
+
+    if not last.startswith(ARTICLE_PREFIX):
+        page_number = int(last[5:]) if last.startswith("page-") else 1
+        section = path.rsplit("/page-", 1)[0].rstrip("/")
+
+        if page_number > config.pages:
+            return "listing", page("", "")
+
+        items = "".join(
+            f'<div class="news_Itm"><a href="https://www.ndtv.com{section}/'
+            f'{ARTICLE_PREFIX}{seed}">Story {seed}</a><span class="posted-by">'
+            f"Reporter | {published(seed):%A %B %d, %Y}, {published(seed):%I:%M %p}"
+            f"</span></div>"
+            for seed in listing_seeds(section, config.articles, page_number)
+        )
+        return "listing", page("", items)
+
+    seed = article_seed(path)
+    title = f"NDTV story {seed}"
+    body = "".join(f"<p>{text}</p>" for text in paragraphs(seed, config))
+
+    return "article", page(
+        jsonld(seed, title, config),
+        f'<div class="content"><h1>{title}</h1><h2>Summary of {title}.</h2>'
+        f'<nav class="pst-by"><span itemprop="author"><span itemprop="name">'
+        f"Reporter {seed % 17}</span></span>"
+        f'<span itemprop="dateModified" content="{published(seed).isoformat()}">'
+        f"</span></nav>"
+        f'<div itemprop="articleBody">{body}</div></div>',
+    )
+
+
+def ndtv_sports(path: str, config: SiteConfig) -> tuple:
+    if not path.rsplit("/", 1)[-1].startswith(ARTICLE_PREFIX):
+        items = "".join(
+            f'<div class="lst-pg-a"><a class="lst-pg_ttl" href="/cricket/'
+            f'{ARTICLE_PREFIX}{seed}">Story {seed}</a>'
+            f'<span class="lst-a_pst_lnk">{published(seed):%b %d, %Y}</span></div>'
+            for seed in listing_seeds(path, config.articles)
+        )
+        return "listing", page("", items)
+
+    seed = article_seed(path)
+    title = f"NDTV cricket story {seed}"
+    body = "".join(f"<p>{text}</p>" for text in paragraphs(seed, config))
+
+    return "article", page(
+        jsonld(seed, title, config),
+        f'<article class="vjl-lg-9"><h1>{title}</h1><h2>Summary of {title}.</h2>'
+        f'<nav class="pst-by"><meta itemprop="datePublished" '
+        f'content="{published(seed).isoformat()}">'
+        f'<span itemprop="name">Reporter {seed % 17}</span></nav>'
+        f"{body}</article>",
+    )
+
+
+def isn(path: str, config: SiteConfig) -> tuple:
+    if not path.rsplit("/", 1)[-1].startswith(ARTICLE_PREFIX):
+        section = path.rstrip("/")
+        seeds = listing_seeds(section, config.articles)
+        featured = (
+            f'<div class="article-box"><a href="{section}/{ARTICLE_PREFIX}'
+            f'{seeds[0]}">Story</a></div>'
+            if seeds
+            else ""
+        )
+        sections = "".join(
+            f'<section class="page"><a href="{section}/{ARTICLE_PREFIX}{seed}">'
+            f"Story {seed}</a></section>"
+            for seed in seeds[1:]
+        )
+        return "listing", page("", f'<div class="main">{featured}{sections}</div>')
+
+    seed = article_seed(path)
+    title = f"ISN story {seed}"
+    body = "".join(f"<p>{text}</p>" for text in paragraphs(seed, config))
+
+    return "article", page(
+        jsonld(seed, title, config),
+        f"<h1>{title}</h1>"
+        f'<time class="date">{published(seed):%d %b %Y %H:%M}</time>'
+        f'<div class="author">\nReporter {seed % 17}\n</div>'
+        f'<div class="article">{body}</div>'
+        f'<div class="tags-category"><a>News</a></div>'
+        f'<div class="tags-category"><a>Funding</a><a>Startups</a></div>',
+    )
+
+
+OUTLETS = {
+    "www.firstpost.com": firstpost,
+    "www.thehindu.com": hindu,
+    "www.ndtv.com": ndtv,
+    "sports.ndtv.com": ndtv_sports,
+    "indianstartupnews.com": isn,
+}
+
+
+# --------------------- Server ---------------------
+
+
+class SiteServer(ThreadingHTTPServer):
+    """
+    Serves the synthetic outlets under `http://<address>/<outlet host>/<path>`,
+    the address scrapers are pointed at with `HISTRAL_SITE_PROXY`
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple, config: SiteConfig = None):
+        super().__init__(address, SiteHandler)
+        self.config = config or SiteConfig()
+        self.stats = SiteStats()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class SiteHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        start = time.perf_counter()
+        config = self.server.config
+
+        host, _, path = self.path.lstrip("/").partition("/")
+        outlet = OUTLETS.get(host)
+
+        if config.latency or config.jitter:
+            time.sleep(max(0.0, random.gauss(config.latency, config.jitter)))
+
+        if outlet is None:
+            kind, status, content = "missing", 404, page("", "Not Found")
+        else:
+            path, _, query = path.partition("?")
+            number = parse_qs(query).get("page", [""])[0]
+
+            # Listings paginated with `?page=N` are served as `/page/N/`
+            if number.isdigit():
+                path = f"{path.rstrip('/')}/page/{number}/"
+
+            kind, content = outlet("/" + path, config)
+            status = 200
+
+        data = content.encode("utf-8")
+
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+        self.server.stats.record(kind, time.perf_counter() - start, len(data))
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(host: str, port: int, config: SiteConfig = None) -> SiteServer:
+    """
+    Start a [SiteServer] in a background thread
+    """
+    server = SiteServer((host, port), config)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# --------------------- Main Execution ---------------------
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Synthetic news sites")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--articles", type=int, default=20, help="Per listing")
+    parser.add_argument(
+        "--pages", type=int, default=3, help="Listing pages per section"
+    )
+    parser.add_argument("--paragraphs", type=int, default=12)
+    parser.add_argument("--words", type=int, default=40, help="Per paragraph")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Seconds")
+    parser.add_argument("--no-jsonld", action="store_true")
+    args = parser.parse_args()
+
+    config = SiteConfig(
+        args.articles,
+        args.pages,
+        args.paragraphs,
+        args.words,
+        args.latency,
+        args.jitter,
+        not args.no_jsonld,
+    )
+    server = SiteServer((args.host, args.port), config)
+
+    print(f"Serving synthetic sites, run scrapers with HISTRAL_SITE_PROXY={server.url}")
+    server.serve_forever()
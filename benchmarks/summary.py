@@ -0,0 +1,93 @@
+import time
+import random
+import argparse
+
+from histral_core.summery import extractive_summary
+
+from utils.summary import summarize_batch
+
+
+# --------------------- Constants ---------------------
+
+
+# Share of the body kept by each outlet
+PERCENTAGES = (0.25, 0.34, 0.6, 0.8)
+
+WORDS = (
+    "government minister policy startup funding market shares investors "
+    "growth india court order election party match series wicket runs "
+    "technology launch company quarter profit revenue rupee crore report "
+    "state police official statement district rain flood city project"
+).split()
+
+
+# --------------------- Benchmark ---------------------
+
+
+def make_articles(count: int, sentences: int) -> list:
+    """
+    [count] synthetic article bodies of about [sentences] sentences each
+    """
+
+    def sentence():
+        words = random.choices(WORDS, k=random.randint(8, 24))
+        return " ".join(words).capitalize() + "."
+
+    return [
+        " ".join(sentence() for _ in range(random.randint(sentences // 2, sentences)))
+        for _ in range(count)
+    ]
+
+
+def per_article(texts: list, percentages: list) -> list:
+    """
+    One `extractive_summary` call per text, as the outlets do by default
+    """
+    return [
+        extractive_summary(text, percentage=percentage)
+        for text, percentage in zip(texts, percentages)
+    ]
+
+
+def engine_per_article(texts: list, percentages: list) -> list:
+    """
+    The batch engine fed one text at a time, isolates the gain of batching
+    """
+    return [
+        summarize_batch([text], [percentage])[0]
+        for text, percentage in zip(texts, percentages)
+    ]
+
+
+def timed(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+# --------------------- Main Execution ---------------------
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark batched summaries")
+    parser.add_argument("--articles", type=int, default=500)
+    parser.add_argument("--sentences", type=int, default=40)
+    args = parser.parse_args()
+
+    texts = make_articles(args.articles, args.sentences)
+    percentages = [random.choice(PERCENTAGES) for _ in texts]
+
+    results = {
+        "extractive_summary": timed(per_article, texts, percentages),
+        "engine, per article": timed(engine_per_article, texts, percentages),
+        "engine, batched": timed(summarize_batch, texts, percentages),
+    }
+    baseline = results["extractive_summary"]
+
+    print(f"{'path':<22}{'total':>10}{'per article':>14}{'speedup':>10}")
+
+    for name, total in results.items():
+        print(
+            f"{name:<22}{total * 1000:>8.1f}ms"
+            f"{total / len(texts) * 1000:>12.2f}ms{baseline / total:>9.1f}x"
+        )
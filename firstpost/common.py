@@ -1,164 +1,189 @@
-import pytz
 import logging as Logger
 
-from datetime import datetime, timedelta
 from histral_core.types import NewsArticle
-from histral_core.scraper import fetch_soup
-from histral_core.encode import encode_text
-from histral_core.summery import extractive_summary
+from utils.cache import cached
+from utils.discovery import crawl_listings
+from utils.amp import fetch_article, amp_paragraphs
+from utils.jsonld import article_time
+from utils.logs import setup_logging, trace
+from utils.memory import open_soup, open_html
+from utils.summary import summarize
+from utils.urls import clean_url
+from utils.liveblog import summarize_body
+from utils.dates import CURRENT_TIME_IST, FP, parse_date, in_window
 
 
 # --------------------- Logging Setup ---------------------
 
 
-Logger.basicConfig(
-    level=Logger.INFO,
-    format="[%(levelname)s] (%(asctime)s) -> %(message)s",
-    handlers=[
-        Logger.StreamHandler(),
-    ],
-)
+setup_logging()
 
 
 # --------------------- Constants ---------------------
 
 BASE_URL = "https://www.firstpost.com"
 
-IST = pytz.timezone("Asia/Kolkata")
+# Share of the body and sub heading kept in summaries
+BODY_SUMMARY = 0.34
+SUB_HEADING_SUMMARY = 0.8
 
-CURRENT_TIME_IST = datetime.now(IST)
-TODAY_8PM = CURRENT_TIME_IST.replace(
-    hour=20,
-    minute=0,
-    second=0,
-    microsecond=0,
-)
-YESTERDAY_8PM = CURRENT_TIME_IST.replace(
-    hour=20,
-    minute=0,
-    second=0,
-    microsecond=0,
-) - timedelta(days=1)
+# Article body of the AMP pages
+AMP_BODY = "div.art-content p, div.article-body p, article p"
 
 
 # --------------------- Common Functions ---------------------
 
 
-def parse_date_to_iso(date_str: str) -> str:
+def fetch_page_links(URL) -> list:
     """
-    Adjust the format string to match 'September 13, 2024,12:52:19'
-    and parse in ISO format
+    News posts links of one listing page at [URL], empty if it has none
     """
-    try:
-        # Check if [date_str] contains "IST" and remove it
-        date_str = date_str.replace("IST", "").strip()
-
-        date_object = datetime.strptime(date_str.strip(), "%B %d, %Y, %H:%M:%S")
-        return date_object.isoformat()
-    except ValueError as e:
-        Logger.error(f"FATAL: Failed to parse time '{date_str}' to ISO: {e}")
-        return None
-
-
-def fetch_all_news_links(URL):
-    """
-    Fetch all news posts links from the given URL
-    """
-    try:
-        news_links = []
-        base_soup = fetch_soup(URL)
+    news_links = []
 
+    with open_soup(URL) as base_soup:
         if not base_soup:
-            Logger.error(f"ERROR: Unable to find any links from - {URL}")
             return news_links
 
         news_anchors = base_soup.find_all("a", class_=["en-nw-list", "en-nw"])
 
-        if (news_anchors == None) or (len(news_anchors) == 0):
-            Logger.error(f"ERROR: No news links found in - {URL}")
-            return news_links
-
-        for a_tag in news_anchors:
+        for a_tag in news_anchors or []:
             if a_tag and a_tag["href"]:
-                news_links.append(a_tag["href"])
+                news_links.append(clean_url(a_tag["href"], URL))
 
-        Logger.info(f"TRACE: Found {len(news_links)} news links in {URL}")
-        return news_links
-    except Exception as e:
-        Logger.error(f"ERROR: Unable to fetch news links: {e}")
-        return []
+    Logger.info(f"TRACE: Found {len(news_links)} news links in {URL}")
+    return news_links
 
 
-def fetch_news(URL) -> NewsArticle | None:
+def page_url(URL: str, page: int) -> str:
     """
-    Fetch [NewsArticle] from news link
+    Address of the listing page number [page] of the section [URL]
     """
-    try:
-        news_soup = fetch_soup(URL)
+    if page == 1:
+        return URL
 
-        if not news_soup:
-            return None
+    return f"{URL.rstrip('/')}/page/{page}/"
 
-        # News Title
-        news_title = (
-            news_soup.find("h1").text if news_soup.find("h1") else "Title not found"
-        )
 
-        sub_heading_element = news_soup.find("div", class_="art-desc")
-        sub_heading_p = sub_heading_element.find("p") if sub_heading_element else None
+def fetch_listing_links(URLS: list):
+    """
+    Stream the links of the paginated listings of the sections [URLS]
+    """
+    return crawl_listings(URLS, page_url, fetch_page_links)
 
-        # News SubHeading
-        news_sub_heading = sub_heading_p.find("span").text if sub_heading_p else ""
 
-        art_details_info = news_soup.find("div", class_="art-dtls-info")
+def amp_url(URL: str) -> str | None:
+    """
+    AMP variant of the article [URL], served under `/amp` on the same path
+    """
+    if not URL.startswith(BASE_URL) or URL.startswith(f"{BASE_URL}/amp/"):
+        return None
 
-        # News Date & Author
-        if art_details_info:
-            details_text = art_details_info.text.split("•")
-            news_date = details_text[-1].strip() if len(details_text) > 1 else ""
-            news_author = details_text[0].strip() if details_text[0].strip() else ""
-        else:
-            news_date, news_author = "", ""
+    return f"{BASE_URL}/amp{URL[len(BASE_URL):]}"
 
-        if len(news_date) == 0:
-            Logger.warning(f"WARN: News Date not found for {URL}")
+
+@cached
+def fetch_news(URL) -> NewsArticle | None:
+    """
+    Fetch [NewsArticle] from news link
+    """
+    try:
+        data, metadata, amp = fetch_article(URL, amp_url(URL))
+
+        if not data:
             return None
 
-        # Format news date in ISO format
-        news_date = parse_date_to_iso(news_date)
+        # JSON-LD metadata is read from the raw page, pages outside of the
+        # time window are skipped without being parsed
+        news_time = article_time(metadata, "date_published", "date_modified")
 
-        if news_date == None:
-            Logger.warning(f"WARN: Unable to parse News Date for {URL}")
+        if news_time is not None and not in_window(news_time):
+            trace("skipped", "Skipping news outside of time window: %s", URL)
             return None
 
-        news_body_p_list = (
-            news_soup.find("div", class_="art-content").find_all("p")
-            if news_soup.find("div", class_="art-content")
-            else []
-        )
+        with open_html(data) as news_soup:
+            if not news_soup:
+                return None
 
-        # News Body
-        news_body = "".join([p.text for p in news_body_p_list])
+            # News Title
+            news_title = metadata.get("headline") or (
+                news_soup.find("h1").text if news_soup.find("h1") else "Title not found"
+            )
 
-        tags_data = news_soup.find("div", class_="tag-cont-wp")
+            sub_heading_element = news_soup.find("div", class_="art-desc")
+            sub_heading_p = (
+                sub_heading_element.find("p") if sub_heading_element else None
+            )
 
-        # News Tags
-        if tags_data:
-            news_tags = [
-                tag.strip() for tag in tags_data.text.split("\n") if tag.strip()
-            ]
-        else:
-            news_tags = None
+            # News SubHeading
+            if sub_heading_p and sub_heading_p.find("span"):
+                news_sub_heading = sub_heading_p.find("span").text
+            else:
+                news_sub_heading = metadata.get("description", "") if amp else ""
+
+            news_author = metadata["authors"][0] if metadata.get("authors") else ""
+
+            # News Date & Author, from the page when JSON-LD is missing
+            if news_time is None or not news_author:
+                art_details_info = news_soup.find("div", class_="art-dtls-info")
+
+                if art_details_info:
+                    details_text = art_details_info.text.split("•")
+                    news_date = (
+                        details_text[-1].strip() if len(details_text) > 1 else ""
+                    )
+                    news_author = news_author or details_text[0].strip()
+                else:
+                    news_date = ""
+
+                if news_time is None:
+                    if len(news_date) == 0:
+                        Logger.warning(f"WARN: News Date not found for {URL}")
+                        return None
+
+                    news_time = parse_date(FP, news_date)
+
+                    if news_time == None:
+                        Logger.warning(f"WARN: Unable to parse News Date for {URL}")
+                        return None
+
+                    if not in_window(news_time):
+                        trace(
+                            "skipped", "Skipping news outside of time window: %s", URL
+                        )
+                        return None
+
+            # Format news date in ISO format
+            news_date = news_time.isoformat()
+
+            if amp:
+                news_body_p_list = amp_paragraphs(news_soup, AMP_BODY)
+            else:
+                news_body_p_list = [
+                    p.text
+                    for p in (
+                        news_soup.find("div", class_="art-content").find_all("p")
+                        if news_soup.find("div", class_="art-content")
+                        else []
+                    )
+                ]
+
+            tags_data = news_soup.find("div", class_="tag-cont-wp")
+
+            # News Tags
+            if tags_data:
+                news_tags = [
+                    tag.strip() for tag in tags_data.text.split("\n") if tag.strip()
+                ]
+            else:
+                news_tags = None
 
         # Summarize and compress news body
-        body_summary = extractive_summary(news_body, percentage=0.34)
-        body_summary = encode_text(body_summary)
+        body_summary = summarize_body(
+            URL, news_body_p_list, BODY_SUMMARY, metadata, separator=""
+        )
 
         if news_sub_heading:
-            sub_heading_summary = extractive_summary(
-                news_sub_heading,
-                percentage=0.8,
-            )
+            sub_heading_summary = summarize(news_sub_heading, SUB_HEADING_SUMMARY)
         else:
             sub_heading_summary = ""
 
@@ -172,33 +197,8 @@ def fetch_news(URL) -> NewsArticle | None:
             src=URL,
         )
 
-        Logger.info(f"TRACE: Fetched news from {URL}")
+        trace("fetched", "Fetched news from %s", URL)
         return news
     except Exception as e:
         Logger.error(f"ERROR: Unable to fetch news from {URL}: {e}")
         return None
-
-
-def filter_news_data(DATA: list) -> list:
-    filtered_list = []
-
-    for item in DATA:
-        if item is None:
-            continue
-
-        iso_time = item["timestamp"]
-
-        try:
-            date_obj = datetime.fromisoformat(iso_time)
-            date_timezone = date_obj.astimezone(IST)
-
-            if YESTERDAY_8PM <= date_timezone <= TODAY_8PM:
-                filtered_list.append(item)
-        except ValueError:
-            Logger.warning(f"WARN: Skipping invalid date format: {iso_time}")
-
-    Logger.info(
-        f"TRACE: Found total {len(filtered_list)} news between yesterday 8PM and today 8PM"
-    )
-
-    return filtered_list
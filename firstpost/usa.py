@@ -1,45 +1,67 @@
-from histral_core.firebase import post_news_list, Category, OutletCode
+import sys
+
+from histral_core.firebase import Category, OutletCode
 
 from firstpost.common import (
-    BASE_URL,
+    BODY_SUMMARY,
+    SUB_HEADING_SUMMARY,
     CURRENT_TIME_IST,
-    fetch_all_news_links,
+    fetch_listing_links,
     fetch_news,
-    filter_news_data,
     Logger,
 )
+from utils.memory import start_memory_report
+from utils.profiler import start_profile
+from utils.logs import start_run_log
+from utils.discovery import discover_links
+from utils.outbox import Outbox, DEFER_FLUSH
+from utils.scheduler import scheduled
+from utils.sinks import SINK
+from utils.summary import SummaryBatcher
 
 # --------------------- Constants ---------------------
 
 
 USA_URL = "https://www.firstpost.com/world/united-states/"
 
+# World feed articles are not grouped by country, so only the listing is read
+USA_FEEDS = []
+USA_PREFIX = ""
+
 
 # --------------------- Main Execution ---------------------
 
 
-try:
-    news_links = fetch_all_news_links(USA_URL)
-    news_data = []
+start_memory_report("FP/USA")
+start_profile("FP/USA")
+start_run_log("FP/USA")
 
-    for link in news_links:
-        news = fetch_news(BASE_URL + link)
+try:
+    outbox = Outbox(CURRENT_TIME_IST.date(), Category.USA, OutletCode.FP)
+    summaries = SummaryBatcher(outbox.append)
+    news_links = discover_links(
+        USA_FEEDS,
+        lambda: fetch_listing_links([USA_URL]),
+        USA_PREFIX,
+    )
 
+    for link, news in scheduled(news_links, fetch_news):
         if news:
-            news_data.append(news.to_dict())
+            summaries.add(news, BODY_SUMMARY, SUB_HEADING_SUMMARY)
 
-    filtered_news_data = filter_news_data(news_data)
-
-    post_news_list(
-        DATA=filtered_news_data,
-        current_date=CURRENT_TIME_IST.date(),
-        category=Category.USA,
-        outlet_code=OutletCode.FP,
-    )
+    summaries.flush()
 
     Logger.info(
-        f"INFO: Posted total *{len(filtered_news_data)}* news articles to firestore"
+        f"TRACE: Found total {len(outbox)} news between yesterday 8PM and today 8PM"
     )
 
+    posted = outbox.flush()
+
+    if DEFER_FLUSH:
+        Logger.info(f"INFO: Queued *{len(outbox)}* news articles in the outbox")
+    else:
+        Logger.info(f"INFO: Posted total *{posted}* news articles to the {SINK} sink")
+
 except Exception as e:
     Logger.critical(f"FATAL: Critical failure during main execution: {e}")
+    sys.exit(1)
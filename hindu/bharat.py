@@ -1,35 +1,58 @@
-from histral_core.firebase import post_news_list, Category, OutletCode
-
-from hindu.common import CURRENT_TIME_IST, Logger, fetch_all_links, fetch_news_from_link
+import sys
+
+from histral_core.firebase import Category, OutletCode
+
+from hindu.common import (
+    BODY_SUMMARY,
+    SUB_HEADING_SUMMARY,
+    CURRENT_TIME_IST,
+    Logger,
+    fetch_listing_links,
+    fetch_news_from_link,
+)
+from utils.memory import start_memory_report
+from utils.profiler import start_profile
+from utils.logs import start_run_log
+from utils.discovery import discover_links
+from utils.outbox import Outbox
+from utils.scheduler import scheduled
+from utils.summary import SummaryBatcher
 
 
 # --------------------- Constants ---------------------
 
 
 NEWS_URL = "https://www.thehindu.com/news/national/"
+NEWS_SECTIONS = [NEWS_URL]
+NEWS_FEEDS = ["https://www.thehindu.com/news/national/feeder/default.rss"]
 
 
 # --------------------- Main Execution ---------------------
 
 
-try:
-    news_objects = []
+start_memory_report("HINDU/BHARAT")
+start_profile("HINDU/BHARAT")
+start_run_log("HINDU/BHARAT")
 
-    news_links = fetch_all_links(NEWS_URL)
+try:
+    outbox = Outbox(CURRENT_TIME_IST.date(), Category.BHARAT, OutletCode.HINDU)
+    summaries = SummaryBatcher(outbox.append)
 
-    for link in news_links:
-        news = fetch_news_from_link(link)
+    news_links = discover_links(
+        NEWS_FEEDS,
+        lambda: fetch_listing_links(NEWS_SECTIONS),
+        NEWS_URL,
+    )
 
+    for link, news in scheduled(news_links, fetch_news_from_link):
         if news:
-            news_objects.append(news.to_dict())
+            summaries.add(news, BODY_SUMMARY, SUB_HEADING_SUMMARY)
 
-    Logger.info(f"INFO: Fetched total {len(news_objects)} news articles")
+    summaries.flush()
 
-    post_news_list(
-        DATA=news_objects,
-        current_date=CURRENT_TIME_IST.date(),
-        category=Category.BHARAT,
-        outlet_code=OutletCode.HINDU,
-    )
+    Logger.info(f"INFO: Fetched total {len(outbox)} news articles")
+
+    outbox.flush()
 except Exception as e:
     Logger.critical(f"FATAL: Critical failure during main execution: {e}")
+    sys.exit(1)
@@ -1,70 +1,56 @@
-import pytz
 import logging as Logger
 
-from datetime import datetime, timedelta
 from histral_core.types import NewsArticle
-from histral_core.scraper import fetch_soup
-from histral_core.encode import encode_text
-from histral_core.summery import extractive_summary
+from utils.cache import cached
+from utils.discovery import crawl_listings
+from utils.amp import fetch_article, amp_paragraphs
+from utils.jsonld import article_time
+from utils.logs import setup_logging, trace
+from utils.memory import open_soup, open_html
+from utils.summary import summarize
+from utils.urls import clean_url
+from utils.dates import CURRENT_TIME_IST, HINDU, parse_date, in_window
 
 
 # --------------------- Logging Setup ---------------------
 
 
-Logger.basicConfig(
-    level=Logger.INFO,
-    format="[%(levelname)s] (%(asctime)s) -> %(message)s",
-    handlers=[
-        Logger.StreamHandler(),
-    ],
-)
+setup_logging()
 
 
 # --------------------- Constants ---------------------
 
 
-IST = pytz.timezone("Asia/Kolkata")
+# Share of the body and sub heading kept in summaries
+BODY_SUMMARY = 0.34
+SUB_HEADING_SUMMARY = 0.8
 
-CURRENT_TIME_IST = datetime.now(IST)
-TODAY_8PM = CURRENT_TIME_IST.replace(
-    hour=20,
-    minute=0,
-    second=0,
-    microsecond=0,
-)
-YESTERDAY_8PM = CURRENT_TIME_IST.replace(
-    hour=20,
-    minute=0,
-    second=0,
-    microsecond=0,
-) - timedelta(days=1)
+# Article body of the AMP pages
+AMP_BODY = "div.articlebodycontent p:not([class]), div.article-text p"
 
 
 # --------------------- Common Functions ---------------------
 
 
-def parse_date_to_iso(date_str: str) -> str:
+def amp_url(NEWS_URL: str) -> str | None:
     """
-    Adjust the format string and parse in ISO format
+    AMP variant of the article [NEWS_URL], served under `<article>.ece/amp/`
     """
-    try:
-        date_str = date_str.replace("IST", "").strip()
-        date_object = datetime.strptime(date_str, "%B %d, %Y %I:%M %p")
-        date_with_timezone = IST.localize(date_object)
-        return date_with_timezone.isoformat()
-    except ValueError as e:
-        Logger.error(f"ERROR: Failed to parse time '{date_str}' to ISO: {e}")
+    if ".ece" not in NEWS_URL:
         return None
 
+    return NEWS_URL.split(".ece")[0] + ".ece/amp/"
 
-def fetch_all_links(BASE_URL: str) -> list:
-    try:
-        base_soup = fetch_soup(BASE_URL)
-        if base_soup is None:
-            Logger.error(f"ERROR: No date found in {BASE_URL}")
-            raise
 
-        links = []
+def fetch_page_links(URL: str) -> list:
+    """
+    News links of one listing page at [URL], empty if it has none
+    """
+    links = []
+
+    with open_soup(URL) as base_soup:
+        if base_soup is None:
+            return links
 
         divs = base_soup.find_all(
             "div",
@@ -72,24 +58,31 @@ def fetch_all_links(BASE_URL: str) -> list:
             in ["element row-element", "element row-element no-border"],
         )
 
-        if len(divs) == 0:
-            Logger.error(f"ERROR: No links found in {BASE_URL}")
-            raise
-
         for div in divs:
             a_tag = div.find("a", href=True)
 
             if a_tag:
-                links.append(a_tag["href"])
+                links.append(clean_url(a_tag["href"], URL))
 
-        Logger.info(f"TRACE: Found total {len(links)} news links.")
+    Logger.info(f"TRACE: Found {len(links)} news links in {URL}")
+    return links
 
-        return links
-    except Exception as e:
-        Logger.error(f"ERROR: Unable to fetch news links: {e}")
-        raise
+
+def page_url(URL: str, page: int) -> str:
+    """
+    Address of the listing page number [page] of the section [URL]
+    """
+    return URL if page == 1 else f"{URL}?page={page}"
 
 
+def fetch_listing_links(URLS: list):
+    """
+    Stream the links of the paginated listings of the sections [URLS]
+    """
+    return crawl_listings(URLS, page_url, fetch_page_links)
+
+
+@cached
 def fetch_news_from_link(NEWS_URL) -> NewsArticle:
     """
     Fetch [NewsArticle] from the news link, return **None** if
@@ -97,59 +90,78 @@ def fetch_news_from_link(NEWS_URL) -> NewsArticle:
     """
 
     try:
-        news_soup = fetch_soup(NEWS_URL)
-        if news_soup is None:
+        data, metadata, amp = fetch_article(NEWS_URL, amp_url(NEWS_URL))
+
+        if not data:
             Logger.warning(f"WARN: Skipping link due to fetch failure: {NEWS_URL}")
             return None
 
-        p_time = news_soup.find("p", class_="publish-time-new")
+        # JSON-LD metadata is read from the raw page, pages outside of the
+        # time window are skipped without being parsed
+        news_time = article_time(metadata, "date_published", "date_modified")
 
-        if not p_time or "-" not in p_time.text:
-            Logger.warning(
-                f"WARN: Publish time not found or invalid format for link: {NEWS_URL}"
-            )
+        if news_time is not None and not in_window(news_time):
+            trace("skipped", "Skipping news outside of time window: %s", NEWS_URL)
             return None
 
-        time_published = p_time.text.split("-")[
-            -2 if len(p_time.text.split("-")) >= 3 else -1
-        ]
+        with open_html(data) as news_soup:
+            if news_soup is None:
+                Logger.warning(f"WARN: Skipping link due to fetch failure: {NEWS_URL}")
+                return None
 
-        news_time_iso = parse_date_to_iso(time_published)
+            if news_time is None:
+                p_time = news_soup.find("p", class_="publish-time-new")
 
-        if not news_time_iso:
-            Logger.warning(f"WARN: No News time found in: {NEWS_URL}")
-            return None
+                if not p_time or "-" not in p_time.text:
+                    Logger.warning(
+                        f"WARN: Publish time not found or invalid format for link: {NEWS_URL}"
+                    )
+                    return None
 
-        news_time = datetime.fromisoformat(news_time_iso)
+                time_published = p_time.text.split("-")[
+                    -2 if len(p_time.text.split("-")) >= 3 else -1
+                ]
 
-        date_timezone = news_time.astimezone(IST)
+                news_time = parse_date(HINDU, time_published)
 
-        if (date_timezone < YESTERDAY_8PM) or (date_timezone > TODAY_8PM):
-            Logger.warning(f"WARN: Skipping invalid date format: {news_time}")
-            return None
+                if not news_time:
+                    Logger.warning(f"WARN: No News time found in: {NEWS_URL}")
+                    return None
 
-        heading = (
-            news_soup.find("h1", class_="title").text
-            if news_soup.find("h1", class_="title")
-            else "Title Not Found"
-        )
-        subHeading = (
-            news_soup.find("h2", class_="sub-title").text
-            if news_soup.find("h2", class_="sub-title")
-            else ""
-        )
+                if not in_window(news_time):
+                    Logger.warning(f"WARN: Skipping invalid date format: {news_time}")
+                    return None
+
+            heading = metadata.get("headline") or (
+                news_soup.find("h1", class_="title").text
+                if news_soup.find("h1", class_="title")
+                else "Title Not Found"
+            )
+            subHeading = (
+                news_soup.find("h2", class_="sub-title").text
+                if news_soup.find("h2", class_="sub-title")
+                else metadata.get("description", "") if amp else ""
+            )
 
-        author = news_soup.find("div", class_="author").text.strip()
-        content_div = news_soup.find("div", class_="articlebodycontent")
-        content = [
-            p_tag.text for p_tag in content_div.find_all("p") if not p_tag.get("class")
-        ]
+            if metadata.get("authors"):
+                author = metadata["authors"][0]
+            else:
+                author = news_soup.find("div", class_="author").text.strip()
+
+            if amp:
+                content = amp_paragraphs(news_soup, AMP_BODY)
+            else:
+                content_div = news_soup.find("div", class_="articlebodycontent")
+                content = [
+                    p_tag.text
+                    for p_tag in content_div.find_all("p")
+                    if not p_tag.get("class")
+                ]
 
         body = " ".join(content)
-        summarized_body = extractive_summary(body, percentage=0.34)
-        summarized_body = encode_text(summarized_body)
+        summarized_body = summarize(body, BODY_SUMMARY, encode=True)
         summarized_subHeading = (
-            extractive_summary(subHeading, percentage=0.8) if subHeading else ""
+            summarize(subHeading, SUB_HEADING_SUMMARY) if subHeading else ""
         )
 
         news = NewsArticle(
@@ -162,6 +174,7 @@ def fetch_news_from_link(NEWS_URL) -> NewsArticle:
             timestamp=news_time,
         )
 
+        trace("fetched", "Fetched news from %s", NEWS_URL)
         return news
     except Exception as e:
         Logger.error(
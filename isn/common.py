@@ -0,0 +1,173 @@
+import logging as Logger
+from histral_core.types import NewsArticle
+from utils.cache import cached
+from utils.http import fetch_bytes
+from utils.jsonld import find_article_metadata, article_time
+from utils.logs import setup_logging, trace
+from utils.memory import open_soup, open_html
+from utils.summary import summarize
+from utils.urls import clean_url
+from utils.dates import CURRENT_TIME_IST, ISN, parse_date, in_window
+from utils.frontier import Frontier, FETCHED, fetch_failed
+
+
+# --------------------- Logging Setup ---------------------
+
+
+setup_logging()
+
+# --------------------- Constants ---------------------
+
+
+NEWS_URLS = [
+    "https://indianstartupnews.com/isn-in-depth",
+    "https://indianstartupnews.com/funding",
+    "https://indianstartupnews.com/government-policy",
+    "https://indianstartupnews.com/news",
+    "https://indianstartupnews.com/reports",
+    "https://indianstartupnews.com/stories",
+    "https://indianstartupnews.com/nextwave-startup-tech-innovation",
+]
+BASE_URL = "https://indianstartupnews.com"
+NEWS_FEEDS = ["https://indianstartupnews.com/sitemap-news.xml"]
+
+# Share of the body kept in summaries
+BODY_SUMMARY = 0.6
+
+
+# --------------------- Common Functions ---------------------
+
+
+def fetch_section_links(URL: str) -> list:
+    """
+    Fetch the featured and listed news links of the section [URL]
+    """
+    try:
+        with open_soup(URL) as base_soup:
+            if base_soup == None:
+                Logger.critical(f"Error: Unable to scrape for {URL}")
+                return []
+
+            main_div = base_soup.find("div", class_="main")
+
+            if main_div == None:
+                Logger.critical(f"Error: Main div not found for {URL}")
+                return []
+
+            news_divs = main_div.find_all("section", class_="page")
+
+            if news_divs == None or len(news_divs) == 0:
+                Logger.critical(f"Error: No news found on {URL}")
+                return []
+
+            featured_article = main_div.find("div", class_="article-box")
+
+            news_links = []
+
+            if featured_article and featured_article.find("a"):
+                link = featured_article.find("a")["href"]
+                news_links.append(clean_url(link, BASE_URL))
+
+            for div in news_divs:
+                link = div.find("a")["href"]
+                news_links.append(clean_url(link, BASE_URL))
+
+        Logger.info(f"TRACE: Found total {len(news_links)} links in {URL}")
+        return news_links
+    except Exception as e:
+        Logger.error(f"ERROR: Unable to fetch news links from {URL}: {e}")
+        return []
+
+
+@cached
+def fetch_news(link: str, frontier: Frontier = None) -> NewsArticle | None:
+    """
+    Fetch [NewsArticle] from the news link, return **None** if the news
+    is outside of the time window or if any error occurred
+    """
+    try:
+        data = fetch_bytes(link, kind="article")
+
+        if not data:
+            Logger.warning(f"WARN: Unable to fetch {link}, it will be retried")
+            fetch_failed(link)
+            return None
+
+        if frontier:
+            frontier.mark(link, FETCHED)
+
+        # JSON-LD metadata is read from the raw page, pages outside of the
+        # time window are skipped without being parsed
+        metadata = find_article_metadata(data) or {}
+        news_time = article_time(metadata, "date_published", "date_modified")
+
+        if news_time is not None and not in_window(news_time):
+            return None
+
+        with open_html(data) as news_soup:
+            if news_soup == None:
+                Logger.warning(f"WARN: Skipping link due to parse failure: {link}")
+                return None
+
+            if news_time is None:
+                time_div = news_soup.find("time", class_="date")
+
+                news_time = parse_date(ISN, time_div.text)
+
+                # if news time in smaller then yesterday 8PM or is after today 8PM
+                # then skip this news, otherwise scrape it and store it
+                if news_time is None or not in_window(news_time):
+                    return None
+
+            news_time_iso = news_time.isoformat()
+
+            # News Title
+            heading = metadata.get("headline") or (
+                news_soup.find("h1").text if news_soup.find("h1") else "Title not found"
+            )
+
+            # News Authors
+            if metadata.get("authors"):
+                author = metadata["authors"][0]
+            else:
+                author_div = news_soup.find("div", class_="author")
+                author = author_div.text.split("\n")[1] if author_div else None
+
+            body = news_soup.find("div", class_="article")
+            body_content = []
+            tags = []
+
+            tags_divs = news_soup.find_all("div", class_="tags-category")
+            tags_div = tags_divs[-1] if len(tags_divs) > 1 else None
+
+            # News Tags
+            if tags_div is None:
+                tags = []
+            else:
+                for a_tag in tags_div.find_all("a"):
+                    if a_tag and len(a_tag.text.strip()) > 0:
+                        tags.append(a_tag.text)
+
+            for tag in body.find_all(["p", "h2"]):
+                body_content.append(tag.text)
+
+        # News Body
+        content = " ".join(body_content)
+        encoded_news_body = summarize(content, BODY_SUMMARY, encode=True)
+
+        news = NewsArticle(
+            tags=tags,
+            author=[author],
+            title=heading,
+            sub_heading="",
+            body=encoded_news_body,
+            timestamp=news_time_iso,
+            src=link,
+        )
+
+        trace("fetched", "Fetched news w/ title (%s) from %s", news.title, link)
+        return news
+    except Exception as e:
+        Logger.error(f"ERROR: Unable to process news link {link}: {e}")
+        fetch_failed(link)
+        return None
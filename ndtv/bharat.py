@@ -1,214 +1,72 @@
-import pytz
-import logging as Logger
+import sys
 
-from datetime import datetime, timedelta
-from histral_core.types import NewsArticle
-from histral_core.scraper import fetch_soup
-from histral_core.encode import encode_text
-from histral_core.summery import extractive_summary
-from histral_core.firebase import post_news_list, Category, OutletCode
+from histral_core.firebase import Category, OutletCode
 
-
-# --------------------- Logging Setup ---------------------
-
-
-Logger.basicConfig(
-    level=Logger.INFO,
-    format="[%(levelname)s] (%(asctime)s) -> %(message)s",
-    handlers=[
-        Logger.StreamHandler(),
-    ],
+from ndtv.common import (
+    BODY_SUMMARY,
+    SUB_HEADING_SUMMARY,
+    CURRENT_TIME_IST,
+    discover_news_links,
+    fetch_news,
+    Logger,
 )
+from utils.frontier import Frontier, FETCHED, EXTRACTED, fetch_outcome
+from utils.memory import start_memory_report
+from utils.profiler import start_profile
+from utils.logs import start_run_log
+from utils.outbox import Outbox
+from utils.scheduler import scheduled, cut_short
+from utils.summary import SummaryBatcher
+from utils.units import unit_page_range, unit_run_key
 
 
 # --------------------- Constants ---------------------
 
 
 BASE_URL = "https://www.ndtv.com/india"
-IST = pytz.timezone("Asia/Kolkata")
-
-CURRENT_TIME_IST = datetime.now(IST)
-TODAY_8PM = CURRENT_TIME_IST.replace(
-    hour=20,
-    minute=0,
-    second=0,
-    microsecond=0,
-)
-YESTERDAY_8PM = CURRENT_TIME_IST.replace(
-    hour=20,
-    minute=0,
-    second=0,
-    microsecond=0,
-) - timedelta(days=1)
+FEEDS = ["https://feeds.feedburner.com/ndtvnews-india-news"]
 
 
-# --------------------- Common Functions ---------------------
+# --------------------- Main Execution ---------------------
 
 
-def parse_date_to_iso(date_str):
-    """
-    Adjust the format string to match 'Monday September 16 2024'
-    """
-    try:
-        date_object = datetime.strptime(date_str.strip(), "%A %B %d %Y")
-        return date_object.isoformat()
-    except ValueError as e:
-        Logger.error(f"ERROR: Unable to parse date {date_str}: {e}")
-        return None
-
+start_memory_report("NDTV/BHARAT")
+start_profile("NDTV/BHARAT")
+start_run_log("NDTV/BHARAT")
 
 try:
+    outbox = Outbox(CURRENT_TIME_IST.date(), Category.BHARAT, OutletCode.NDTV)
+    frontier = Frontier(unit_run_key(outbox.run_key))
 
-    # --------------------- Fetch All News Links ---------------------
-
-    page = 1
-    news_links = []
-    should_break = False
-
-    while True:
-        if page > 1:
-            page_link = f"page-{page}"
-        else:
-            page_link = ""
-
-        base_data = fetch_soup(f"{BASE_URL}/{page_link}")
-
-        if not base_data:
-            Logger.error(f"ERROR: Failed to fetch page {page_link}. Exiting loop.")
-            break
-
-        news_divs = base_data.find_all("div", class_=["news_Itm"])
-
-        if len(news_divs) == 0:
-            Logger.info("TRACE: No more news divs found, stopping pagination.")
-            break
-
-        for news in news_divs:
-            posted_by = news.find("span", class_=["posted-by"])
-
-            if posted_by is None:
-                Logger.warning("WARN: Date not found for. Skipping the news.")
-                continue  # Skip is no date is found
-
-            try:
-                date_str = " ".join(posted_by.text.split("|")[-1].split(",")[0:2])
-            except Exception as e:
-                Logger.warning("WARN: Date not found for. Error - {e}")
-                continue  # Skip if no date is found
+    def extracted(news):
+        record = outbox.append(news)
+        frontier.mark(record.src, EXTRACTED)
 
-            news_date = parse_date_to_iso(date_str)
-
-            if not news_date:
-                Logger.warning("WARN: Date not found")
-                continue  # Skip if date parsing failed
+    summaries = SummaryBatcher(extracted)
 
-            try:
-                date_obj = datetime.fromisoformat(news_date)
-                date_timezone = date_obj.astimezone(IST)
+    first_page, last_page = unit_page_range()
+    news_links = discover_news_links(BASE_URL, FEEDS, frontier, first_page, last_page)
 
-                if YESTERDAY_8PM <= date_timezone <= TODAY_8PM:
-                    link = news.find("a")["href"]
-                    news_links.append(link)
-                else:
-                    should_break = True
-                    break
-            except ValueError:
-                Logger.error(f"ERROR: Skipping invalid date format: {news_date}")
-
-        if should_break:
-            break
-
-        page += 1
-
-    Logger.info(f"INFO: Fetched total {len(news_links)} news links")
-
-    # --------------------- Fetch all news links one by one ---------------------
-
-    news_objects = []
-
-    for link in news_links:
-        news_soup = fetch_soup(link)
-        if not news_soup:
-            Logger.error(f"Failed to fetch article from {link}")
-            continue
-
-        try:
-            content_div = news_soup.find("div", class_="content")
-
-            h2 = content_div.find("h2")
-            nav_div = content_div.find("nav", class_="pst-by")
-            authors_span = nav_div.find("span", {"itemprop": "author"})
-
-            # News Title
-            news_title = (
-                content_div.find("h1").text
-                if content_div.find("h1")
-                else "Title not found"
-            )
-
-            # News SubHeading
-            news_subHeading = (
-                content_div.find("h2").text if content_div.find("h2") else ""
-            )
-
-            try:
-                timestamp = nav_div.find("span", {"itemprop": "dateModified"})[
-                    "content"
-                ]
-                datetime.fromisoformat(timestamp)
-            except Exception as e:
-                Logger.error(f"ERROR: Timestamp is invalid; URL -> {link}, Error - {e}")
-                continue
-
-            if authors_span.find("span", {"itemprop": "name"}):
-                author = authors_span.find("span", {"itemprop": "name"}).text
-            else:
-                author = None
-
-            body_div = content_div.find("div", {"itemprop": "articleBody"})
-            body_content = []
+    # Fetches may run on worker threads, the frontier is only updated here
+    for link, news in scheduled(news_links, fetch_news):
+        if news:
+            frontier.mark(link, FETCHED)
+            summaries.add(news, BODY_SUMMARY, SUB_HEADING_SUMMARY)
+        else:
+            frontier.mark(link, fetch_outcome(link))
 
-            if body_div == None:
-                Logger.warning(f"WARN: No content found in -> {link}")
-                continue
+    summaries.flush()
 
-            for p_tag in body_div.find_all("p"):
-                if p_tag.find():
-                    continue
-                body_content.append(p_tag.text)
+    Logger.info(f"INFO: Fetched {len(outbox)} news articles about BHARAT")
 
-            body_text = " ".join(body_content)
-
-            summarized_body = extractive_summary(body_text, percentage=0.25)
-            summarized_body = encode_text(summarized_body)
-            summarized_sub_heading = extractive_summary(news_subHeading, percentage=0.8)
-
-            news = NewsArticle(
-                tags=[],
-                author=[author],
-                title=news_title,
-                sub_heading=summarized_sub_heading,
-                body=summarized_body,
-                timestamp=timestamp,
-                src=link,
-            )
-
-            news_objects.append(news.to_dict())
-            Logger.info(f"TRACE: Fetched news {link}")
+    outbox.flush()
 
-        except Exception as e:
-            Logger.error(f"ERROR: Unable to process news link {link}: {e}")
-
-    Logger.info(f"INFO: Fetched {len(news_objects)} news articles about BHARAT")
-
-    # --------------------- Save Data ---------------------
-
-    post_news_list(
-        DATA=news_objects,
-        current_date=CURRENT_TIME_IST.date(),
-        category=Category.BHARAT,
-        outlet_code=OutletCode.NDTV,
-    )
+    # Links left by a spent budget are kept for the next run of the window
+    if cut_short():
+        frontier.checkpoint()
+    else:
+        frontier.complete()
 
 except Exception as e:
     Logger.critical(f"FATAL: Critical failure during main execution: {e}")
+    sys.exit(1)
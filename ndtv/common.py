@@ -0,0 +1,283 @@
+import logging as Logger
+
+from histral_core.types import NewsArticle
+from utils.cache import cached
+from utils.amp import fetch_article, amp_paragraphs
+from utils.jsonld import article_time
+from utils.logs import setup_logging, trace
+from utils.memory import open_soup, open_html
+from utils.summary import summarize
+from utils.urls import clean_url
+from utils.liveblog import summarize_body
+from utils.dates import (
+    CURRENT_TIME_IST,
+    NDTV,
+    parse_date,
+    parse_iso,
+    day_in_window,
+    in_window,
+)
+from utils.frontier import Frontier, FETCHED, fetch_failed
+from utils.discovery import DISCOVERY, iter_feed_links
+
+
+# --------------------- Logging Setup ---------------------
+
+
+setup_logging()
+
+
+# --------------------- Constants ---------------------
+
+
+# Share of the body and sub heading kept in summaries
+BODY_SUMMARY = 0.25
+SUB_HEADING_SUMMARY = 0.8
+
+# Article body of the AMP pages, shared by news and sports
+AMP_BODY = "div[itemprop=articleBody] p, div.sp-cn p, div.story__content p"
+
+
+# --------------------- Common Functions ---------------------
+
+
+def amp_url(link: str) -> str | None:
+    """
+    AMP variant of the article [link], served under `<article>/amp/1`
+    """
+    if "/amp/" in link or "ndtv.com" not in link:
+        return None
+
+    return f"{link.rstrip('/')}/amp/1"
+
+
+def fetch_all_news_links(
+    BASE_URL: str,
+    frontier: Frontier,
+    first_page: int = 1,
+    last_page: int | None = None,
+) -> list:
+    """
+    Walk the paginated listing of [BASE_URL] from [first_page] until a news
+    older than yesterday 8PM is found (or [last_page] is read), adding the
+    links to [frontier].
+
+    The last listing page read is checkpointed, so an interrupted walk
+    resumes from the next page. Returns the links still to be processed.
+    """
+    if frontier.get_cursor("discovered"):
+        return frontier.pending()
+
+    page = max(frontier.get_cursor("page") + 1, first_page)
+    should_break = False
+
+    while last_page is None or page <= last_page:
+        if page > 1:
+            page_link = f"page-{page}"
+        else:
+            page_link = ""
+
+        news_links = []
+
+        with open_soup(f"{BASE_URL}/{page_link}") as base_data:
+            if not base_data:
+                Logger.error(f"ERROR: Failed to fetch page {page_link}. Exiting loop.")
+                break
+
+            news_divs = base_data.find_all("div", class_=["news_Itm"])
+
+            if len(news_divs) == 0:
+                Logger.info("TRACE: No more news divs found, stopping pagination.")
+                break
+
+            for news in news_divs:
+                posted_by = news.find("span", class_=["posted-by"])
+
+                if posted_by is None:
+                    Logger.warning("WARN: Date not found for. Skipping the news.")
+                    continue  # Skip is no date is found
+
+                try:
+                    date_str = " ".join(posted_by.text.split("|")[-1].split(",")[0:2])
+                except Exception as e:
+                    Logger.warning("WARN: Date not found for. Error - {e}")
+                    continue  # Skip if no date is found
+
+                news_date = parse_date(NDTV, date_str)
+
+                if not news_date:
+                    Logger.warning("WARN: Date not found")
+                    continue  # Skip if date parsing failed
+
+                # Listings only show the day, the exact time is checked
+                # on the article itself
+                if day_in_window(news_date):
+                    link = clean_url(news.find("a")["href"], BASE_URL)
+                    news_links.append(link)
+                else:
+                    should_break = True
+                    break
+
+        frontier.discover(news_links)
+
+        if should_break:
+            break
+
+        frontier.set_cursor("page", page)
+        frontier.checkpoint()
+        page += 1
+
+    frontier.set_cursor("discovered", 1)
+    frontier.checkpoint()
+
+    news_links = frontier.pending()
+    Logger.info(f"INFO: Fetched total {len(news_links)} news links")
+
+    return news_links
+
+
+def discover_news_links(
+    BASE_URL: str,
+    FEEDS: list,
+    frontier: Frontier,
+    first_page: int = 1,
+    last_page: int | None = None,
+) -> list:
+    """
+    Add the news links of the window from [FEEDS] to [frontier], walking
+    the paginated listing of [BASE_URL] instead when feeds are disabled,
+    yield nothing or when only a page range is requested
+    """
+    if frontier.get_cursor("discovered"):
+        return frontier.pending()
+
+    if DISCOVERY == "feeds" and FEEDS and first_page == 1 and last_page is None:
+        feed_links = list(iter_feed_links(FEEDS))
+
+        if feed_links:
+            frontier.discover(feed_links)
+            frontier.set_cursor("discovered", 1)
+            frontier.checkpoint()
+
+            news_links = frontier.pending()
+            Logger.info(f"INFO: Fetched total {len(news_links)} news links from feeds")
+            return news_links
+
+        Logger.warning("WARN: No links found in feeds, reading the listing")
+
+    return fetch_all_news_links(BASE_URL, frontier, first_page, last_page)
+
+
+@cached
+def fetch_news(link: str, frontier: Frontier = None) -> NewsArticle | None:
+    """
+    Fetch [NewsArticle] from the news link, return **None** if
+    no data found or if any error occurred
+    """
+    try:
+        data, metadata, amp = fetch_article(link, amp_url(link))
+
+        if not data:
+            Logger.error(f"Failed to fetch article from {link}")
+            fetch_failed(link)
+            return None
+
+        if frontier:
+            frontier.mark(link, FETCHED)
+
+        # JSON-LD metadata is read from the raw page, pages outside of the
+        # time window are skipped without being parsed
+        news_time = article_time(metadata, "date_modified", "date_published")
+
+        if news_time is not None and not in_window(news_time):
+            trace("skipped", "Skipping news outside of time window: %s", link)
+            return None
+
+        with open_html(data) as news_soup:
+            if not news_soup:
+                Logger.error(f"Failed to parse article from {link}")
+                return None
+
+            # AMP pages have no content wrapper, their metadata always
+            # carries the date
+            if amp:
+                content_div = news_soup
+            else:
+                content_div = news_soup.find("div", class_="content")
+
+            nav_div = content_div.find("nav", class_="pst-by")
+
+            # News Title
+            news_title = metadata.get("headline") or (
+                content_div.find("h1").text
+                if content_div.find("h1")
+                else "Title not found"
+            )
+
+            # News SubHeading
+            if content_div.find("h2"):
+                news_subHeading = content_div.find("h2").text
+            else:
+                news_subHeading = metadata.get("description", "") if amp else ""
+
+            if news_time is not None:
+                timestamp = news_time.isoformat()
+            else:
+                try:
+                    timestamp = nav_div.find("span", {"itemprop": "dateModified"})[
+                        "content"
+                    ]
+                    news_time = parse_iso(timestamp)
+                except Exception as e:
+                    Logger.error(
+                        f"ERROR: Timestamp is invalid; URL -> {link}, Error - {e}"
+                    )
+                    return None
+
+                if news_time is None or not in_window(news_time):
+                    trace("skipped", "Skipping news outside of time window: %s", link)
+                    return None
+
+            if metadata.get("authors"):
+                author = metadata["authors"][0]
+            elif nav_div is None:
+                author = None
+            else:
+                authors_span = nav_div.find("span", {"itemprop": "author"})
+                author_name = authors_span.find("span", {"itemprop": "name"})
+                author = author_name.text if author_name else None
+
+            if amp:
+                body_content = amp_paragraphs(news_soup, AMP_BODY)
+            else:
+                body_div = content_div.find("div", {"itemprop": "articleBody"})
+                body_content = []
+
+                if body_div == None:
+                    Logger.warning(f"WARN: No content found in -> {link}")
+                    return None
+
+                for p_tag in body_div.find_all("p"):
+                    if p_tag.find():
+                        continue
+                    body_content.append(p_tag.text)
+
+        summarized_body = summarize_body(link, body_content, BODY_SUMMARY, metadata)
+        summarized_sub_heading = summarize(news_subHeading, SUB_HEADING_SUMMARY)
+
+        news = NewsArticle(
+            tags=[],
+            author=[author],
+            title=news_title,
+            sub_heading=summarized_sub_heading,
+            body=summarized_body,
+            timestamp=timestamp,
+            src=link,
+        )
+
+        trace("fetched", "Fetched news %s", link)
+        return news
+    except Exception as e:
+        Logger.error(f"ERROR: Unable to process news link {link}: {e}")
+        fetch_failed(link)
+        return None
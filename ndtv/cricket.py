@@ -1,146 +1,179 @@
-import pytz
+import sys
 import logging as Logger
 
-from datetime import datetime, timedelta
 from histral_core.types import NewsArticle
-from histral_core.scraper import fetch_soup
-from histral_core.encode import encode_text
-from histral_core.summery import extractive_summary
-from histral_core.firebase import post_news_list, Category, OutletCode
+from histral_core.firebase import Category, OutletCode
+from ndtv.common import AMP_BODY, amp_url
+from utils.cache import cached
+from utils.amp import fetch_article, amp_paragraphs
+from utils.jsonld import article_time
+from utils.logs import setup_logging, start_run_log, trace
+from utils.memory import open_soup, open_html, start_memory_report
+from utils.profiler import start_profile
+from utils.summary import SummaryBatcher, summarize
+from utils.liveblog import summarize_body
+from utils.urls import clean_url
+from utils.dates import (
+    CURRENT_TIME_IST,
+    NDTV_CRICKET,
+    parse_date,
+    in_window,
+    iso_in_window,
+    day_in_window,
+)
+from utils.discovery import discover_links
+from utils.outbox import Outbox
+from utils.scheduler import scheduled
 
 
 # --------------------- Logging Setup ---------------------
 
 
-Logger.basicConfig(
-    level=Logger.INFO,
-    format="[%(levelname)s] (%(asctime)s) -> %(message)s",
-    handlers=[
-        Logger.StreamHandler(),
-    ],
-)
+setup_logging()
 
 
 # --------------------- Constants ---------------------
 
 
 CRICKET_URL = "https://sports.ndtv.com/cricket/news"
-BASE_URL = "https://sports.ndtv.com"
-IST = pytz.timezone("Asia/Kolkata")
-
-CURRENT_TIME_IST = datetime.now(IST)
-TODAY_8PM = CURRENT_TIME_IST.replace(
-    hour=20,
-    minute=0,
-    second=0,
-    microsecond=0,
-)
-YESTERDAY_8PM = CURRENT_TIME_IST.replace(
-    hour=20,
-    minute=0,
-    second=0,
-    microsecond=0,
-) - timedelta(days=1)
-
-
-# --------------------- Common Functions ---------------------
-
+CRICKET_FEEDS = ["https://feeds.feedburner.com/ndtvsports-cricket"]
+CRICKET_PREFIX = "https://sports.ndtv.com/cricket/"
 
-def parse_date_to_iso(date_str):
-    """
-    Convert date to ISO format
-    """
-    try:
-        date_object = datetime.strptime(date_str, "%b %d, %Y")
-        return date_object.isoformat()
-    except ValueError as e:
-        Logger.error(f"ERROR: Unable to parse date {date_str}: {e}")
-        return None
+# Share of the body and sub heading kept in summaries
+BODY_SUMMARY = 0.34
+SUB_HEADING_SUMMARY = 0.8
 
 
 # --------------------- Fetch All News Links ---------------------
 
 
-try:
-    base_data = fetch_soup(CRICKET_URL)
+def fetch_all_news_links(URL: str) -> list:
+    """
+    Absolute links of the cricket news published inside the window,
+    read from the listing at [URL]
+    """
+    news_links = []
 
-    if base_data == None:
-        Logger.error(f"ERROR: No data found in {CRICKET_URL}")
-        raise
+    with open_soup(URL) as base_data:
+        if base_data == None:
+            Logger.error(f"ERROR: No data found in {URL}")
+            return news_links
 
-    news_divs = base_data.find_all("div", class_="lst-pg-a")
+        news_divs = base_data.find_all("div", class_="lst-pg-a")
 
-    if len(news_divs) == 0:
-        Logger.error(f"ERROR: No data found in {CRICKET_URL}")
-        raise
+        if len(news_divs) == 0:
+            Logger.error(f"ERROR: No data found in {URL}")
+            return news_links
 
-    news_links = []
+        for div in news_divs:
+            link = div.find("a", class_="lst-pg_ttl")
+            date_span = div.find("span", class_="lst-a_pst_lnk")
 
-    for div in news_divs:
-        link = div.find("a", class_="lst-pg_ttl")
-        date_span = div.find("span", class_="lst-a_pst_lnk")
+            if date_span == None or link == None:
+                Logger.warning(f"No date found in {link}")
+                continue
 
-        if date_span == None or link == None:
-            Logger.warning(f"No date found in {link}")
-            continue
+            news_date = parse_date(NDTV_CRICKET, date_span.text)
 
-        try:
-            news_date = parse_date_to_iso(date_span.text)
-            date_obj = datetime.fromisoformat(news_date)
-            date_timezone = date_obj.astimezone(IST)
+            if news_date is None:
+                Logger.warning(f"WARN: Skipping invalid date format: {date_span.text}")
+                continue
 
-            if YESTERDAY_8PM <= date_timezone <= TODAY_8PM:
+            # Listings only show the day, the exact time is checked
+            # on the article itself
+            if day_in_window(news_date):
                 if link and link.get("href"):
-                    news_links.append(link["href"])
-        except ValueError:
-            Logger.warning(f"WARN: Skipping invalid date format: {date_span.text}")
+                    news_links.append(clean_url(link["href"], URL))
 
-    Logger.info(f"INFO: Fetched {len(news_links)} news links")
+    return news_links
 
-    # --------------------- Fetch all news links one by one ---------------------
-
-    news_objects = []
 
-    for link in news_links:
-        news_link = f"{BASE_URL}{link}"
-        news_soup = fetch_soup(news_link)
+# --------------------- Fetch News ---------------------
 
-        if news_soup == None:
-            Logger.warning(f"WARN: No data found in {link}")
-            continue
 
-        main_div = news_soup.find("article", class_="vjl-lg-9")
+@cached
+def fetch_news(link: str) -> NewsArticle | None:
+    """
+    Fetch [NewsArticle] from the cricket news [link], return **None** if
+    no data found, if it is outside of the window or if any error occurred
+    """
+    try:
+        data, metadata, amp = fetch_article(link, amp_url(link))
 
-        if main_div == None:
+        if not data:
             Logger.warning(f"WARN: No data found in {link}")
-            continue
-
-        heading = main_div.find("h1").text if main_div.find("h1") else "Title Not Found"
-        subHeading = main_div.find("h2").text if main_div.find("h2") else ""
-
-        nav_div = main_div.find("nav", class_="pst-by")
+            return None
 
-        timestamp = nav_div.find("meta", {"itemprop": "datePublished"})["content"]
-        author = nav_div.find("span", {"itemprop": "name"}).text
+        # JSON-LD metadata is read from the raw page, pages outside of the
+        # time window are skipped without being parsed
+        news_time = article_time(metadata, "date_published", "date_modified")
 
-        body_content = []
+        if news_time is not None and not in_window(news_time):
+            trace("skipped", "Skipping news outside of time window: %s", link)
+            return None
 
-        for p_tag in main_div.find_all("p"):
-            if p_tag.find():
+        with open_html(data) as news_soup:
+            if news_soup == None:
                 Logger.warning(f"WARN: No data found in {link}")
-                continue
-
-            body_content.append(p_tag.text)
+                return None
 
-        body_text = " ".join(body_content)
+            # AMP pages have no article column, their metadata always
+            # carries the date
+            if amp:
+                main_div = news_soup
+            else:
+                main_div = news_soup.find("article", class_="vjl-lg-9")
 
-        summarized_body = extractive_summary(body_text, percentage=0.34)
-        summarized_body = encode_text(summarized_body)
-        summarized_sub_heading = extractive_summary(subHeading, percentage=0.8)
+            if main_div == None:
+                Logger.warning(f"WARN: No data found in {link}")
+                return None
+
+            heading = metadata.get("headline") or (
+                main_div.find("h1").text if main_div.find("h1") else "Title Not Found"
+            )
+            if main_div.find("h2"):
+                subHeading = main_div.find("h2").text
+            else:
+                subHeading = metadata.get("description", "") if amp else ""
+
+            nav_div = main_div.find("nav", class_="pst-by")
+
+            if news_time is not None:
+                timestamp = news_time.isoformat()
+            else:
+                timestamp = nav_div.find("meta", {"itemprop": "datePublished"})[
+                    "content"
+                ]
+
+                if not iso_in_window(timestamp):
+                    trace("skipped", "Skipping news outside of time window: %s", link)
+                    return None
+
+            if metadata.get("authors"):
+                author = metadata["authors"][0]
+            elif nav_div is None:
+                author = None
+            else:
+                author = nav_div.find("span", {"itemprop": "name"}).text
+
+            if amp:
+                body_content = amp_paragraphs(news_soup, AMP_BODY)
+            else:
+                body_content = []
+
+                for p_tag in main_div.find_all("p"):
+                    if p_tag.find():
+                        Logger.warning(f"WARN: No data found in {link}")
+                        continue
+
+                    body_content.append(p_tag.text)
+
+        summarized_body = summarize_body(link, body_content, BODY_SUMMARY, metadata)
+        summarized_sub_heading = summarize(subHeading, SUB_HEADING_SUMMARY)
 
         news = NewsArticle(
             tags=[],
-            src=news_link,
+            src=link,
             body=summarized_body,
             sub_heading=summarized_sub_heading,
             title=heading,
@@ -148,18 +181,48 @@ try:
             author=[author],
         )
 
-        news_objects.append(news.to_dict())
+        trace("fetched", "Fetched news %s", link)
+        return news
+    except Exception as e:
+        Logger.error(f"ERROR: Unable to process news link {link}: {e}")
+        return None
 
-    Logger.info(f"INFO: Fetched total {len(news_objects)} news article")
 
-    # --------------------- Save Data ---------------------
+# --------------------- Main Execution ---------------------
+
 
-    post_news_list(
-        DATA=news_objects,
-        current_date=CURRENT_TIME_IST.date(),
-        category=Category.CRICKET,
-        outlet_code=OutletCode.NDTV,
+start_memory_report("NDTV/CRICKET")
+start_profile("NDTV/CRICKET")
+start_run_log("NDTV/CRICKET")
+
+try:
+    news_links = list(
+        discover_links(
+            CRICKET_FEEDS,
+            lambda: fetch_all_news_links(CRICKET_URL),
+            CRICKET_PREFIX,
+        )
     )
 
+    Logger.info(f"INFO: Fetched {len(news_links)} news links")
+
+    # --------------------- Fetch all news links one by one ---------------------
+
+    outbox = Outbox(CURRENT_TIME_IST.date(), Category.CRICKET, OutletCode.NDTV)
+    summaries = SummaryBatcher(outbox.append)
+
+    for link, news in scheduled(news_links, fetch_news):
+        if news:
+            summaries.add(news, BODY_SUMMARY, SUB_HEADING_SUMMARY)
+
+    summaries.flush()
+
+    Logger.info(f"INFO: Fetched total {len(outbox)} news article")
+
+    # --------------------- Save Data ---------------------
+
+    outbox.flush()
+
 except Exception as e:
     Logger.critical(f"FATAL: Critical failure during main execution: {e}")
+    sys.exit(1)
@@ -0,0 +1,12 @@
+import pytest
+
+import utils.storage
+
+
+@pytest.fixture(autouse=True)
+def state_dir(tmp_path, monkeypatch):
+    """
+    Every test gets its own state directory
+    """
+    monkeypatch.setattr(utils.storage, "STATE_DIR", str(tmp_path / "state"))
+    return tmp_path / "state"
@@ -0,0 +1,104 @@
+import time
+import threading
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from utils import cache
+from utils.cache import cached, listed, lookup, store
+from utils.dates import IST, TODAY_8PM, YESTERDAY_8PM
+from utils.records import ArticleRecord
+from utils.summary import mark_chunked
+
+
+URL = "https://www.ndtv.com/india-news/budget-2026-highlights-123"
+
+
+@pytest.fixture(autouse=True)
+def cache_db(monkeypatch):
+    monkeypatch.setattr(cache, "_LOCAL", threading.local())
+    monkeypatch.setattr(cache, "_LISTED", {})
+    monkeypatch.setattr(cache, "ARTICLE_CACHE_TTL", 3600)
+
+
+def record(src: str = URL, timestamp=None) -> ArticleRecord:
+    timestamp = timestamp or (TODAY_8PM - timedelta(hours=1)).isoformat()
+    return ArticleRecord(title="Budget", body="...", timestamp=timestamp, src=src)
+
+
+def age(seconds: float) -> None:
+    cache._conn().execute("UPDATE articles SET cached_at = cached_at - ?", (seconds,))
+
+
+def test_lookup_matches_every_variant_of_the_link():
+    store(record())
+
+    assert lookup(URL + "/?utm_source=twitter").title == "Budget"
+    assert lookup("https://www.ndtv.com/india-news/other-456") is None
+
+
+def test_articles_outside_of_the_window_are_not_served():
+    store(record(timestamp=(YESTERDAY_8PM - timedelta(hours=1)).isoformat()))
+
+    assert lookup(URL) is None
+
+
+def test_articles_expire_after_the_ttl():
+    store(record())
+    age(3601)
+
+    assert lookup(URL) is None
+
+
+def test_ttl_of_zero_keeps_articles_for_the_window(monkeypatch):
+    monkeypatch.setattr(cache, "ARTICLE_CACHE_TTL", 0)
+    store(record())
+    age(6 * 3600)
+
+    assert lookup(URL) is not None
+
+
+def test_articles_modified_since_they_were_cached_are_not_served():
+    store(record())
+    age(60)
+
+    listed(URL, YESTERDAY_8PM + timedelta(hours=1))
+    assert lookup(URL) is not None
+
+    listed(URL + "?ref=home", datetime.fromtimestamp(time.time() - 30, IST))
+    assert lookup(URL) is None
+
+
+def test_cached_fetches_each_article_once():
+    calls = []
+
+    @cached
+    def fetch(link):
+        calls.append(link)
+        return record(link)
+
+    fetch(URL)
+    news = fetch(URL + "#comments")
+
+    assert calls == [URL]
+    assert news.src == URL + "#comments"
+
+
+def test_cached_skips_failed_fetches_and_chunked_bodies():
+    calls = []
+
+    @cached
+    def fetch(link):
+        calls.append(link)
+        return None if link == URL else record(link)
+
+    live = "https://www.ndtv.com/world-news/election-live-updates-789"
+    mark_chunked(live)
+
+    fetch(URL)
+    fetch(URL)
+    fetch(live)
+    fetch(live)
+
+    assert calls == [URL, URL, live, live]
@@ -0,0 +1,112 @@
+import sqlite3
+
+from utils import frontier as frontier_module
+from utils.frontier import (
+    DISCOVERED,
+    EXTRACTED,
+    FAILED,
+    FETCHED,
+    SKIPPED,
+    Frontier,
+    fetch_failed,
+    fetch_outcome,
+)
+from utils.storage import state_path
+
+
+RUN_KEY = "2026-10-18/BHARAT/NDTV"
+
+
+def test_pending_keeps_listing_order_and_skips_processed_links():
+    frontier = Frontier(RUN_KEY)
+
+    assert frontier.discover(["a", "b", "c", "d"]) == 4
+    assert frontier.discover(["b", "e"]) == 1
+
+    frontier.mark("a", EXTRACTED)
+    frontier.mark("c", SKIPPED)
+    frontier.mark("d", FETCHED)
+
+    assert frontier.pending() == ["b", "d", "e"]
+    assert frontier.todo(["e", "a", "b"]) == ["e", "b"]
+
+
+def test_interrupted_run_resumes_from_the_checkpoint():
+    frontier = Frontier(RUN_KEY)
+    frontier.discover(["a", "b"])
+    frontier.mark("a", EXTRACTED)
+    frontier.set_cursor("page", 3)
+    frontier.checkpoint()
+
+    resumed = Frontier(RUN_KEY)
+
+    assert resumed.get_cursor("page") == 3
+    assert resumed.state("a") == EXTRACTED
+    assert resumed.pending() == ["b"]
+
+
+def test_failed_fetches_are_retried_until_max_attempts(monkeypatch):
+    monkeypatch.setattr(frontier_module, "FETCH_ATTEMPTS", 2)
+    frontier = Frontier(RUN_KEY)
+    frontier.discover(["a", "b"])
+
+    fetch_failed("a")
+    frontier.mark("a", fetch_outcome("a"))
+    frontier.mark("b", fetch_outcome("b"))
+
+    assert frontier.state("a") == FAILED
+    assert frontier.state("b") == SKIPPED
+    assert frontier.pending() == ["a"]
+
+    fetch_failed("a")
+    frontier.mark("a", fetch_outcome("a"))
+
+    assert frontier.pending() == []
+
+
+def test_outcome_of_a_link_is_only_failed_once():
+    fetch_failed("a")
+
+    assert fetch_outcome("a") == FAILED
+    assert fetch_outcome("a") == SKIPPED
+
+
+def test_completed_run_starts_over():
+    frontier = Frontier(RUN_KEY)
+    frontier.discover(["a", "b"])
+    frontier.mark("a", EXTRACTED)
+    frontier.mark("b", SKIPPED)
+    frontier.set_cursor("discovered", 1)
+    frontier.complete()
+
+    rerun = Frontier(RUN_KEY)
+
+    assert rerun.get_cursor("discovered") == 0
+    assert rerun.state("a") is None
+    assert rerun.discover(["a", "b"]) == 2
+    assert rerun.pending() == ["a", "b"]
+
+
+def test_runs_are_kept_apart():
+    frontier = Frontier(RUN_KEY)
+    frontier.discover(["a"])
+    frontier.checkpoint()
+
+    other = Frontier(f"{RUN_KEY}#pages:1-2")
+
+    assert other.pending() == []
+    assert other.discover(["a"]) == 1
+
+
+def test_frontier_without_attempts_is_migrated():
+    conn = sqlite3.connect(state_path(frontier_module.FRONTIER_DB))
+    conn.execute(
+        "CREATE TABLE links (run_key TEXT NOT NULL, url TEXT NOT NULL, "
+        "state TEXT NOT NULL, position INTEGER NOT NULL, updated_at REAL NOT NULL, "
+        "PRIMARY KEY (run_key, url))"
+    )
+    conn.execute("INSERT INTO links VALUES (?, 'a', ?, 0, 0)", (RUN_KEY, DISCOVERED))
+    conn.commit()
+    conn.close()
+
+    assert Frontier(RUN_KEY).pending() == ["a"]
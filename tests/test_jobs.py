@@ -0,0 +1,126 @@
+import time
+
+import pytest
+
+from utils import jobs
+from utils.jobs import DONE, FAILED, FLUSH, LEASED, QUEUED, JobQueue
+
+
+WINDOW = "2026-10-18"
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    monkeypatch.setattr(jobs, "current_window", lambda: WINDOW)
+    return JobQueue()
+
+
+def states(queue: JobQueue, scraper: str) -> dict:
+    cursor = queue.conn.execute(
+        "SELECT section, state FROM jobs WHERE scraper = ?", (scraper,)
+    )
+    return dict(cursor.fetchall())
+
+
+def test_lease_hands_units_out_once(queue):
+    queue.enqueue("isn.business", WINDOW, "a")
+    queue.enqueue("isn.business", WINDOW, "b")
+
+    first = queue.lease("w1")
+    second = queue.lease("w2")
+
+    assert {first[3], second[3]} == {"a", "b"}
+    assert queue.lease("w3") is None
+
+
+def test_failed_unit_is_retried_until_max_attempts(queue, monkeypatch):
+    monkeypatch.setattr(jobs, "MAX_ATTEMPTS", 2)
+    queue.enqueue("ndtv.bharat", WINDOW, "pages:1-2")
+
+    job_id = queue.lease("w1")[0]
+    queue.fail(job_id, "exit code 1")
+    assert states(queue, "ndtv.bharat")["pages:1-2"] == QUEUED
+
+    assert queue.lease("w1")[0] == job_id
+    queue.fail(job_id, "exit code 1")
+    assert states(queue, "ndtv.bharat")["pages:1-2"] == FAILED
+
+
+def test_flush_unit_is_queued_once_the_group_is_done(queue):
+    queue.enqueue("isn.business", WINDOW, "a")
+    queue.enqueue("isn.business", WINDOW, "b")
+
+    queue.complete(queue.lease("w1")[0])
+    second = queue.lease("w1")
+    assert not queue.group_done("isn.business", WINDOW)
+
+    queue.complete(second[0])
+    assert queue.group_done("isn.business", WINDOW)
+
+    flush = queue.lease("w2")
+    assert flush[1:] == ("isn.business", WINDOW, FLUSH)
+    assert queue.lease("w2") is None
+
+
+def test_flush_unit_is_queued_when_the_group_failed(queue, monkeypatch):
+    monkeypatch.setattr(jobs, "MAX_ATTEMPTS", 1)
+    queue.enqueue("hindu.bharat", WINDOW)
+
+    queue.fail(queue.lease("w1")[0], "exit code 1")
+
+    assert queue.lease("w1")[3] == FLUSH
+    assert queue.failed_units("hindu.bharat", WINDOW) == 1
+
+
+def test_expired_lease_on_last_attempt_fails_the_unit(queue, monkeypatch):
+    monkeypatch.setattr(jobs, "MAX_ATTEMPTS", 1)
+    queue.enqueue("hindu.tech", WINDOW)
+
+    queue.lease("w1", ttl=-1)
+    time.sleep(0.01)
+
+    # The dead worker's unit is not handed out again, its run gets posted
+    assert queue.lease("w2")[3] == FLUSH
+    assert states(queue, "hindu.tech") == {"": FAILED, FLUSH: LEASED}
+
+
+def test_expired_lease_is_handed_to_another_worker(queue):
+    queue.enqueue("hindu.tech", WINDOW)
+
+    job_id = queue.lease("w1", ttl=-1)[0]
+
+    assert queue.lease("w2")[0] == job_id
+
+
+def test_stale_window_fails_units_but_not_flushes(queue):
+    queue.enqueue("firstpost.usa", "2026-10-17")
+    queue.enqueue("firstpost.tech", "2026-10-17", FLUSH)
+
+    assert queue.lease("w1")[1:] == ("firstpost.tech", "2026-10-17", FLUSH)
+    assert states(queue, "firstpost.usa")[""] == FAILED
+
+
+def test_run_flush_posts_the_shared_outbox(queue, monkeypatch):
+    flushed = []
+
+    class FakeOutbox:
+        def __init__(self, current_date, category, outlet_code):
+            flushed.append((current_date.isoformat(), category, outlet_code))
+
+        def flush(self):
+            return 3
+
+    monkeypatch.setattr(jobs, "Outbox", FakeOutbox)
+    queue.enqueue("isn.business", WINDOW, FLUSH)
+
+    jobs.run_flush(queue, queue.lease("w1"))
+
+    assert flushed == [(WINDOW, *reversed(jobs.SCRAPERS["isn.business"]))]
+    assert states(queue, "isn.business")[FLUSH] == DONE
+
+
+def test_plan_splits_paginated_listings(queue):
+    jobs.plan(queue, WINDOW, pages_per_unit=2, max_pages=5)
+
+    assert sorted(states(queue, "ndtv.usa")) == ["pages:1-2", "pages:3-4", "pages:5-"]
+    assert list(states(queue, "hindu.tech")) == [""]
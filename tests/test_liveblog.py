@@ -0,0 +1,98 @@
+import threading
+
+import pytest
+
+from utils import liveblog
+from utils.liveblog import SUMMARY_CHUNK, split_chunks, summarize_entries
+
+
+URL = "https://www.ndtv.com/india-news/election-results-live-updates-1234"
+
+summarize_chunks = liveblog.summarize_chunks
+
+
+@pytest.fixture(autouse=True)
+def chunks_db(monkeypatch):
+    monkeypatch.setattr(liveblog, "_LOCAL", threading.local())
+
+    # Every chunk is summarized to its first word
+    monkeypatch.setattr(
+        liveblog,
+        "summarize_chunks",
+        lambda texts, percentage: [text.split()[0] for text in texts],
+    )
+
+
+def entry(name: str) -> str:
+    # Long enough to make a chunk of its own
+    return f"{name} " + "update " * (SUMMARY_CHUNK // 10)
+
+
+def summary(names: list, live: bool = True) -> str:
+    return summarize_entries(URL, [entry(name) for name in names], 0.3, live)
+
+
+def test_split_chunks_bounds_their_size():
+    chunks = split_chunks(["a" * 4, "b" * 4, "c" * 4, "d" * 20], size=10)
+
+    assert chunks == [["a" * 4, "b" * 4], ["c" * 4], ["d" * 20]]
+
+
+def test_incremental_runs_keep_newest_first_order():
+    assert summary(["E3", "E2", "E1"]) == "E3 E2 E1"
+    assert summary(["E5", "E4", "E3", "E2", "E1"]) == "E5 E4 E3 E2 E1"
+    assert summary(["E6", "E5", "E4", "E3", "E2", "E1"]) == "E6 E5 E4 E3 E2 E1"
+
+
+def test_incremental_runs_keep_oldest_first_order():
+    assert summary(["E1", "E2", "E3"]) == "E1 E2 E3"
+    assert summary(["E1", "E2", "E3", "E4", "E5"]) == "E1 E2 E3 E4 E5"
+    assert summary(["E1", "E2", "E3", "E4", "E5", "E6"]) == "E1 E2 E3 E4 E5 E6"
+
+
+def test_incremental_runs_only_summarize_new_entries(monkeypatch):
+    summarized = []
+
+    def summarize_chunks(texts, percentage):
+        summarized.extend(text.split()[0] for text in texts)
+        return [text.split()[0] for text in texts]
+
+    monkeypatch.setattr(liveblog, "summarize_chunks", summarize_chunks)
+
+    summary(["E2", "E1"])
+    summary(["E4", "E3", "E2", "E1"])
+
+    assert summarized == ["E2", "E1", "E4", "E3"]
+
+
+def test_removed_entries_move_to_the_end():
+    summary(["E3", "E2", "E1"])
+
+    assert summary(["E4", "E3", "E1"]) == "E4 E3 E1 E2"
+
+
+def test_long_bodies_are_not_kept_between_runs():
+    assert summary(["B1", "B2"], live=False) == "B1 B2"
+    assert summary(["B1", "B2", "B3"], live=False) == "B1 B2 B3"
+
+
+def test_batch_mode_keeps_the_cpu_budget(monkeypatch):
+    batches = []
+
+    def summarize_batch(texts, percentages):
+        batches.append(texts)
+        return [text.split()[0] for text in texts]
+
+    monkeypatch.setattr(liveblog, "BATCH_SUMMARY", True)
+    monkeypatch.setattr(liveblog, "SUMMARY_BATCH_SIZE", 2)
+    monkeypatch.setattr(liveblog, "summarize_batch", summarize_batch)
+    texts = ["One. Two. Three. Four."] * 3
+
+    assert summarize_chunks(texts, 0.5) == ["One."] * 3
+    assert [len(batch) for batch in batches] == [2, 1]
+
+    monkeypatch.setattr(liveblog, "SUMMARY_CPU_BUDGET", 0)
+    batches.clear()
+
+    assert summarize_chunks(texts, 0.5) == ["One. Two."] * 3
+    assert batches == []
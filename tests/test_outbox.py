@@ -0,0 +1,66 @@
+import sqlite3
+
+from datetime import date, datetime
+
+from histral_core.firebase import Category, OutletCode
+
+from utils.dates import IST
+from utils.outbox import Outbox, pending_runs
+from utils.records import ArticleRecord, dump_record
+from utils.storage import state_path
+
+
+DAY = date(2026, 10, 18)
+
+
+def record(src: str, title: str = "Rates unchanged") -> ArticleRecord:
+    return ArticleRecord(
+        title=title,
+        sub_heading="",
+        body="",
+        tags=[],
+        author=[],
+        timestamp=datetime(2026, 10, 18, 14, 30, tzinfo=IST),
+        src=src,
+    )
+
+
+def test_variants_of_a_link_are_journaled_once():
+    outbox = Outbox(DAY, Category.BUSINESS, OutletCode.HINDU)
+
+    outbox.append(record("https://www.thehindu.com/a.ece?utm_source=rss"))
+    outbox.append(record("https://www.thehindu.com/a.ece", "Rates cut"))
+
+    assert len(outbox) == 1
+    assert [news.title for news in outbox.records()] == ["Rates cut"]
+
+
+def test_outbox_keyed_by_src_is_rekeyed():
+    conn = sqlite3.connect(state_path("outbox.sqlite3"))
+    conn.execute(
+        "CREATE TABLE outbox (run_key TEXT NOT NULL, src TEXT NOT NULL, "
+        "run_date TEXT NOT NULL, category TEXT NOT NULL, "
+        "outlet_code TEXT NOT NULL, record BLOB NOT NULL, state TEXT NOT NULL, "
+        "created_at REAL NOT NULL, PRIMARY KEY (run_key, src))"
+    )
+    for created_at, src in enumerate(["https://a.in/x?fbclid=1", "https://a.in/x"]):
+        conn.execute(
+            "INSERT INTO outbox VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                "2026-10-18/BUSINESS/HINDU",
+                src,
+                DAY.isoformat(),
+                "BUSINESS",
+                "HINDU",
+                dump_record(record(src)),
+                "pending",
+                created_at,
+            ),
+        )
+    conn.commit()
+    conn.close()
+
+    assert pending_runs() == [(DAY, Category.BUSINESS, OutletCode.HINDU)]
+
+    outbox = Outbox(DAY, Category.BUSINESS, OutletCode.HINDU)
+    assert [news.src for news in outbox.records()] == ["https://a.in/x"]
@@ -0,0 +1,129 @@
+from datetime import datetime
+
+import pytest
+
+from utils.dates import IST
+from utils.records import (
+    ArticleBatch,
+    ArticleRecord,
+    dump_record,
+    load_record,
+    read_spool,
+    spool,
+)
+
+
+def record(**fields) -> ArticleRecord:
+    values = dict(
+        title="Rates unchanged",
+        sub_heading="",
+        body="z1:0:KLUv/QBYAQAA",
+        tags=["RBI", "Economy"],
+        author=["Staff"],
+        timestamp=datetime(2026, 10, 18, 14, 30, tzinfo=IST),
+        src="https://www.thehindu.com/business/rates-unchanged/article123.ece",
+    )
+    return ArticleRecord(**{**values, **fields})
+
+
+class FakeArticle:
+    def __init__(self, **data):
+        self.data = data
+
+    def to_dict(self) -> dict:
+        return self.data
+
+
+def test_record_round_trips():
+    original = record()
+    loaded, offset = load_record(dump_record(original))
+
+    assert loaded.to_dict() == original.to_dict()
+    assert offset == len(dump_record(original))
+
+
+@pytest.mark.parametrize(
+    "value",
+    [None, True, False, 0, -(2**40), 1.5, "", "नमस्ते", [], ["a", [1, None]]],
+)
+def test_values_round_trip(value):
+    loaded, _ = load_record(dump_record(record(title=value)))
+
+    assert loaded.title == value
+
+
+def test_records_are_read_back_in_sequence():
+    first, second = record(title="First"), record(title="Second", tags=None)
+    data = dump_record(first) + dump_record(second)
+
+    loaded, offset = load_record(data)
+    assert loaded.title == "First"
+
+    loaded, offset = load_record(data, offset)
+    assert (loaded.title, loaded.tags, offset) == ("Second", None, len(data))
+
+
+def test_unsupported_and_corrupted_values_raise():
+    with pytest.raises(TypeError):
+        dump_record(record(title={"not": "supported"}))
+
+    with pytest.raises(ValueError):
+        load_record(b"?" + dump_record(record())[1:])
+
+
+def test_content_hash_follows_the_content():
+    assert record().content_hash() == record().content_hash()
+    assert record().content_hash() != record(body="z1:0:changed").content_hash()
+
+
+def test_content_hash_ignores_the_link_variant():
+    src = record().src + "?utm_source=rss"
+
+    assert record(src=src).content_hash() == record().content_hash()
+
+
+def test_article_id_is_the_same_for_every_variant_of_the_link():
+    src = record().src
+
+    assert record(src=src + "?utm_source=rss#top").article_id == record().article_id
+    assert record(src=src + "?page=2").article_id != record().article_id
+
+
+def test_batch_keeps_the_payload_of_articles():
+    batch = ArticleBatch()
+    batch.append(FakeArticle(title="From article", src="https://a.com/1", extra=1))
+    batch.append(record())
+
+    payload = batch.to_payload()
+
+    assert len(batch) == 2
+    assert payload[0] == {
+        "title": "From article",
+        "sub_heading": None,
+        "body": None,
+        "tags": None,
+        "author": None,
+        "timestamp": None,
+        "src": "https://a.com/1",
+    }
+    assert payload[1]["timestamp"] == record().timestamp
+
+
+def test_batch_payload_round_trips():
+    batch = ArticleBatch([record(), record(title="Rates cut", tags=None)])
+    loaded = ArticleBatch.loads(batch.dumps())
+
+    assert [news.to_dict() for news in loaded] == [news.to_dict() for news in batch]
+
+
+def test_batch_payload_is_checked():
+    with pytest.raises(ValueError):
+        ArticleBatch.loads(b"not a payload")
+
+
+def test_spool_streams_records_back(tmp_path):
+    path = str(tmp_path / "articles.spool")
+    spool(path, [record()])
+    spool(path, [record(title="Rates cut")])
+
+    assert [news.title for news in read_spool(path)] == ["Rates unchanged", "Rates cut"]
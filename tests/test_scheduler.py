@@ -0,0 +1,43 @@
+import utils.scheduler as scheduler
+
+
+def test_fetches_start_before_the_listing_is_walked(monkeypatch):
+    monkeypatch.setattr(scheduler, "SCHEDULE_WINDOW", 2)
+    walked = []
+
+    def listing():
+        for page in range(3):
+            walked.append(page)
+            yield f"https://example.com/{page}/a"
+            yield f"https://example.com/{page}/b"
+
+    results = scheduler.scheduled(listing(), lambda link: walked[-1])
+    link, page = next(results)
+
+    assert link == "https://example.com/0/a"
+    assert page == 0
+
+    assert [link for link, _ in results] == [
+        "https://example.com/0/b",
+        "https://example.com/1/a",
+        "https://example.com/1/b",
+        "https://example.com/2/a",
+        "https://example.com/2/b",
+    ]
+
+
+def test_variants_of_a_link_are_fetched_once(monkeypatch):
+    monkeypatch.setattr(scheduler, "SCHEDULE_WINDOW", 2)
+
+    links = [
+        "https://example.com/a?utm_source=rss",
+        "https://example.com/b",
+        "https://example.com/a",
+        "https://example.com/c",
+    ]
+
+    assert list(scheduler.prioritize(iter(links))) == [
+        "https://example.com/a?utm_source=rss",
+        "https://example.com/b",
+        "https://example.com/c",
+    ]
@@ -0,0 +1,66 @@
+import pytest
+
+from utils.urls import article_id, canonical_url, clean_url
+
+
+@pytest.mark.parametrize(
+    "link, base, expected",
+    [
+        (
+            "/india-news/story-123",
+            "https://www.ndtv.com/india",
+            "https://www.ndtv.com/india-news/story-123",
+        ),
+        (
+            "HTTPS://WWW.NDTV.COM:443/India-News/Story-123",
+            None,
+            "https://www.ndtv.com/India-News/Story-123",
+        ),
+        (
+            "https://www.firstpost.com//tech//a/./b/../story.html#comments",
+            None,
+            "https://www.firstpost.com/tech/a/story.html",
+        ),
+        (
+            "https://www.thehindu.com/news/a.ece?utm_source=rss&fbclid=x&page=2",
+            None,
+            "https://www.thehindu.com/news/a.ece?page=2",
+        ),
+        (
+            "https://example.com:8080/a?b=%2F&c=1",
+            None,
+            "https://example.com:8080/a?b=%2F&c=1",
+        ),
+        ("  https://example.com  ", None, "https://example.com/"),
+    ],
+)
+def test_clean_url(link, base, expected):
+    assert clean_url(link, base) == expected
+
+
+def test_clean_url_keeps_the_trailing_slash_of_the_page():
+    assert clean_url("https://indianstartupnews.com/news/") == (
+        "https://indianstartupnews.com/news/"
+    )
+
+
+def test_canonical_url_drops_the_trailing_slash_and_sorts_the_query():
+    assert canonical_url("https://a.com/x/?b=2&a=1&utm_medium=social") == (
+        "https://a.com/x?a=1&b=2"
+    )
+    assert canonical_url("https://a.com/") == "https://a.com/"
+
+
+def test_article_id_is_stable_across_variants():
+    ids = {
+        article_id(link)
+        for link in (
+            "https://www.ndtv.com/india-news/story-123",
+            "https://www.ndtv.com/india-news/story-123/",
+            "HTTPS://www.ndtv.com/india-news/story-123?utm_source=twitter",
+            "https://www.ndtv.com//india-news/story-123#top",
+        )
+    }
+
+    assert len(ids) == 1
+    assert article_id("https://www.ndtv.com/india-news/story-124") not in ids
@@ -0,0 +1,76 @@
+import os
+import logging as Logger
+
+from utils.http import fetch_bytes
+from utils.jsonld import find_article_metadata
+from utils.urls import canonical_url
+
+
+# --------------------- Constants ---------------------
+
+
+# Set `HISTRAL_AMP=1` to fetch the AMP variant of article pages where the
+# outlet has one, the full page is still fetched when it is unusable
+AMP_MODE = os.getenv("HISTRAL_AMP", "0") == "1"
+
+# Articles fetched ahead by the listing walk, handed to the article stage
+# instead of being fetched again
+_PREFETCHED = {}
+
+
+# --------------------- Common Functions ---------------------
+
+
+def fetch_article(URL: str, amp_url: str | None = None) -> tuple:
+    """
+    Fetch the article [URL], from [amp_url] in AMP mode.
+
+    Returns (data, metadata, is_amp), the AMP page is only used when it
+    carries JSON-LD metadata with a date, since the lighter markup has no
+    other reliable place for it. Falls back to the full page otherwise.
+    """
+    prefetched = _PREFETCHED.pop(canonical_url(URL), None)
+
+    if prefetched is not None:
+        return prefetched
+
+    if AMP_MODE and amp_url:
+        data = fetch_bytes(amp_url, kind="article")
+        metadata = find_article_metadata(data) if data else None
+
+        if metadata and (metadata["date_published"] or metadata["date_modified"]):
+            return data, metadata, True
+
+        Logger.warning(f"WARN: AMP page unusable, fetching full page of {URL}")
+
+    data = fetch_bytes(URL, kind="article")
+
+    if not data:
+        return None, {}, False
+
+    return data, find_article_metadata(data) or {}, False
+
+
+def prefetch_article(URL: str) -> tuple:
+    """
+    Fetch the full page of the article [URL] like `fetch_article`, and keep
+    it for the article stage when the page was found
+    """
+    article = fetch_article(URL)
+
+    if article[0]:
+        _PREFETCHED[canonical_url(URL)] = article
+
+    return article
+
+
+def amp_paragraphs(soup, selector: str) -> list:
+    """
+    Text of the plain `<p>` tags matched by the CSS [selector], skipping
+    paragraphs wrapping embeds and ad slots
+    """
+    return [
+        p_tag.text
+        for p_tag in soup.select(selector)
+        if p_tag.text.strip() and not p_tag.find(["amp-ad", "amp-embed", "script"])
+    ]
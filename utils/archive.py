@@ -0,0 +1,295 @@
+import os
+import sys
+import uuid
+import time
+import shutil
+import sqlite3
+import argparse
+import tempfile
+import threading
+import subprocess
+import zstandard
+import logging as Logger
+
+from datetime import date, datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.dates import IST, CURRENT_TIME_IST
+from utils.storage import STATE_DIR
+
+
+# --------------------- Constants ---------------------
+
+
+# Set `HISTRAL_ARCHIVE=1` to keep every fetched feed, listing and article
+# response in the archive
+ARCHIVE = os.getenv("HISTRAL_ARCHIVE", "0") == "1"
+
+# Set by `python -m utils.archive reprocess`, responses are read back from
+# the archive and nothing is fetched
+REPLAY = os.getenv("HISTRAL_REPLAY", "0") == "1"
+
+ARCHIVE_DIR = os.getenv("HISTRAL_ARCHIVE_DIR", "archive")
+
+# Fast level, archives are written on the hot path and rarely read
+ARCHIVE_LEVEL = int(os.getenv("HISTRAL_ARCHIVE_LEVEL", "3"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    url TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    day TEXT NOT NULL,
+    scraper TEXT,
+    fetched_at REAL NOT NULL,
+    path TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_url ON records (url, day, fetched_at);
+CREATE INDEX IF NOT EXISTS records_day ON records (day, scraper);
+"""
+
+_LOCK = threading.Lock()
+_LOCAL = threading.local()
+_SEGMENT = None
+
+
+# --------------------- Index ---------------------
+
+
+def _conn() -> sqlite3.Connection:
+    if not hasattr(_LOCAL, "conn"):
+        os.makedirs(ARCHIVE_DIR, exist_ok=True)
+        _LOCAL.conn = sqlite3.connect(
+            os.path.join(ARCHIVE_DIR, "index.sqlite3"), timeout=30
+        )
+        _LOCAL.conn.execute("PRAGMA journal_mode=WAL")
+        _LOCAL.conn.executescript(_SCHEMA)
+
+    return _LOCAL.conn
+
+
+def _scraper() -> str | None:
+    """
+    Entry point module of the running process, e.g. `firstpost.tech`
+    """
+    spec = getattr(sys.modules["__main__"], "__spec__", None)
+    return spec.name if spec else None
+
+
+# --------------------- Records ---------------------
+
+
+def _segment():
+    """
+    Segment file of this process under the directory of its day, so
+    concurrent runs never append to the same file
+    """
+    global _SEGMENT
+
+    if _SEGMENT is None:
+        day = CURRENT_TIME_IST.date().isoformat()
+        directory = os.path.join(ARCHIVE_DIR, day)
+        os.makedirs(directory, exist_ok=True)
+
+        name = (_scraper() or "run").replace(".", "-")
+        path = os.path.join(directory, f"{name}-{os.getpid()}-{time.time_ns()}")
+        _SEGMENT = open(f"{path}.warc.zst", "ab")
+
+    return _SEGMENT
+
+
+def _record(URL: str, data: bytes, kind: str, fetched_at: float) -> bytes:
+    """
+    WARC style `resource` record holding the body of [URL]
+    """
+    headers = [
+        "WARC/1.1",
+        "WARC-Type: resource",
+        f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>",
+        f"WARC-Date: {datetime.fromtimestamp(fetched_at, IST).isoformat()}",
+        f"WARC-Target-URI: {URL}",
+        f"Histral-Kind: {kind}",
+        f"Content-Length: {len(data)}",
+    ]
+    return "\r\n".join(headers).encode("utf-8") + b"\r\n\r\n" + data + b"\r\n\r\n"
+
+
+def archive_response(URL: str, data: bytes, kind: str) -> None:
+    """
+    Append the response [data] of [URL] to the archive as its own zstd
+    frame, so any record can be read back without the rest of the file
+    """
+    if not ARCHIVE or REPLAY or not data:
+        return
+
+    try:
+        fetched_at = time.time()
+        frame = zstandard.ZstdCompressor(level=ARCHIVE_LEVEL).compress(
+            _record(URL, data, kind, fetched_at)
+        )
+
+        with _LOCK:
+            segment = _segment()
+            offset = segment.tell()
+            segment.write(frame)
+            segment.flush()
+
+        conn = _conn()
+        conn.execute(
+            "INSERT INTO records VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                URL,
+                kind,
+                CURRENT_TIME_IST.date().isoformat(),
+                _scraper(),
+                fetched_at,
+                os.path.relpath(segment.name, ARCHIVE_DIR),
+                offset,
+                len(frame),
+                len(data),
+            ),
+        )
+        conn.commit()
+    except Exception as e:
+        Logger.warning(f"WARN: Unable to archive {URL}: {e}")
+
+
+def read_record(path: str, offset: int, length: int) -> tuple:
+    """
+    (headers, body) of the record at [offset] of the segment [path]
+    """
+    with open(os.path.join(ARCHIVE_DIR, path), "rb") as file:
+        file.seek(offset)
+        frame = file.read(length)
+
+    record = zstandard.ZstdDecompressor().decompress(frame)
+    head, _, body = record.partition(b"\r\n\r\n")
+
+    headers = dict(
+        line.split(": ", 1) for line in head.decode("utf-8").split("\r\n")[1:]
+    )
+    return headers, body[: int(headers["Content-Length"])]
+
+
+def replay(URL: str) -> bytes | None:
+    """
+    Archived body of [URL] for the day being reprocessed, the latest one
+    if it was fetched several times
+    """
+    cursor = _conn().execute(
+        "SELECT path, offset, length FROM records WHERE url = ? AND day = ? "
+        "ORDER BY fetched_at DESC LIMIT 1",
+        (URL, CURRENT_TIME_IST.date().isoformat()),
+    )
+    row = cursor.fetchone()
+
+    if row is None:
+        Logger.warning(f"WARN: {URL} is not in the archive")
+        return None
+
+    return read_record(*row)[1]
+
+
+# --------------------- Reprocessing ---------------------
+
+
+def archived_runs(first: date, last: date, scrapers: list = None) -> list:
+    """
+    (day, scraper, last fetch time) of the runs archived from [first] to
+    [last], optionally only those of [scrapers]
+    """
+    rows = _conn().execute(
+        "SELECT day, scraper, MAX(fetched_at) FROM records "
+        "WHERE day BETWEEN ? AND ? AND scraper IS NOT NULL "
+        "GROUP BY day, scraper ORDER BY day, scraper",
+        (first.isoformat(), last.isoformat()),
+    )
+    return [row for row in rows if not scrapers or row[1] in scrapers]
+
+
+def reprocess_run(day: str, scraper: str, fetched_at: float) -> int:
+    """
+    Run [scraper] again over the responses archived on [day], as of the
+    time of its last fetch, returns its exit code
+    """
+    state_dir = tempfile.mkdtemp(prefix=f"reprocess-{day}-{scraper}-", dir=STATE_DIR)
+    env = dict(
+        os.environ,
+        HISTRAL_REPLAY="1",
+        HISTRAL_ARCHIVE="0",
+        HISTRAL_ARTICLE_CACHE="0",
+        HISTRAL_RUN_TIME=datetime.fromtimestamp(fetched_at, IST).isoformat(),
+        HISTRAL_STATE_DIR=state_dir,
+        HISTRAL_ARCHIVE_DIR=os.path.abspath(ARCHIVE_DIR),
+    )
+
+    result = subprocess.run([sys.executable, "-m", scraper], env=env)
+
+    # The state of a failed run is kept to look into it
+    if result.returncode == 0:
+        shutil.rmtree(state_dir, ignore_errors=True)
+
+    return result.returncode
+
+
+def reprocess(first: date, last: date, scrapers: list = None, workers: int = None):
+    """
+    Reprocess the archived runs from [first] to [last] on [workers]
+    processes, returns the number of failed runs
+    """
+    runs = archived_runs(first, last, scrapers)
+    os.makedirs(STATE_DIR, exist_ok=True)
+
+    Logger.info(f"INFO: Reprocessing {len(runs)} archived runs")
+
+    with ThreadPoolExecutor(workers or os.cpu_count()) as executor:
+        codes = list(executor.map(lambda run: reprocess_run(*run), runs))
+
+    for (day, scraper, _), code in zip(runs, codes):
+        if code != 0:
+            Logger.error(f"ERROR: Reprocessing {scraper} for {day} failed")
+
+    return sum(code != 0 for code in codes)
+
+
+# --------------------- Main Execution ---------------------
+
+
+if __name__ == "__main__":
+    from utils.logs import setup_logging
+
+    setup_logging()
+
+    parser = argparse.ArgumentParser(description="Archive of fetched pages")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    reprocess_parser = commands.add_parser(
+        "reprocess", help="Extract, summarize and post archived runs again"
+    )
+    reprocess_parser.add_argument(
+        "--from", dest="first", type=date.fromisoformat, required=True
+    )
+    reprocess_parser.add_argument("--to", dest="last", type=date.fromisoformat)
+    reprocess_parser.add_argument("--scrapers", nargs="*", help="e.g. ndtv.bharat")
+    reprocess_parser.add_argument("--workers", type=int)
+
+    commands.add_parser("list", help="Show the archived runs")
+
+    args = parser.parse_args()
+
+    if args.command == "list":
+        rows = _conn().execute(
+            "SELECT day, scraper, COUNT(*), SUM(size), SUM(length) FROM records "
+            "GROUP BY day, scraper ORDER BY day, scraper"
+        )
+        for day, scraper, count, size, length in rows:
+            print(
+                f"{day}  {scraper or '-':<20} {count:>6} responses "
+                f"{size / 2**20:>8.1f} MB -> {length / 2**20:.1f} MB"
+            )
+    else:
+        last = args.last or args.first
+        failed = reprocess(args.first, last, args.scrapers, args.workers)
+        sys.exit(1 if failed else 0)
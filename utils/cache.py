@@ -0,0 +1,162 @@
+import os
+import time
+import threading
+import logging as Logger
+
+from datetime import datetime
+from functools import wraps
+
+from utils.codec import CODEC
+from utils.dates import WINDOW_START, in_window, iso_in_window
+from utils.logs import trace
+from utils.records import ArticleRecord, dump_record, load_record
+from utils.storage import connect
+from utils.summary import BATCH_SUMMARY, is_chunked
+from utils.urls import article_id
+
+
+# --------------------- Constants ---------------------
+
+
+# Share extracted articles between the runs of every category and outlet,
+# an article linked from several sections is only processed once a day
+ARTICLE_CACHE = os.getenv("HISTRAL_ARTICLE_CACHE", "1") == "1"
+
+# Seconds after which a cached article is extracted again to pick up
+# updates the feeds don't announce, 0 keeps it while its timestamp is
+# inside the window
+ARTICLE_CACHE_TTL = int(os.getenv("HISTRAL_ARTICLE_CACHE_TTL", "3600"))
+
+CACHE_DB = "articles.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    article_id TEXT NOT NULL,
+    variant TEXT NOT NULL,
+    record BLOB NOT NULL,
+    cached_at REAL NOT NULL,
+    PRIMARY KEY (article_id, variant)
+)
+"""
+
+# Fetches run on worker threads, every thread gets its own connection
+_LOCAL = threading.local()
+
+# Last modification of the articles listed by the feeds of the run
+_LISTED = {}
+
+
+# --------------------- Common Functions ---------------------
+
+
+def _conn():
+    if not hasattr(_LOCAL, "conn"):
+        _LOCAL.conn = connect(CACHE_DB)
+        _LOCAL.conn.execute(_SCHEMA)
+
+        # Articles of past windows can't be used anymore
+        _LOCAL.conn.execute("DELETE FROM articles WHERE cached_at < ?", (WINDOW_START,))
+        _LOCAL.conn.commit()
+
+    return _LOCAL.conn
+
+
+def variant() -> str:
+    """
+    Settings the cached records depend on. Bodies are still raw text in
+    batch mode, they are summarized later with the rest of the run.
+    """
+    return f"{CODEC}/{'batch' if BATCH_SUMMARY else 'single'}"
+
+
+def listed(URL: str, modified: datetime) -> None:
+    """
+    Record the last modification of the article [URL] given by a feed or
+    a listing, cached copies extracted before it are no longer valid
+    """
+    _LISTED[article_id(URL)] = modified.timestamp()
+
+
+def _valid(record: ArticleRecord, cached_at: float, modified: float = None) -> bool:
+    if ARTICLE_CACHE_TTL and time.time() - cached_at > ARTICLE_CACHE_TTL:
+        return False
+
+    # The article was edited since it was cached
+    if modified is not None and modified > cached_at:
+        return False
+
+    if isinstance(record.timestamp, datetime):
+        return in_window(record.timestamp)
+
+    return isinstance(record.timestamp, str) and iso_in_window(record.timestamp)
+
+
+def lookup(URL: str) -> ArticleRecord | None:
+    """
+    Article extracted from [URL] by any run of the window, **None** if it
+    was not extracted yet or is no longer valid
+    """
+    key = article_id(URL)
+    cursor = _conn().execute(
+        "SELECT record, cached_at FROM articles "
+        "WHERE article_id = ? AND variant = ?",
+        (key, variant()),
+    )
+    row = cursor.fetchone()
+
+    if row is None:
+        return None
+
+    record = load_record(row[0])[0]
+    return record if _valid(record, row[1], _LISTED.get(key)) else None
+
+
+def store(news) -> None:
+    """
+    Cache an extracted [NewsArticle] or [ArticleRecord]
+    """
+    if not isinstance(news, ArticleRecord):
+        news = ArticleRecord.from_article(news)
+
+    conn = _conn()
+    conn.execute(
+        "INSERT OR REPLACE INTO articles VALUES (?, ?, ?, ?)",
+        (news.article_id, variant(), dump_record(news), time.time()),
+    )
+    conn.commit()
+
+
+def cached(fetch):
+    """
+    Serve [fetch] from the shared article cache, caching what it extracts
+    """
+    if not ARTICLE_CACHE:
+        return fetch
+
+    @wraps(fetch)
+    def wrapper(link: str, *args, **kwargs):
+        try:
+            record = lookup(link)
+        except Exception as e:
+            Logger.warning(f"WARN: Unable to read the article cache: {e}")
+            record = None
+
+        if record is not None:
+            # Cached under the canonical URL, handed back with this link
+            record.src = link
+            trace("cached", "Using cached article for %s", link)
+            return record
+
+        news = fetch(link, *args, **kwargs)
+
+        # Chunked bodies are final even in batch mode and live blogs keep
+        # changing, both are left out of the cache
+        if news and not is_chunked(link):
+            try:
+                store(news)
+            except Exception as e:
+                Logger.warning(f"WARN: Unable to cache article {link}: {e}")
+
+        return news
+
+    return wrapper
@@ -0,0 +1,190 @@
+import os
+import sys
+import json
+import base64
+import argparse
+import threading
+import zstandard
+import logging as Logger
+
+from functools import lru_cache
+from histral_core.encode import encode_text, decode_text
+
+from utils.logs import setup_logging
+
+
+# --------------------- Constants ---------------------
+
+
+# Encoding of article bodies: `default` uses `encode_text`, `zstd` uses zstd
+# with the shared dictionary trained by `python -m utils.codec train`
+CODEC = os.getenv("HISTRAL_CODEC", "default")
+
+# Directory of the trained dictionaries, `<dict id>.zdict`, along with a
+# `CURRENT` file naming the one used to encode
+DICT_DIR = os.getenv("HISTRAL_DICT_DIR", "dictionaries")
+
+ZSTD_LEVEL = int(os.getenv("HISTRAL_ZSTD_LEVEL", "19"))
+
+# Versioned payload prefix, `z1:<dict id>:<base64 zstd frame>`. Dictionary
+# id 0 means the frame was compressed without a dictionary.
+ZSTD_PREFIX = "z1:"
+
+_LOCAL = threading.local()
+
+
+# --------------------- Dictionaries ---------------------
+
+
+def dict_path(dict_id: int) -> str:
+    return os.path.join(DICT_DIR, f"{dict_id}.zdict")
+
+
+@lru_cache(maxsize=None)
+def load_dictionary(dict_id: int):
+    """
+    Trained dictionary [dict_id], kept forever so old payloads stay readable
+    """
+    with open(dict_path(dict_id), "rb") as file:
+        return zstandard.ZstdCompressionDict(file.read())
+
+
+@lru_cache(maxsize=1)
+def current_dict_id() -> int:
+    """
+    Id of the dictionary used to encode, 0 if none was trained yet
+    """
+    try:
+        with open(os.path.join(DICT_DIR, "CURRENT")) as file:
+            return int(file.read().strip())
+    except (OSError, ValueError):
+        return 0
+
+
+def _compressor(dict_id: int):
+    """
+    Compressor of the calling thread for [dict_id], zstd contexts can't be
+    shared between threads
+    """
+    compressors = _LOCAL.__dict__.setdefault("compressors", {})
+
+    if dict_id not in compressors:
+        dictionary = load_dictionary(dict_id) if dict_id else None
+        compressors[dict_id] = zstandard.ZstdCompressor(
+            level=ZSTD_LEVEL, dict_data=dictionary
+        )
+
+    return compressors[dict_id]
+
+
+def _decompressor(dict_id: int):
+    """
+    Decompressor of the calling thread for [dict_id]
+    """
+    decompressors = _LOCAL.__dict__.setdefault("decompressors", {})
+
+    if dict_id not in decompressors:
+        dictionary = load_dictionary(dict_id) if dict_id else None
+        decompressors[dict_id] = zstandard.ZstdDecompressor(dict_data=dictionary)
+
+    return decompressors[dict_id]
+
+
+def train_dictionary(texts: list, size: int = 32 * 1024) -> int:
+    """
+    Train a dictionary of [size] bytes on [texts], save it and make it the
+    current one, returns its id
+    """
+    samples = [text.encode("utf-8") for text in texts if text]
+    dictionary = zstandard.train_dictionary(size, samples, level=ZSTD_LEVEL)
+    dict_id = dictionary.dict_id()
+
+    os.makedirs(DICT_DIR, exist_ok=True)
+
+    with open(dict_path(dict_id), "wb") as file:
+        file.write(dictionary.as_bytes())
+
+    with open(os.path.join(DICT_DIR, "CURRENT"), "w") as file:
+        file.write(f"{dict_id}\n")
+
+    current_dict_id.cache_clear()
+    return dict_id
+
+
+# --------------------- Common Functions ---------------------
+
+
+def zstd_encode(text: str, dict_id: int = None) -> str:
+    """
+    Compress [text] with dictionary [dict_id] (the current one by default)
+    """
+    dict_id = current_dict_id() if dict_id is None else dict_id
+    frame = _compressor(dict_id).compress(text.encode("utf-8"))
+    return f"{ZSTD_PREFIX}{dict_id}:{base64.b64encode(frame).decode('ascii')}"
+
+
+def encode_body(text: str) -> str:
+    """
+    Encode an article body with the codec selected by `HISTRAL_CODEC`
+    """
+    if CODEC == "zstd":
+        return zstd_encode(text)
+
+    return encode_text(text)
+
+
+def decode_body(payload: str) -> str:
+    """
+    Decode a body written by any codec version
+    """
+    if payload.startswith(ZSTD_PREFIX):
+        dict_id, frame = payload[len(ZSTD_PREFIX) :].split(":", 1)
+        return _decompressor(int(dict_id)).decompress(base64.b64decode(frame)).decode()
+
+    return decode_text(payload)
+
+
+def corpus(paths: list) -> list:
+    """
+    Decoded bodies and sub headings of the JSONL exports at [paths]
+    """
+    texts = []
+
+    for path in paths:
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                article = json.loads(line)
+
+                if article.get("body"):
+                    texts.append(decode_body(article["body"]))
+                if article.get("sub_heading"):
+                    texts.append(article["sub_heading"])
+
+    return texts
+
+
+# --------------------- Main Execution ---------------------
+
+
+if __name__ == "__main__":
+    setup_logging()
+
+    parser = argparse.ArgumentParser(description="Body codec dictionaries")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    train_parser = commands.add_parser("train", help="Train a new dictionary")
+    train_parser.add_argument("exports", nargs="+", help="JSONL exports to train on")
+    train_parser.add_argument("--size", type=int, default=32 * 1024)
+
+    args = parser.parse_args()
+
+    try:
+        texts = corpus(args.exports)
+        dict_id = train_dictionary(texts, args.size)
+        Logger.info(
+            f"INFO: Trained dictionary {dict_id} on {len(texts)} texts, "
+            f"saved to {dict_path(dict_id)}"
+        )
+    except Exception as e:
+        Logger.critical(f"FATAL: Unable to train dictionary: {e}")
+        sys.exit(1)
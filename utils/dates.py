@@ -0,0 +1,171 @@
+import os
+import re
+import pytz
+import logging as Logger
+
+from functools import lru_cache
+from datetime import datetime, timedelta
+
+
+# --------------------- Constants ---------------------
+
+
+IST = pytz.timezone("Asia/Kolkata")
+
+# ISO time the run is pinned to, set when reprocessing archived pages so
+# the window is the one of the original run
+RUN_TIME = os.getenv("HISTRAL_RUN_TIME", "")
+
+if RUN_TIME:
+    CURRENT_TIME_IST = datetime.fromisoformat(RUN_TIME).astimezone(IST)
+else:
+    CURRENT_TIME_IST = datetime.now(IST)
+TODAY_8PM = CURRENT_TIME_IST.replace(
+    hour=20,
+    minute=0,
+    second=0,
+    microsecond=0,
+)
+YESTERDAY_8PM = CURRENT_TIME_IST.replace(
+    hour=20,
+    minute=0,
+    second=0,
+    microsecond=0,
+) - timedelta(days=1)
+
+# Window bounds as epoch seconds, for cheap numeric comparisons
+WINDOW_START = YESTERDAY_8PM.timestamp()
+WINDOW_END = TODAY_8PM.timestamp()
+
+DAY_SECONDS = 24 * 60 * 60
+
+# Outlet date formats
+FP = "FP"  # 'September 13, 2024, 12:52:19'
+HINDU = "HINDU"  # 'September 13, 2024 10:52 pm'
+ISN = "ISN"  # '15 Sep 2024 23:59'
+NDTV = "NDTV"  # 'Monday September 16 2024'
+NDTV_CRICKET = "NDTV_CRICKET"  # 'Sep 16, 2024'
+
+_MONTH = r"(?P<month>[A-Za-z]+)\.?"
+_DAY = r"(?P<day>\d{1,2})"
+_YEAR = r"(?P<year>\d{4})"
+
+PATTERNS = {
+    FP: re.compile(
+        rf"{_MONTH}\s+{_DAY},\s*{_YEAR},?\s*"
+        r"(?P<hour>\d{1,2}):(?P<minute>\d{2}):(?P<second>\d{2})"
+    ),
+    HINDU: re.compile(
+        rf"{_MONTH}\s+{_DAY},\s*{_YEAR}\s+"
+        r"(?P<hour>\d{1,2}):(?P<minute>\d{2})\s*(?P<meridiem>[AaPp][Mm])"
+    ),
+    ISN: re.compile(
+        rf"{_DAY}\s+{_MONTH}\s+{_YEAR}\s+(?P<hour>\d{{1,2}}):(?P<minute>\d{{2}})"
+    ),
+    NDTV: re.compile(rf"(?:[A-Za-z]+,?\s+)?{_MONTH}\s+{_DAY},?\s+{_YEAR}"),
+    NDTV_CRICKET: re.compile(rf"{_MONTH}\s+{_DAY},\s*{_YEAR}"),
+}
+
+MONTHS = {
+    name: index + 1
+    for index, names in enumerate(
+        [
+            ("january", "jan"),
+            ("february", "feb"),
+            ("march", "mar"),
+            ("april", "apr"),
+            ("may",),
+            ("june", "jun"),
+            ("july", "jul"),
+            ("august", "aug"),
+            ("september", "sep", "sept"),
+            ("october", "oct"),
+            ("november", "nov"),
+            ("december", "dec"),
+        ]
+    )
+    for name in names
+}
+
+
+# --------------------- Common Functions ---------------------
+
+
+@lru_cache(maxsize=4096)
+def parse_date(outlet: str, date_str: str) -> datetime | None:
+    """
+    Parse [date_str] with the precompiled pattern of [outlet], always
+    returns a timezone aware IST datetime, **None** if it can't be parsed.
+
+    Listings repeat the same dates many times, so results are memoized.
+    """
+    match = PATTERNS[outlet].search(date_str.replace("IST", ""))
+    month = MONTHS.get(match.group("month").lower()) if match else None
+
+    if month is None:
+        Logger.error(f"ERROR: Unable to parse {outlet} date '{date_str.strip()}'")
+        return None
+
+    fields = match.groupdict()
+    hour = int(fields.get("hour") or 0)
+
+    if fields.get("meridiem"):
+        hour = hour % 12 + (12 if fields["meridiem"].lower() == "pm" else 0)
+
+    try:
+        date_object = datetime(
+            int(fields["year"]),
+            month,
+            int(fields["day"]),
+            hour,
+            int(fields.get("minute") or 0),
+            int(fields.get("second") or 0),
+        )
+    except ValueError as e:
+        Logger.error(f"ERROR: Unable to parse {outlet} date '{date_str.strip()}': {e}")
+        return None
+
+    return IST.localize(date_object)
+
+
+@lru_cache(maxsize=4096)
+def parse_iso(iso_time: str) -> datetime | None:
+    """
+    Parse an ISO timestamp to an IST datetime, naive values are read as IST
+    """
+    try:
+        date_object = datetime.fromisoformat(iso_time)
+    except (TypeError, ValueError):
+        Logger.warning(f"WARN: Invalid ISO timestamp: {iso_time}")
+        return None
+
+    if date_object.tzinfo is None:
+        return IST.localize(date_object)
+
+    return date_object.astimezone(IST)
+
+
+def in_window(date_object: datetime | float) -> bool:
+    """
+    Whether a datetime (or epoch seconds) is between yesterday 8PM and
+    today 8PM
+    """
+    if isinstance(date_object, datetime):
+        date_object = date_object.timestamp()
+
+    return WINDOW_START <= date_object <= WINDOW_END
+
+
+def day_in_window(date_object: datetime) -> bool:
+    """
+    Whether any moment of the day of [date_object] is inside the window,
+    for listings which only show the day of publication
+    """
+    day_start = date_object.replace(hour=0, minute=0, second=0, microsecond=0)
+    day_start = day_start.timestamp()
+    return day_start <= WINDOW_END and day_start + DAY_SECONDS > WINDOW_START
+
+
+def iso_in_window(iso_time: str) -> bool:
+    date_object = parse_iso(iso_time)
+    return date_object is not None and in_window(date_object)
@@ -0,0 +1,254 @@
+import os
+import logging as Logger
+
+from io import BytesIO
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from xml.etree.ElementTree import iterparse, ParseError
+
+from utils.amp import prefetch_article
+from utils.cache import listed, lookup
+from utils.http import fetch_bytes
+from utils.jsonld import article_time
+from utils.urls import clean_url, canonical_url
+from utils.dates import IST, WINDOW_START, parse_iso, in_window
+
+
+# --------------------- Constants ---------------------
+
+
+# `feeds` reads news sitemaps and RSS feeds and falls back to the HTML
+# listings when they yield nothing, `html` only reads the listings
+DISCOVERY = os.getenv("HISTRAL_DISCOVERY", "feeds")
+
+# Listing pages read per section at most
+MAX_LISTING_PAGES = int(os.getenv("HISTRAL_MAX_LISTING_PAGES", "5"))
+
+# Listing pages fetched at the same time, across sections
+LISTING_WORKERS = max(int(os.getenv("HISTRAL_LISTING_WORKERS", "4")), 1)
+
+# Elements holding the link and the date of an entry, across sitemaps,
+# RSS and Atom
+_ENTRY_TAGS = ("url", "item", "entry")
+_LINK_TAGS = ("loc", "link")
+_DATE_TAGS = ("publication_date", "lastmod", "pubDate", "updated", "published")
+
+# Publication date of the links streamed from the feeds
+_FEED_DATES = {}
+
+
+# --------------------- Common Functions ---------------------
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _parse_feed_date(value: str):
+    value = value.strip()
+
+    # RSS uses RFC 822 dates, sitemaps and Atom use ISO 8601
+    if value[:1].isalpha():
+        try:
+            return parsedate_to_datetime(value).astimezone(IST)
+        except (TypeError, ValueError):
+            return None
+
+    return parse_iso(value.replace("Z", "+00:00"))
+
+
+@lru_cache(maxsize=64)
+def fetch_feed_entries(feed_url: str) -> tuple:
+    """
+    Read the (link, date, modified) entries of a news sitemap, RSS or Atom
+    feed, [modified] being the latest of the dates of an entry. Feeds are
+    shared by sections of the same outlet, so they are only fetched once
+    per run.
+    """
+    data = fetch_bytes(feed_url, kind="feed")
+
+    if not data:
+        return ()
+
+    entries = []
+    link, dates = None, []
+
+    try:
+        for event, element in iterparse(BytesIO(data), events=("start", "end")):
+            name = _local_name(element.tag)
+
+            if event == "start":
+                if name in _ENTRY_TAGS:
+                    link, dates = None, []
+            elif name in _LINK_TAGS and link is None:
+                link = (element.text or element.get("href") or "").strip()
+            elif name in _DATE_TAGS and element.text:
+                dates.append(_parse_feed_date(element.text))
+            elif name in _ENTRY_TAGS:
+                if link:
+                    known = [date for date in dates if date is not None]
+                    entries.append(
+                        (link, known[0] if known else None, max(known, default=None))
+                    )
+                link, dates = None, []
+                element.clear()
+    except ParseError as e:
+        Logger.error(f"ERROR: Unable to parse feed {feed_url}: {e}")
+
+    Logger.info(f"TRACE: Found {len(entries)} entries in {feed_url}")
+    return tuple(entries)
+
+
+def iter_feed_links(feeds: list, prefix: str = ""):
+    """
+    Stream the links of [feeds] published inside the window, optionally
+    only those starting with [prefix]
+    """
+    seen = set()
+
+    for feed_url in feeds:
+        for link, date, modified in fetch_feed_entries(feed_url):
+            link = clean_url(link, feed_url)
+            key = canonical_url(link)
+
+            if key in seen or not link.startswith(prefix):
+                continue
+
+            if date is None or not in_window(date):
+                continue
+
+            seen.add(key)
+            _FEED_DATES[key] = date
+            listed(link, modified)
+            yield link
+
+
+def feed_date(link: str):
+    """
+    Publication date of [link] if it was found in a feed, **None** otherwise
+    """
+    return _FEED_DATES.get(canonical_url(link))
+
+
+def discover_links(feeds: list, fallback, prefix: str = ""):
+    """
+    Stream the news links of the window from [feeds], falling back to the
+    HTML listing read by [fallback] when feeds are disabled or yield nothing
+    """
+    found = 0
+
+    if DISCOVERY == "feeds" and feeds:
+        for link in iter_feed_links(feeds, prefix):
+            found += 1
+            yield link
+
+    if found == 0:
+        if DISCOVERY == "feeds" and feeds:
+            Logger.warning("WARN: No links found in feeds, reading the listing")
+
+        yield from fallback()
+    else:
+        Logger.info(f"TRACE: Found total {found} news links in feeds")
+
+
+# --------------------- Paginated Listings ---------------------
+
+
+def probe_date(link: str):
+    """
+    Publication date of the article [link] from its JSON-LD metadata,
+    **None** when it can't be found. The page is kept for the article
+    stage, so it is only fetched once.
+    """
+    _, metadata, _ = prefetch_article(link)
+    return article_time(metadata, "date_published", "date_modified")
+
+
+def _cached(link: str) -> bool:
+    try:
+        return lookup(link) is not None
+    except Exception as e:
+        Logger.warning(f"WARN: Unable to read the article cache: {e}")
+        return False
+
+
+def _read_page(read_page, URL: str) -> list:
+    try:
+        return read_page(URL)
+    except Exception as e:
+        Logger.error(f"ERROR: Unable to read listing page {URL}: {e}")
+        return []
+
+
+def _section_done(links: list, new_links: list) -> bool:
+    """
+    Whether a section listing ends with a page of [links], [new_links]
+    being the ones not seen on its earlier pages
+    """
+    if not new_links:
+        return True
+
+    # Listings are sorted by recency, the last article is the oldest. The
+    # cache only serves articles of the window.
+    if _cached(links[-1]):
+        return False
+
+    oldest = probe_date(links[-1])
+    return oldest is not None and oldest.timestamp() < WINDOW_START
+
+
+def crawl_listings(sections: list, page_url, read_page, max_pages=MAX_LISTING_PAGES):
+    """
+    Stream the unique links of the paginated listings of [sections].
+
+    Pages of all the sections are fetched `LISTING_WORKERS` at a time,
+    [page_url] (section, number) builds the address of a page and
+    [read_page] (URL) returns its links. A section stops at its first page
+    with no new links or whose last article is older than the window.
+    """
+    seen = set()
+    next_page = {section: 1 for section in sections}
+
+    with ThreadPoolExecutor(LISTING_WORKERS) as executor:
+        while next_page:
+            # Pages read ahead for every section still being walked
+            ahead = max(LISTING_WORKERS // len(next_page), 1)
+            rounds = {
+                section: [
+                    executor.submit(_read_page, read_page, page_url(section, number))
+                    for number in range(first, min(first + ahead, max_pages + 1))
+                ]
+                for section, first in next_page.items()
+            }
+
+            for section, pages in rounds.items():
+                done = False
+
+                for future in pages:
+                    links = future.result()
+                    new_links = []
+
+                    for link in links:
+                        key = canonical_url(link)
+
+                        if key not in seen:
+                            seen.add(key)
+                            new_links.append(link)
+
+                    yield from new_links
+
+                    next_page[section] += 1
+
+                    if _section_done(links, new_links):
+                        done = True
+                        break
+
+                if done or next_page[section] > max_pages:
+                    Logger.info(
+                        f"TRACE: Read {next_page[section] - 1} listing pages "
+                        f"of {section}"
+                    )
+                    del next_page[section]
+
+    Logger.info(f"TRACE: Found total {len(seen)} news links in the listings")
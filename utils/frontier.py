@@ -0,0 +1,212 @@
+import os
+import time
+import logging as Logger
+
+from utils.storage import connect
+
+
+# --------------------- Constants ---------------------
+
+
+FRONTIER_DB = "frontier.sqlite3"
+
+# Number of state changes between two checkpoints
+CHECKPOINT_EVERY = int(os.getenv("HISTRAL_CHECKPOINT_EVERY", "10"))
+
+# Fetches of a link before it is given up for the rest of the run
+FETCH_ATTEMPTS = int(os.getenv("HISTRAL_FETCH_ATTEMPTS", "3"))
+
+# States of a link in the crawl frontier, in order
+DISCOVERED = "discovered"
+FETCHED = "fetched"
+EXTRACTED = "extracted"
+
+# Links which were processed but did not produce any article
+SKIPPED = "skipped"
+
+# Links whose fetch failed, retried until `FETCH_ATTEMPTS`
+FAILED = "failed"
+
+_DONE = (EXTRACTED, SKIPPED)
+
+# Links whose last fetch failed in a way worth retrying, fetches may run
+# on worker threads
+_FETCH_FAILED = set()
+
+# Links are keyed by the link as listed rather than its `article_id`, as the
+# frontier hands them back to be fetched. Variants of the same article are
+# fetched once anyway, the scheduler collapses them by canonical URL.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS links (
+    run_key TEXT NOT NULL,
+    url TEXT NOT NULL,
+    state TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (run_key, url)
+);
+CREATE TABLE IF NOT EXISTS cursors (
+    run_key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value INTEGER NOT NULL,
+    PRIMARY KEY (run_key, name)
+);
+"""
+
+
+# --------------------- Common Functions ---------------------
+
+
+def fetch_failed(URL: str) -> None:
+    """
+    Record that fetching [URL] failed, like a network error, and should be
+    retried instead of skipped
+    """
+    _FETCH_FAILED.add(URL)
+
+
+def fetch_outcome(URL: str) -> str:
+    """
+    State of [URL] once its fetch produced no article
+    """
+    if URL in _FETCH_FAILED:
+        _FETCH_FAILED.discard(URL)
+        return FAILED
+
+    return SKIPPED
+
+
+# --------------------- Frontier ---------------------
+
+
+class Frontier:
+    """
+    Persisted crawl frontier of one (date, category, outlet) run.
+
+    Tracks the state of every discovered link along with discovery cursors
+    (like the last listing page read), and checkpoints them every
+    `CHECKPOINT_EVERY` changes. A run interrupted halfway resumes from the
+    last checkpoint, links already extracted are not fetched again. Once
+    the run completes, the next one starts over.
+    """
+
+    def __init__(self, run_key: str):
+        self.run_key = run_key
+        self.conn = connect(FRONTIER_DB)
+        self.conn.executescript(_SCHEMA)
+
+        # Frontiers checkpointed before failed fetches were retried
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(links)")]
+
+        if "attempts" not in columns:
+            self.conn.execute(
+                "ALTER TABLE links ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0"
+            )
+        self._changes = 0
+
+        if self.get_cursor("started"):
+            Logger.info(f"INFO: Resuming {run_key} from last checkpoint")
+
+        self.set_cursor("started", 1)
+        self.checkpoint()
+
+    # --------------------- Links ---------------------
+
+    def discover(self, urls: list) -> int:
+        """
+        Add [urls] to the frontier in listing order, returns the number
+        of links that were not known yet
+        """
+        position = self.conn.execute(
+            "SELECT COALESCE(MAX(position), -1) FROM links WHERE run_key = ?",
+            (self.run_key,),
+        ).fetchone()[0]
+
+        added = 0
+        now = time.time()
+
+        for url in urls:
+            position += 1
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO links VALUES (?, ?, ?, ?, ?, 0)",
+                (self.run_key, url, DISCOVERED, position, now),
+            )
+            added += cursor.rowcount
+
+        self._changed(added)
+        return added
+
+    def mark(self, url: str, state: str) -> None:
+        """
+        Move [url] to [state], checkpointing periodically
+        """
+        self.conn.execute(
+            "UPDATE links SET state = ?, updated_at = ?, attempts = attempts + ? "
+            "WHERE run_key = ? AND url = ?",
+            (state, time.time(), state == FAILED, self.run_key, url),
+        )
+        self._changed(1)
+
+    def state(self, url: str) -> str | None:
+        row = self.conn.execute(
+            "SELECT state FROM links WHERE run_key = ? AND url = ?",
+            (self.run_key, url),
+        ).fetchone()
+        return row[0] if row else None
+
+    def pending(self) -> list:
+        """
+        Links discovered but not processed yet, in listing order. Links
+        whose fetch failed are retried until `FETCH_ATTEMPTS`.
+        """
+        rows = self.conn.execute(
+            f"SELECT url FROM links WHERE run_key = ? AND state NOT IN "
+            f"({', '.join('?' * len(_DONE))}) AND attempts < ? ORDER BY position",
+            (self.run_key, *_DONE, FETCH_ATTEMPTS),
+        )
+        return [row[0] for row in rows]
+
+    def todo(self, urls: list) -> list:
+        """
+        Links of [urls] still to process, in their order
+        """
+        pending = set(self.pending())
+        return [url for url in urls if url in pending]
+
+    def complete(self) -> None:
+        """
+        Forget the links and cursors of the run once its articles are
+        posted, so the next run of the window discovers and fetches again
+        """
+        self.conn.execute("DELETE FROM links WHERE run_key = ?", (self.run_key,))
+        self.conn.execute("DELETE FROM cursors WHERE run_key = ?", (self.run_key,))
+        self.checkpoint()
+
+    # --------------------- Cursors ---------------------
+
+    def get_cursor(self, name: str, default: int = 0) -> int:
+        row = self.conn.execute(
+            "SELECT value FROM cursors WHERE run_key = ? AND name = ?",
+            (self.run_key, name),
+        ).fetchone()
+        return row[0] if row else default
+
+    def set_cursor(self, name: str, value: int) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO cursors VALUES (?, ?, ?)",
+            (self.run_key, name, value),
+        )
+        self._changed(1)
+
+    # --------------------- Checkpoints ---------------------
+
+    def checkpoint(self) -> None:
+        self.conn.commit()
+        self._changes = 0
+
+    def _changed(self, count: int) -> None:
+        self._changes += count
+
+        if self._changes >= CHECKPOINT_EVERY:
+            self.checkpoint()
@@ -0,0 +1,78 @@
+import os
+import requests
+import logging as Logger
+
+from urllib.parse import urlsplit
+
+from utils.archive import REPLAY, archive_response, replay
+from utils.logs import count
+
+
+# --------------------- Constants ---------------------
+
+
+TIMEOUT = float(os.getenv("HISTRAL_HTTP_TIMEOUT", "20"))
+
+# Address of `python -m benchmarks.sites`, every outlet request is sent to
+# the synthetic sites instead when set
+SITE_PROXY = os.getenv("HISTRAL_SITE_PROXY", "")
+
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+    ),
+    "Accept-Encoding": "gzip, deflate",
+}
+
+_SESSION = requests.Session()
+_SESSION.headers.update(HEADERS)
+
+
+# --------------------- Common Functions ---------------------
+
+
+def resolve(URL: str) -> str:
+    """
+    Address [URL] is actually fetched from, `<SITE_PROXY>/<host><path>`
+    when running against the synthetic sites
+    """
+    parts = urlsplit(URL)
+
+    if not SITE_PROXY or not parts.netloc:
+        return URL
+
+    query = f"?{parts.query}" if parts.query else ""
+    return f"{SITE_PROXY.rstrip('/')}/{parts.netloc}{parts.path}{query}"
+
+
+def _count(data: bytes | None) -> None:
+    if data:
+        count("requests")
+        count("bytes", len(data))
+
+
+def fetch_bytes(URL: str, kind: str = "page") -> bytes | None:
+    """
+    Fetch the raw body of [URL], return **None** on any failure. The
+    response is archived as a [kind] (`feed`, `listing` or `article`)
+    when archiving, and read back from the archive when reprocessing.
+    """
+    if REPLAY:
+        data = replay(URL)
+        _count(data)
+        return data
+
+    try:
+        response = _SESSION.get(resolve(URL), timeout=TIMEOUT)
+
+        if response.status_code != 200:
+            Logger.warning(f"WARN: Got HTTP {response.status_code} from {URL}")
+            return None
+
+        archive_response(URL, response.content, kind)
+        _count(response.content)
+        return response.content
+    except Exception as e:
+        Logger.error(f"ERROR: Unable to fetch {URL}: {e}")
+        return None
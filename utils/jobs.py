@@ -0,0 +1,370 @@
+import os
+import sys
+import time
+import socket
+import argparse
+import threading
+import subprocess
+import logging as Logger
+
+from datetime import date, datetime
+from histral_core.firebase import Category, OutletCode
+
+from isn.common import NEWS_URLS
+from utils.logs import setup_logging, log_context
+from utils.dates import IST
+from utils.outbox import Outbox
+from utils.profiler import start_profile
+from utils.storage import STATE_DIR, connect
+
+
+# --------------------- Constants ---------------------
+
+
+# The queue always lives next to the outboxes, workers sharing it share
+# the outboxes the units write their articles to
+JOBS_DB = "jobs.sqlite3"
+
+LEASE_TTL = int(os.getenv("HISTRAL_LEASE_TTL", "900"))
+MAX_ATTEMPTS = int(os.getenv("HISTRAL_MAX_ATTEMPTS", "3"))
+
+# Entry point module -> (outlet code, category)
+SCRAPERS = {
+    "firstpost.bharat": (OutletCode.FP, Category.BHARAT),
+    "firstpost.business": (OutletCode.FP, Category.BUSINESS),
+    "firstpost.cricket": (OutletCode.FP, Category.CRICKET),
+    "firstpost.tech": (OutletCode.FP, Category.TECHNOLOGY),
+    "firstpost.usa": (OutletCode.FP, Category.USA),
+    "hindu.bharat": (OutletCode.HINDU, Category.BHARAT),
+    "hindu.business": (OutletCode.HINDU, Category.BUSINESS),
+    "hindu.tech": (OutletCode.HINDU, Category.TECHNOLOGY),
+    "isn.business": (OutletCode.ISN, Category.BUSINESS),
+    "ndtv.bharat": (OutletCode.NDTV, Category.BHARAT),
+    "ndtv.cricket": (OutletCode.NDTV, Category.CRICKET),
+    "ndtv.usa": (OutletCode.NDTV, Category.USA),
+}
+
+# Entry points walking a paginated listing, split in page ranges
+PAGINATED = ("ndtv.bharat", "ndtv.usa")
+
+QUEUED = "queued"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+# Section of the unit posting a run once all of its scrape units are done
+# or failed
+FLUSH = "#flush"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    scraper TEXT NOT NULL,
+    window TEXT NOT NULL,
+    section TEXT NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    last_error TEXT,
+    UNIQUE (scraper, window, section)
+)
+"""
+
+
+# --------------------- Common Functions ---------------------
+
+
+def current_window() -> str:
+    return datetime.now(IST).date().isoformat()
+
+
+# --------------------- Job Queue ---------------------
+
+
+class JobQueue:
+    """
+    Lease based queue of scrape units backed by SQLite.
+
+    A unit is leased to one worker for `LEASE_TTL` seconds and renewed
+    while it runs. Units whose lease expired are handed to another worker,
+    failed units are retried up to `MAX_ATTEMPTS` times. Once no unit of a
+    run is left to scrape, a flush unit posting the run is queued.
+    """
+
+    def __init__(self):
+        self.conn = connect(JOBS_DB)
+        self.conn.isolation_level = None
+        self.conn.execute(_SCHEMA)
+
+    def enqueue(self, scraper: str, window: str, section: str = "") -> bool:
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO jobs (scraper, window, section, state) "
+            "VALUES (?, ?, ?, ?)",
+            (scraper, window, section, QUEUED),
+        )
+        return cursor.rowcount == 1
+
+    def lease(self, worker_id: str, ttl: int = LEASE_TTL):
+        """
+        Lease the next available unit to [worker_id], returns
+        (id, scraper, window, section) or **None** if nothing is available
+        """
+        now = time.time()
+
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Units of a past window can't be scraped from the listings anymore
+            self.conn.execute(
+                "UPDATE jobs SET state = ?, last_error = 'stale window' "
+                "WHERE state IN (?, ?) AND window < ? AND section != ?",
+                (FAILED, QUEUED, LEASED, current_window(), FLUSH),
+            )
+
+            # Workers which died on their last attempt don't get a new one
+            self.conn.execute(
+                "UPDATE jobs SET state = ?, lease_owner = NULL, "
+                "last_error = 'lease expired' "
+                "WHERE state = ? AND lease_expires < ? AND attempts >= ?",
+                (FAILED, LEASED, now, MAX_ATTEMPTS),
+            )
+
+            self._queue_flushes()
+
+            row = self.conn.execute(
+                "SELECT id, scraper, window, section FROM jobs "
+                "WHERE state = ? OR (state = ? AND lease_expires < ?) "
+                "ORDER BY id LIMIT 1",
+                (QUEUED, LEASED, now),
+            ).fetchone()
+
+            if row:
+                self.conn.execute(
+                    "UPDATE jobs SET state = ?, lease_owner = ?, lease_expires = ?, "
+                    "attempts = attempts + 1 WHERE id = ?",
+                    (LEASED, worker_id, now + ttl, row[0]),
+                )
+
+            self.conn.execute("COMMIT")
+            return row
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def renew(self, job_id: int, worker_id: str, ttl: int = LEASE_TTL) -> None:
+        self.conn.execute(
+            "UPDATE jobs SET lease_expires = ? WHERE id = ? AND lease_owner = ?",
+            (time.time() + ttl, job_id, worker_id),
+        )
+
+    def complete(self, job_id: int) -> None:
+        self.conn.execute(
+            "UPDATE jobs SET state = ?, lease_owner = NULL WHERE id = ?",
+            (DONE, job_id),
+        )
+
+    def fail(self, job_id: int, error: str) -> None:
+        self.conn.execute(
+            "UPDATE jobs SET state = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+            "lease_owner = NULL, last_error = ? WHERE id = ?",
+            (MAX_ATTEMPTS, FAILED, QUEUED, error, job_id),
+        )
+
+    def group_done(self, scraper: str, window: str) -> bool:
+        """
+        Whether every scrape unit of [scraper] for [window] is done or failed
+        """
+        cursor = self.conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE scraper = ? AND window = ? "
+            "AND section != ? AND state IN (?, ?)",
+            (scraper, window, FLUSH, QUEUED, LEASED),
+        )
+        return cursor.fetchone()[0] == 0
+
+    def failed_units(self, scraper: str, window: str) -> int:
+        cursor = self.conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE scraper = ? AND window = ? "
+            "AND section != ? AND state = ?",
+            (scraper, window, FLUSH, FAILED),
+        )
+        return cursor.fetchone()[0]
+
+    def _queue_flushes(self) -> None:
+        """
+        Queue one flush unit for every run whose scrape units are all done
+        or failed
+        """
+        self.conn.execute(
+            "INSERT OR IGNORE INTO jobs (scraper, window, section, state) "
+            "SELECT scraper, window, ?, ? FROM jobs WHERE section != ? "
+            "GROUP BY scraper, window HAVING SUM(state IN (?, ?)) = 0",
+            (FLUSH, QUEUED, FLUSH, QUEUED, LEASED),
+        )
+
+    def status(self) -> list:
+        return self.conn.execute(
+            "SELECT scraper, window, state, COUNT(*) FROM jobs "
+            "GROUP BY scraper, window, state ORDER BY window, scraper"
+        ).fetchall()
+
+
+# --------------------- Runner ---------------------
+
+
+def plan(queue: JobQueue, window: str, pages_per_unit: int, max_pages: int) -> int:
+    """
+    Enqueue the scrape units of every entry point for [window]: one unit
+    per ISN section, NDTV listings split in page ranges and one unit for
+    the rest. The last page range is open ended and walks on until the
+    time window ends.
+    """
+    added = 0
+
+    for scraper in SCRAPERS:
+        if scraper == "isn.business":
+            sections = NEWS_URLS
+        elif scraper in PAGINATED:
+            firsts = list(range(1, max_pages + 1, pages_per_unit))
+            sections = [
+                f"pages:{first}-{first + pages_per_unit - 1}" for first in firsts[:-1]
+            ]
+            sections.append(f"pages:{firsts[-1]}-")
+        else:
+            sections = [""]
+
+        for section in sections:
+            added += queue.enqueue(scraper, window, section)
+
+    return added
+
+
+def run_unit(queue: JobQueue, job: tuple, worker_id: str, argv: list) -> None:
+    """
+    Run the entry point of [job] in a child process, renewing its lease
+    until it exits
+    """
+    job_id, scraper, window, section = job
+    env = dict(
+        os.environ,
+        HISTRAL_SECTION=section,
+        HISTRAL_DEFER_FLUSH="1",
+        HISTRAL_STATE_DIR=os.path.abspath(STATE_DIR),
+    )
+
+    finished = threading.Event()
+
+    def keep_alive():
+        renewer = JobQueue()
+        while not finished.wait(LEASE_TTL / 3):
+            renewer.renew(job_id, worker_id)
+
+    threading.Thread(target=keep_alive, daemon=True).start()
+
+    try:
+        result = subprocess.run(
+            [sys.executable, "-m", scraper, *argv],
+            env=env,
+        )
+    finally:
+        finished.set()
+
+    if result.returncode != 0:
+        queue.fail(job_id, f"exit code {result.returncode}")
+        Logger.error(f"ERROR: Unit {scraper} [{section}] failed")
+        return
+
+    queue.complete(job_id)
+    Logger.info(f"INFO: Unit {scraper} [{section}] done")
+
+
+def run_flush(queue: JobQueue, job: tuple) -> None:
+    """
+    Post the articles every unit of the run of [job] journaled to the
+    shared outbox
+    """
+    job_id, scraper, window, _ = job
+    outlet_code, category = SCRAPERS[scraper]
+
+    failed = queue.failed_units(scraper, window)
+
+    if failed:
+        Logger.warning(f"WARN: Posting {scraper} without its {failed} failed units")
+
+    posted = Outbox(date.fromisoformat(window), category, outlet_code).flush()
+    queue.complete(job_id)
+    Logger.info(f"INFO: Posted *{posted}* news articles for {scraper}")
+
+
+def work(worker_id: str, argv: list, wait: bool) -> None:
+    """
+    Lease and run units until the queue is drained
+    """
+    queue = JobQueue()
+
+    while True:
+        job = queue.lease(worker_id)
+
+        if job is None:
+            if not wait:
+                Logger.info(f"INFO: No more units for worker {worker_id}")
+                return
+            time.sleep(5)
+            continue
+
+        Logger.info(f"TRACE: Worker {worker_id} leased {job[1]} [{job[3]}]")
+
+        try:
+            if job[3] == FLUSH:
+                run_flush(queue, job)
+            else:
+                run_unit(queue, job, worker_id, argv)
+        except Exception as e:
+            queue.fail(job[0], str(e))
+            Logger.error(f"ERROR: Unable to run unit {job[1]} [{job[3]}]: {e}")
+
+
+# --------------------- Main Execution ---------------------
+
+
+if __name__ == "__main__":
+    setup_logging()
+
+    parser = argparse.ArgumentParser(description="Distributed scrape runner")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    enqueue_parser = commands.add_parser("enqueue", help="Enqueue today's units")
+    enqueue_parser.add_argument("--pages-per-unit", type=int, default=2)
+    enqueue_parser.add_argument(
+        "--max-pages",
+        type=int,
+        default=6,
+        help="Pages split in units, the last unit walks on past them",
+    )
+
+    worker_parser = commands.add_parser("worker", help="Lease and run units")
+    worker_parser.add_argument("--id", default=f"{socket.gethostname()}-{os.getpid()}")
+    worker_parser.add_argument(
+        "--wait", action="store_true", help="Keep polling when the queue is empty"
+    )
+    worker_parser.add_argument(
+        "--profile", action="store_true", help="Profile the worker and its units"
+    )
+
+    commands.add_parser("status", help="Show the state of the queue")
+
+    args, extra = parser.parse_known_args()
+
+    if args.command == "enqueue":
+        added = plan(JobQueue(), current_window(), args.pages_per_unit, args.max_pages)
+        Logger.info(f"INFO: Enqueued {added} units for {current_window()}")
+    elif args.command == "worker":
+        if args.profile:
+            start_profile(f"JOBS/{args.id}")
+            extra.append("--profile")
+
+        log_context(worker=args.id)
+
+        work(args.id, extra, args.wait)
+    else:
+        for scraper, window, state, count in JobQueue().status():
+            print(f"{window}  {scraper:<20} {state:<8} {count}")
@@ -0,0 +1,114 @@
+import re
+import json
+import html
+import logging as Logger
+
+from datetime import datetime
+from utils.dates import parse_iso
+
+
+# --------------------- Constants ---------------------
+
+
+# `<script type="application/ld+json">` blocks, matched on the raw bytes so
+# the metadata can be read without building a parse tree
+_JSONLD_RE = re.compile(
+    rb"<script[^>]+type\s*=\s*[\"']?application/ld\+json[\"']?[^>]*>(.*?)</script\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+
+# Schema.org types describing a news article
+ARTICLE_TYPES = {
+    "NewsArticle",
+    "Article",
+    "ReportageNewsArticle",
+    "AnalysisNewsArticle",
+    "BlogPosting",
+    "LiveBlogPosting",
+}
+
+
+# --------------------- Common Functions ---------------------
+
+
+def _types(node: dict) -> set:
+    types = node.get("@type", ())
+    return {types} if isinstance(types, str) else set(types)
+
+
+def _iter_nodes(data):
+    """
+    Walk every JSON-LD object of [data], including `@graph` members
+    """
+    if isinstance(data, list):
+        for item in data:
+            yield from _iter_nodes(item)
+    elif isinstance(data, dict):
+        yield data
+        yield from _iter_nodes(data.get("@graph", ()))
+
+
+def _text(value) -> str:
+    if isinstance(value, list):
+        value = value[0] if value else ""
+    if isinstance(value, dict):
+        value = value.get("name", "")
+    return html.unescape(str(value)).strip() if value else ""
+
+
+def _names(value) -> list:
+    values = value if isinstance(value, list) else [value]
+    return [name for name in (_text(item) for item in values) if name]
+
+
+def _keywords(value) -> list:
+    if isinstance(value, str):
+        value = value.split(",")
+    return _names(value or [])
+
+
+def find_article_metadata(data: bytes) -> dict | None:
+    """
+    Read the NewsArticle JSON-LD metadata embedded in the raw page [data].
+
+    Returns a dict with `headline`, `description`, `date_published`,
+    `date_modified`, `authors`, `keywords` and `live` (a live blog),
+    **None** if the page has no article metadata.
+    """
+    for match in _JSONLD_RE.finditer(data):
+        try:
+            blob = json.loads(match.group(1).decode("utf-8", "replace"), strict=False)
+        except ValueError as e:
+            Logger.warning(f"WARN: Skipping invalid JSON-LD block: {e}")
+            continue
+
+        for node in _iter_nodes(blob):
+            if not _types(node) & ARTICLE_TYPES:
+                continue
+
+            return {
+                "headline": _text(node.get("headline")),
+                "description": _text(node.get("description")),
+                "date_published": _text(node.get("datePublished")),
+                "date_modified": _text(node.get("dateModified")),
+                "authors": _names(node.get("author", [])),
+                "keywords": _keywords(node.get("keywords")),
+                "live": "LiveBlogPosting" in _types(node),
+            }
+
+    return None
+
+
+def article_time(metadata: dict | None, *fields: str) -> datetime | None:
+    """
+    IST datetime of the first of [fields] set in [metadata], **None** when
+    none of them can be parsed
+    """
+    for field in fields:
+        if metadata and metadata.get(field):
+            news_time = parse_iso(metadata[field].replace("Z", "+00:00"))
+
+            if news_time is not None:
+                return news_time
+
+    return None
@@ -0,0 +1,248 @@
+import os
+import re
+import json
+import math
+import time
+import hashlib
+import threading
+import logging as Logger
+
+from histral_core.summery import extractive_summary
+
+from utils.codec import encode_body
+from utils.dates import WINDOW_START
+from utils.logs import trace
+from utils.storage import connect
+from utils.summary import (
+    BATCH_SUMMARY,
+    SUMMARY_BATCH_SIZE,
+    mark_chunked,
+    split_sentences,
+    summarize,
+    summarize_batch,
+)
+from utils.urls import article_id
+
+
+# --------------------- Constants ---------------------
+
+
+# Live blogs and long bodies are summarized in chunks of about this many
+# characters, so every `extractive_summary` call has a bounded input
+SUMMARY_CHUNK = int(os.getenv("HISTRAL_SUMMARY_CHUNK", "8000"))
+
+# Bodies longer than this are summarized in chunks even outside live blogs
+LONG_BODY = int(os.getenv("HISTRAL_LONG_BODY", "20000"))
+
+# CPU seconds spent summarizing the chunks of one article, chunks left past
+# the budget keep their lead sentences instead
+SUMMARY_CPU_BUDGET = float(os.getenv("HISTRAL_SUMMARY_CPU_BUDGET", "2"))
+
+LIVE_DB = "live.sqlite3"
+
+# Addresses of live blogs without `LiveBlogPosting` metadata
+_LIVE_URL_RE = re.compile(r"live-updates|live-blog|liveblog|/live/", re.IGNORECASE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (
+    article_id TEXT NOT NULL,
+    chunk INTEGER NOT NULL,
+    entries TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (article_id, chunk)
+)
+"""
+
+# Fetches run on worker threads, every thread gets its own connection
+_LOCAL = threading.local()
+
+
+# --------------------- Live Blog State ---------------------
+
+
+def _conn():
+    if not hasattr(_LOCAL, "conn"):
+        _LOCAL.conn = connect(LIVE_DB)
+        _LOCAL.conn.execute(_SCHEMA)
+
+        # Entries of past windows are no longer part of the summaries
+        _LOCAL.conn.execute("DELETE FROM chunks WHERE created_at < ?", (WINDOW_START,))
+        _LOCAL.conn.commit()
+
+    return _LOCAL.conn
+
+
+def is_live_blog(URL: str, metadata: dict | None) -> bool:
+    """
+    Whether the article at [URL] is a live blog, from its JSON-LD type or
+    its address
+    """
+    return bool((metadata or {}).get("live")) or bool(_LIVE_URL_RE.search(URL))
+
+
+def entry_key(entry: str) -> str:
+    return hashlib.sha1(" ".join(entry.split()).encode("utf-8")).hexdigest()[:16]
+
+
+def load_chunks(URL: str) -> list:
+    """
+    (entry keys, summary) of the chunks of the live blog [URL] summarized
+    by earlier runs of the window, oldest first
+    """
+    cursor = _conn().execute(
+        "SELECT entries, summary FROM chunks WHERE article_id = ? ORDER BY chunk",
+        (article_id(URL),),
+    )
+    return [(set(json.loads(entries)), summary) for entries, summary in cursor]
+
+
+def save_chunks(URL: str, first: int, chunks: list, summaries: list) -> None:
+    conn = _conn()
+    conn.executemany(
+        "INSERT OR REPLACE INTO chunks VALUES (?, ?, ?, ?, ?)",
+        [
+            (
+                article_id(URL),
+                first + index,
+                json.dumps([entry_key(entry) for entry in chunk]),
+                summary,
+                time.time(),
+            )
+            for index, (chunk, summary) in enumerate(zip(chunks, summaries))
+        ],
+    )
+    conn.commit()
+
+
+# --------------------- Chunked Summaries ---------------------
+
+
+def split_chunks(entries: list, size: int = SUMMARY_CHUNK) -> list:
+    """
+    Consecutive [entries] grouped into chunks of about [size] characters,
+    a longer entry makes a chunk of its own
+    """
+    chunks, chunk, length = [], [], 0
+
+    for entry in entries:
+        if chunk and length + len(entry) > size:
+            chunks.append(chunk)
+            chunk, length = [], 0
+
+        chunk.append(entry)
+        length += len(entry)
+
+    if chunk:
+        chunks.append(chunk)
+
+    return chunks
+
+
+def lead(text: str, percentage: float) -> str:
+    """
+    First sentences of [text], as many as a summary of [percentage] keeps
+    """
+    sentences = split_sentences(text)
+    return " ".join(sentences[: max(1, math.ceil(len(sentences) * percentage))])
+
+
+def summarize_chunks(texts: list, percentage: float) -> list:
+    """
+    Summaries of the chunk [texts] within `SUMMARY_CPU_BUDGET` CPU seconds
+    of the calling thread, the chunks past the budget keep their lead. In
+    batch mode the budget is checked between batches of
+    `SUMMARY_BATCH_SIZE` chunks.
+    """
+    start = time.thread_time()
+    summaries = []
+    size = SUMMARY_BATCH_SIZE if BATCH_SUMMARY else 1
+
+    for first in range(0, len(texts), size):
+        group = texts[first : first + size]
+
+        if time.thread_time() - start >= SUMMARY_CPU_BUDGET:
+            summaries.extend(lead(text, percentage) for text in group)
+        elif BATCH_SUMMARY:
+            summaries.extend(summarize_batch(group, [percentage] * len(group)))
+        else:
+            summaries.append(extractive_summary(group[0], percentage=percentage))
+
+    if len(summaries) > 1:
+        trace(
+            "chunked",
+            "Summarized %d chunks in %.2fs CPU",
+            len(texts),
+            time.thread_time() - start,
+        )
+
+    return summaries
+
+
+def summarize_entries(URL: str, entries: list, percentage: float, live: bool):
+    """
+    Chunked summary of the body [entries] of [URL]. For a live blog only
+    the entries added since the earlier runs of the window are summarized,
+    the summaries of the others are reused.
+    """
+    entries = [entry for entry in entries if entry.strip()]
+    earlier = load_chunks(URL) if live else []
+
+    # Position of every entry on the page, the summaries of the chunks
+    # follow the order of their entries whichever run summarized them
+    positions = {entry_key(entry): index for index, entry in enumerate(entries)}
+
+    if earlier:
+        known = set().union(*(keys for keys, _ in earlier))
+        entries = [entry for entry in entries if entry_key(entry) not in known]
+
+    chunks = split_chunks(entries)
+    summaries = summarize_chunks([" ".join(chunk) for chunk in chunks], percentage)
+
+    if live and chunks:
+        save_chunks(URL, len(earlier), chunks, summaries)
+
+    if live:
+        trace("live", "Summarized %d new entries of live blog %s", len(entries), URL)
+
+    if not earlier:
+        return " ".join(summaries)
+
+    # Chunks whose entries left the page keep their place at the end
+    ordered = [
+        (
+            min((positions[key] for key in keys if key in positions), default=math.inf),
+            summary,
+        )
+        for keys, summary in earlier
+    ]
+    ordered += [
+        (positions[entry_key(chunk[0])], summary)
+        for chunk, summary in zip(chunks, summaries)
+    ]
+
+    return " ".join(summary for _, summary in sorted(ordered, key=lambda item: item[0]))
+
+
+def summarize_body(
+    URL: str, entries: list, percentage: float, metadata=None, separator: str = " "
+):
+    """
+    Encoded summary of the body [entries] of the article [URL], keeping
+    [percentage] of it. Live blogs and long bodies are summarized right
+    away in chunks, even in batch mode, other bodies go to `summarize`.
+    """
+    live = is_live_blog(URL, metadata)
+    text = separator.join(entries)
+
+    if not live and len(text) <= LONG_BODY:
+        return summarize(text, percentage, encode=True)
+
+    try:
+        summary = summarize_entries(URL, entries, percentage, live)
+    except Exception as e:
+        Logger.warning(f"WARN: Unable to summarize {URL} in chunks: {e}")
+        summary = lead(text, percentage)
+
+    mark_chunked(URL)
+    return encode_body(summary)
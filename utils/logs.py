@@ -0,0 +1,190 @@
+import os
+import sys
+import json
+import time
+import queue
+import atexit
+import threading
+import logging as Logger
+
+from collections import Counter
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+
+
+# --------------------- Constants ---------------------
+
+
+# `text` keeps the classic `[LEVEL] (time) -> message` lines, `json` writes
+# one JSON object per record with the run context as fields
+LOG_FORMAT = os.getenv("HISTRAL_LOG_FORMAT", "text")
+
+# Only the first and then every Nth occurrence of a per article trace event
+# is written, every occurrence is still counted in the run summary
+TRACE_SAMPLE = max(int(os.getenv("HISTRAL_TRACE_SAMPLE", "1")), 1)
+
+TEXT_FORMAT = "[%(levelname)s] (%(asctime)s) -> %(message)s"
+
+# Message prefixes used across the scrapers, kept apart as `tag` in JSON
+TAGS = ("TRACE", "INFO", "WARN", "ERROR", "FATAL")
+
+_LOCK = threading.Lock()
+_EVENTS = Counter()
+_LEVELS = Counter()
+
+# Fields attached to every record, replaced (never mutated) on update so
+# records can hold a reference to it
+_CONTEXT = {}
+
+_LISTENER = None
+
+
+# --------------------- Formatters ---------------------
+
+
+class JsonFormatter(Logger.Formatter):
+    """
+    One JSON object per record with its level, tag, message, run context
+    and the `event` / `summary` fields of trace and summary records
+    """
+
+    def format(self, record) -> str:
+        message = record.getMessage()
+        tag, _, rest = message.partition(": ")
+
+        data = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "tag": tag if tag in TAGS else None,
+            "msg": rest if tag in TAGS else message,
+            **getattr(record, "context", {}),
+        }
+
+        for field in ("event", "summary"):
+            if hasattr(record, field):
+                data[field] = getattr(record, field)
+
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class ContextFilter(Logger.Filter):
+    """
+    Stamps the run context on every record and counts records per level
+    """
+
+    def filter(self, record) -> bool:
+        record.context = _CONTEXT
+
+        with _LOCK:
+            _LEVELS[record.levelname] += 1
+
+        return True
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Queues records as they are, so message formatting happens on the
+    listener thread instead of in the scraping loops
+    """
+
+    def prepare(self, record):
+        return record
+
+
+# --------------------- Common Functions ---------------------
+
+
+def setup_logging() -> None:
+    """
+    Route every log record through a queue to a single writer thread, the
+    records are flushed when the process exits
+    """
+    global _LISTENER
+
+    if _LISTENER is not None:
+        return
+
+    handler = Logger.StreamHandler(sys.stderr)
+    handler.setFormatter(
+        JsonFormatter() if LOG_FORMAT == "json" else Logger.Formatter(TEXT_FORMAT)
+    )
+
+    records = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(records)
+    queue_handler.addFilter(ContextFilter())
+
+    root = Logger.getLogger()
+    root.handlers[:] = [queue_handler]
+    root.setLevel(Logger.INFO)
+
+    _LISTENER = QueueListener(records, handler)
+    _LISTENER.start()
+
+    atexit.register(_LISTENER.stop)
+
+
+def log_context(**fields) -> None:
+    """
+    Attach [fields] to every following record, `None` removes a field
+    """
+    global _CONTEXT
+
+    context = {**_CONTEXT, **fields}
+    _CONTEXT = {key: value for key, value in context.items() if value is not None}
+
+
+def trace(event: str, message: str, *args) -> None:
+    """
+    Count a per article [event] and log `TRACE: [message] % [args]` for
+    sampled occurrences only, formatted lazily on the writer thread
+    """
+    with _LOCK:
+        _EVENTS[event] += 1
+        count = _EVENTS[event]
+
+    if (count - 1) % TRACE_SAMPLE == 0:
+        Logger.info(f"TRACE: {message}", *args, extra={"event": event})
+
+
+def count(event: str, amount: int = 1) -> None:
+    """
+    Add [amount] to the run summary counter of [event] without logging
+    """
+    with _LOCK:
+        _EVENTS[event] += amount
+
+
+def start_run_log(label: str) -> None:
+    """
+    Tag the records of the run of [label] with its outlet and category and
+    log one summary record of its events and problems when the run exits
+    """
+    outlet, _, category = label.partition("/")
+    log_context(run=label, outlet=outlet, category=category or None)
+
+    atexit.register(log_run_summary, label, time.perf_counter())
+
+
+def log_run_summary(label: str, started_at: float) -> None:
+    """
+    Log the duration, trace event counts and warnings / errors of [label]
+    """
+    summary = {
+        "duration": round(time.perf_counter() - started_at, 3),
+        "events": dict(_EVENTS),
+        "warnings": _LEVELS["WARNING"],
+        "errors": _LEVELS["ERROR"] + _LEVELS["CRITICAL"],
+    }
+    events = ", ".join(f"{event}={count}" for event, count in _EVENTS.items())
+
+    Logger.info(
+        f"INFO: [{label}] Run summary: {summary['duration']:.1f}s, "
+        f"{events or 'no events'}, {summary['warnings']} warnings, "
+        f"{summary['errors']} errors",
+        extra={"summary": summary},
+    )
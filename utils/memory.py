@@ -0,0 +1,133 @@
+import os
+import atexit
+import resource
+import threading
+import tracemalloc
+import logging as Logger
+
+from bs4 import BeautifulSoup
+from contextlib import contextmanager, nullcontext
+
+from utils.http import fetch_bytes
+
+
+# --------------------- Constants ---------------------
+
+
+# Set `HISTRAL_MEMORY_BOUNDED=1` to release parse trees right after
+# extraction and to report peak memory at the end of the run
+MEMORY_BOUNDED = os.getenv("HISTRAL_MEMORY_BOUNDED", "0") == "1"
+
+# Maximum number of parsed documents alive at the same time in
+# memory-bounded mode
+MAX_IN_FLIGHT_DOCS = int(os.getenv("HISTRAL_MAX_IN_FLIGHT_DOCS", "4"))
+
+# Number of allocation sites listed in the memory report
+TOP_ALLOCATIONS = int(os.getenv("HISTRAL_TOP_ALLOCATIONS", "10"))
+
+# Only parsing holds a slot, fetches are never bounded by it
+if MEMORY_BOUNDED:
+    _DOC_SLOTS = threading.BoundedSemaphore(MAX_IN_FLIGHT_DOCS)
+else:
+    _DOC_SLOTS = nullcontext()
+
+
+# --------------------- Common Functions ---------------------
+
+
+def release_soup(soup) -> None:
+    """
+    Destroy the parse tree of [soup] so its nodes can be freed at once,
+    only when running in memory-bounded mode
+    """
+    if soup is None or not MEMORY_BOUNDED:
+        return
+
+    try:
+        soup.decompose()
+    except Exception as e:
+        Logger.warning(f"WARN: Unable to release parse tree: {e}")
+
+
+@contextmanager
+def open_soup(URL: str):
+    """
+    Fetch the soup of [URL] and keep it alive only inside the `with` block.
+
+    The page is fetched first, then parsed like `open_html`: in
+    memory-bounded mode at most `MAX_IN_FLIGHT_DOCS` documents are held at
+    once, and the parse tree is released as soon as the block exits.
+    """
+    data = fetch_bytes(URL, kind="listing")
+
+    with open_html(data) as soup:
+        yield soup
+
+
+@contextmanager
+def open_html(data: bytes):
+    """
+    Parse already fetched page [data] and keep the soup alive only inside
+    the `with` block, taking one of the `MAX_IN_FLIGHT_DOCS` slots in
+    memory-bounded mode
+    """
+    with _DOC_SLOTS:
+        soup = BeautifulSoup(data, "html.parser") if data else None
+        try:
+            yield soup
+        finally:
+            release_soup(soup)
+
+
+def start_memory_report(label: str) -> None:
+    """
+    Start tracing allocations for [label] and log peak RSS along with the
+    largest allocation sites when the run exits
+    """
+    if not MEMORY_BOUNDED:
+        return
+
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+    atexit.register(log_memory_report, label)
+
+
+def peak_rss_mb() -> float:
+    """
+    Peak resident set size of the current process in MB
+    """
+    # `ru_maxrss` is reported in KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def log_memory_report(label: str) -> None:
+    """
+    Log peak RSS and the top allocation sites traced for [label]
+    """
+    Logger.info(f"INFO: [{label}] Peak RSS: {peak_rss_mb():.1f} MB")
+
+    if not tracemalloc.is_tracing():
+        return
+
+    current, peak = tracemalloc.get_traced_memory()
+    Logger.info(
+        f"INFO: [{label}] Traced memory: current {current / 2**20:.1f} MB, "
+        f"peak {peak / 2**20:.1f} MB"
+    )
+
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ]
+    )
+
+    for index, stat in enumerate(snapshot.statistics("lineno")[:TOP_ALLOCATIONS]):
+        frame = stat.traceback[0]
+        Logger.info(
+            f"INFO: [{label}] #{index + 1} {frame.filename}:{frame.lineno} "
+            f"-> {stat.size / 1024:.1f} KB in {stat.count} blocks"
+        )
+
+    tracemalloc.stop()
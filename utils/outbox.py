@@ -0,0 +1,287 @@
+import os
+import sys
+import time
+import logging as Logger
+
+from datetime import date
+from histral_core.firebase import Category, OutletCode
+
+from utils.logs import setup_logging
+from utils.sinks import Sink, get_sink
+from utils.storage import connect
+from utils.records import ArticleBatch, ArticleRecord, dump_record, load_record
+from utils.search import index_run
+from utils.urls import article_id
+
+
+# --------------------- Constants ---------------------
+
+
+OUTBOX_DB = "outbox.sqlite3"
+
+# Set by the job runner, which flushes a run once all of its units are done
+DEFER_FLUSH = os.getenv("HISTRAL_DEFER_FLUSH", "0") == "1"
+
+# `replace` writes every run with pending articles, `changed` only writes
+# runs with new or changed articles since the last write to the same sink
+WRITE_MODE = os.getenv("HISTRAL_WRITE_MODE", "replace")
+
+PENDING = "pending"
+COMMITTED = "committed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    run_key TEXT NOT NULL,
+    article_id TEXT NOT NULL,
+    src TEXT NOT NULL,
+    run_date TEXT NOT NULL,
+    category TEXT NOT NULL,
+    outlet_code TEXT NOT NULL,
+    record BLOB NOT NULL,
+    state TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (run_key, article_id)
+);
+CREATE TABLE IF NOT EXISTS written (
+    sink TEXT NOT NULL,
+    run_key TEXT NOT NULL,
+    article_id TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    written_at REAL NOT NULL,
+    PRIMARY KEY (sink, run_key, article_id)
+);
+"""
+
+
+# --------------------- Outbox ---------------------
+
+
+def _migrate(conn) -> None:
+    """
+    Rekey an outbox journaled before articles were keyed by `article_id`,
+    so variants of the same link are kept once
+    """
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(outbox)")]
+
+    if "article_id" in columns:
+        return
+
+    conn.create_function("article_id", 1, article_id)
+    conn.executescript(
+        "BEGIN;"
+        "ALTER TABLE outbox RENAME TO outbox_src;"
+        f"{_SCHEMA}"
+        "INSERT OR REPLACE INTO outbox SELECT run_key, article_id(src), src, "
+        "run_date, category, outlet_code, record, state, created_at "
+        "FROM outbox_src ORDER BY created_at;"
+        "DROP TABLE outbox_src;"
+        "COMMIT;"
+    )
+
+
+class Outbox:
+    """
+    Durable local journal of the articles scraped for one
+    (date, category, outlet) run.
+
+    Articles are appended as soon as they are finished, and [flush] writes
+    them to the configured sink (firestore by default) and marks them
+    committed. If posting fails the
+    articles stay pending, so a later flush is enough to recover them.
+    """
+
+    def __init__(self, current_date: date, category: Category, outlet_code: OutletCode):
+        self.current_date = current_date
+        self.category = category
+        self.outlet_code = outlet_code
+        self.run_key = f"{current_date.isoformat()}/{category.name}/{outlet_code.name}"
+
+        self.conn = connect(OUTBOX_DB)
+        self.conn.executescript(_SCHEMA)
+        _migrate(self.conn)
+        self.conn.commit()
+
+    def append(self, news) -> ArticleRecord:
+        """
+        Journal a finished [NewsArticle] or [ArticleRecord], replacing any
+        earlier entry of the same article, whichever variant of its link
+        """
+        if not isinstance(news, ArticleRecord):
+            news = ArticleRecord.from_article(news)
+
+        self.conn.execute(
+            "INSERT OR REPLACE INTO outbox VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                self.run_key,
+                news.article_id,
+                news.src,
+                self.current_date.isoformat(),
+                self.category.name,
+                self.outlet_code.name,
+                dump_record(news),
+                PENDING,
+                time.time(),
+            ),
+        )
+        self.conn.commit()
+        return news
+
+    def records(self) -> ArticleBatch:
+        """
+        All the articles journaled for this run, in insertion order
+        """
+        rows = self.conn.execute(
+            "SELECT record FROM outbox WHERE run_key = ? ORDER BY created_at",
+            (self.run_key,),
+        )
+        return ArticleBatch(load_record(row[0])[0] for row in rows)
+
+    def pending_count(self) -> int:
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM outbox WHERE run_key = ? AND state = ?",
+            (self.run_key, PENDING),
+        ).fetchone()[0]
+
+    def changed(self, sink: Sink, batch: ArticleBatch) -> ArticleBatch:
+        """
+        Articles of [batch] which are new or whose content changed since
+        they were last written to [sink]
+        """
+        hashes = dict(
+            self.conn.execute(
+                "SELECT article_id, content_hash FROM written "
+                "WHERE sink = ? AND run_key = ?",
+                (sink.name, self.run_key),
+            )
+        )
+
+        return ArticleBatch(
+            record
+            for record in batch
+            if hashes.get(record.article_id) != record.content_hash()
+        )
+
+    def mark_written(self, sink: Sink, batch: ArticleBatch) -> None:
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO written VALUES (?, ?, ?, ?, ?)",
+            (
+                (
+                    sink.name,
+                    self.run_key,
+                    record.article_id,
+                    record.content_hash(),
+                    time.time(),
+                )
+                for record in batch
+            ),
+        )
+
+    def flush(self, sink: Sink = None) -> int:
+        """
+        Write the articles of this run to [sink] (`HISTRAL_SINK` by default)
+        if any of them is pending and mark them committed, returns the
+        number of articles written.
+
+        Most sinks replace the whole list of a run, so the committed entries
+        are written again along with the pending ones. With the `changed`
+        write mode nothing is written unless an article is new or changed,
+        and sinks supporting upserts only receive those articles.
+        """
+        if DEFER_FLUSH:
+            Logger.info(f"TRACE: Flush of {self.run_key} deferred to the job runner")
+            return 0
+
+        if self.pending_count() == 0:
+            Logger.info(f"TRACE: Nothing pending in the outbox for {self.run_key}")
+            return 0
+
+        batch = self.records()
+        own_sink = sink is None
+        sink = sink or get_sink()
+
+        try:
+            if WRITE_MODE == "changed":
+                changes = self.changed(sink, batch)
+            else:
+                changes = batch
+
+            if len(changes) == 0:
+                Logger.info(f"TRACE: No article of {self.run_key} changed")
+            elif sink.upserts:
+                sink.write(changes, self.current_date, self.category, self.outlet_code)
+            else:
+                sink.write(batch, self.current_date, self.category, self.outlet_code)
+        except Exception as e:
+            Logger.error(
+                f"ERROR: Unable to write {self.run_key}, {len(batch)} articles kept "
+                f"in the outbox. Run `python -m utils.outbox` to retry: {e}"
+            )
+            raise
+        finally:
+            if own_sink:
+                sink.close()
+
+        self.conn.execute(
+            "UPDATE outbox SET state = ? WHERE run_key = ?",
+            (COMMITTED, self.run_key),
+        )
+        self.mark_written(sink, changes)
+        self.conn.commit()
+
+        if len(changes):
+            index_run(batch, self.current_date, self.category, self.outlet_code)
+
+        return len(changes)
+
+    def __len__(self) -> int:
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM outbox WHERE run_key = ?", (self.run_key,)
+        ).fetchone()[0]
+
+
+def pending_runs() -> list:
+    """
+    List the (date, category, outlet) runs which still have pending articles
+    """
+    conn = connect(OUTBOX_DB)
+    conn.executescript(_SCHEMA)
+    _migrate(conn)
+
+    rows = conn.execute(
+        "SELECT DISTINCT run_date, category, outlet_code FROM outbox "
+        "WHERE state = ?",
+        (PENDING,),
+    ).fetchall()
+    conn.close()
+
+    return [
+        (date.fromisoformat(day), Category[category], OutletCode[outlet_code])
+        for day, category, outlet_code in rows
+    ]
+
+
+# --------------------- Main Execution ---------------------
+
+
+if __name__ == "__main__":
+    setup_logging()
+
+    sink = get_sink()
+    failed = 0
+
+    for current_date, category, outlet_code in pending_runs():
+        try:
+            posted = Outbox(current_date, category, outlet_code).flush(sink)
+            Logger.info(
+                f"INFO: Flushed *{posted}* news articles for "
+                f"{current_date} {category.name} {outlet_code.name}"
+            )
+        except Exception as e:
+            Logger.critical(f"FATAL: Unable to flush outbox: {e}")
+            failed += 1
+
+    sink.close()
+
+    # Runs left pending fail the workflow step, they are retried next time
+    if failed:
+        sys.exit(1)
@@ -0,0 +1,202 @@
+import os
+import sys
+import time
+import atexit
+import threading
+import logging as Logger
+
+from collections import Counter
+from datetime import datetime
+
+from utils.storage import state_path
+
+
+# --------------------- Constants ---------------------
+
+
+# Pass `--profile` to an entry point (or set `HISTRAL_PROFILE=1`) to sample
+# the run and write flame graph stacks along with a hot function table
+PROFILE = "--profile" in sys.argv or os.getenv("HISTRAL_PROFILE", "0") == "1"
+
+# Seconds between two samples
+PROFILE_INTERVAL = float(os.getenv("HISTRAL_PROFILE_INTERVAL", "0.005"))
+
+# Number of functions listed in the hot function table
+TOP_FUNCTIONS = int(os.getenv("HISTRAL_TOP_FUNCTIONS", "20"))
+
+# Stage of a sample, from the innermost frame matching one of these
+# function names or module prefixes
+STAGES = (
+    ("firestore", ("post_news_list",), ("google.", "grpc", "firebase_admin")),
+    ("sink", (), ("utils.sinks", "pyarrow")),
+    ("encode", ("encode_text", "encode_body"), ("zstandard",)),
+    ("summarize", ("extractive_summary", "summarize_batch"), ("nltk", "numpy")),
+    ("parse", (), ("bs4", "soupsieve", "html.parser")),
+    ("fetch", ("fetch_soup", "fetch_bytes"), ("requests", "urllib3", "ssl")),
+    ("import", (), ("importlib",)),
+)
+
+# Innermost frames of threads parked waiting for work, like the log
+# listener and idle pool workers, which are not sampled
+IDLE_FRAMES = frozenset(
+    {
+        "threading:wait",
+        "threading:_wait_for_tstate_lock",
+        "concurrent.futures.thread:_worker",
+        "logging.handlers:dequeue",
+    }
+)
+
+
+# --------------------- Sampler ---------------------
+
+
+def _frame_name(frame) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}"
+
+
+def _stage(frames: list) -> str:
+    for frame in reversed(frames):
+        module = frame.f_globals.get("__name__", "")
+
+        for stage, functions, modules in STAGES:
+            if frame.f_code.co_name in functions or module.startswith(modules):
+                return stage
+
+    return "other"
+
+
+class Sampler:
+    """
+    Samples the stacks of every other thread of the process every
+    `PROFILE_INTERVAL` seconds, tagging them with [label] and their stage.
+    Threads parked in `IDLE_FRAMES` are left out.
+    """
+
+    def __init__(self, label: str):
+        self.label = label
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self.started_at = time.perf_counter()
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self.started_at
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+
+        while not self._stop.wait(PROFILE_INTERVAL):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or _frame_name(frame) in IDLE_FRAMES:
+                    continue
+
+                frames = []
+                while frame is not None:
+                    frames.append(frame)
+                    frame = frame.f_back
+                frames.reverse()
+
+                stack = (self.label, _stage(frames), *map(_frame_name, frames))
+                self.stacks[stack] += 1
+                self.samples += 1
+
+    # --------------------- Reports ---------------------
+
+    def collapsed(self) -> list:
+        """
+        Stacks in the collapsed format read by `flamegraph.pl` and speedscope
+        """
+        return [f"{';'.join(stack)} {count}" for stack, count in self.stacks.items()]
+
+    def hot_functions(self, top: int = TOP_FUNCTIONS) -> list:
+        """
+        (function, stage, self samples, total samples) of the [top] functions
+        with the most samples on top of the stack
+        """
+        own, total, stages = Counter(), Counter(), {}
+
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            stages.setdefault(stack[-1], stack[1])
+
+            for name in set(stack[2:]):
+                total[name] += count
+
+        return [
+            (name, stages[name], count, total[name])
+            for name, count in own.most_common(top)
+        ]
+
+    def stage_totals(self) -> Counter:
+        totals = Counter()
+
+        for stack, count in self.stacks.items():
+            totals[stack[1]] += count
+
+        return totals
+
+
+# --------------------- Common Functions ---------------------
+
+
+def start_profile(label: str) -> None:
+    """
+    Sample the run of [label] when profiling is enabled, reports are written
+    to the state directory when the run exits
+    """
+    if not PROFILE:
+        return
+
+    sampler = Sampler(label)
+    sampler.start()
+    atexit.register(write_profile, sampler)
+
+    Logger.info(f"INFO: [{label}] Profiling every {PROFILE_INTERVAL * 1000:.0f}ms")
+
+
+def write_profile(sampler: Sampler) -> None:
+    """
+    Stop [sampler], write its collapsed stacks and hot function table and
+    log a per stage summary
+    """
+    sampler.stop()
+
+    label = sampler.label
+    name = f"{label.replace('/', '-').lower()}-{datetime.now():%Y%m%d-%H%M%S}"
+    collapsed_path = state_path(os.path.join("profiles", f"{name}.collapsed"))
+    table_path = state_path(os.path.join("profiles", f"{name}.txt"))
+    os.makedirs(os.path.dirname(collapsed_path), exist_ok=True)
+
+    with open(collapsed_path, "w") as file:
+        file.write("\n".join(sampler.collapsed()) + "\n")
+
+    samples = max(sampler.samples, 1)
+    lines = [
+        f"{label}: {sampler.samples} samples over {sampler.duration:.1f}s",
+        "",
+        f"{'stage':<12}{'samples':>10}{'share':>8}",
+    ]
+    lines += [
+        f"{stage:<12}{count:>10}{count / samples:>8.1%}"
+        for stage, count in sampler.stage_totals().most_common()
+    ]
+    lines += ["", f"{'self':>8}{'total':>8}  {'stage':<11}function"]
+    lines += [
+        f"{own / samples:>8.1%}{total / samples:>8.1%}  {stage:<11}{function}"
+        for function, stage, own, total in sampler.hot_functions()
+    ]
+
+    with open(table_path, "w") as file:
+        file.write("\n".join(lines) + "\n")
+
+    for stage, count in sampler.stage_totals().most_common():
+        Logger.info(f"INFO: [{label}] {stage}: {count / samples:.1%} of samples")
+
+    Logger.info(f"INFO: [{label}] Profile written to {collapsed_path} and {table_path}")
@@ -0,0 +1,286 @@
+import sys
+import struct
+import hashlib
+
+from datetime import datetime
+
+from utils.urls import article_id
+
+
+# --------------------- Constants ---------------------
+
+
+# Fields of `NewsArticle.to_dict()`, in the order they are serialized
+FIELDS = ("title", "sub_heading", "body", "tags", "author", "timestamp", "src")
+
+MAGIC = b"HNR1"
+
+# Value tags of the binary encoding
+_NONE, _TRUE, _FALSE, _INT, _FLOAT, _STR, _LIST, _DATETIME = b"NTFifsld"
+
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+
+
+# --------------------- Article Records ---------------------
+
+
+class ArticleRecord:
+    """
+    Compact in-flight representation of a scraped article, converted to
+    the `post_news_list` payload only at the sink
+    """
+
+    __slots__ = FIELDS
+
+    def __init__(
+        self,
+        title=None,
+        sub_heading=None,
+        body=None,
+        tags=None,
+        author=None,
+        timestamp=None,
+        src=None,
+    ):
+        self.title = title
+        self.sub_heading = sub_heading
+        self.body = body
+        self.tags = _intern_list(tags)
+        self.author = _intern_list(author)
+        self.timestamp = timestamp
+        self.src = src
+
+    @classmethod
+    def from_article(cls, news) -> "ArticleRecord":
+        """
+        Build a record from a [NewsArticle], keeping its payload as is
+        """
+        data = news.to_dict()
+        return cls(**{field: data.get(field) for field in FIELDS})
+
+    def to_dict(self) -> dict:
+        return {field: getattr(self, field) for field in FIELDS}
+
+    @property
+    def article_id(self) -> str:
+        return article_id(self.src)
+
+    def content_hash(self) -> str:
+        """
+        Digest of everything written for the article, changes whenever
+        the article is updated. The link is left out, so the same article
+        reached through another variant of its link hashes the same.
+        """
+        out = bytearray()
+
+        for field in FIELDS:
+            if field != "src":
+                _pack_value(getattr(self, field), out)
+
+        return hashlib.sha256(out).hexdigest()
+
+    def __repr__(self) -> str:
+        return f"ArticleRecord(src={self.src!r}, timestamp={self.timestamp!r})"
+
+
+class ArticleBatch:
+    """
+    Buffer of [ArticleRecord] for a single run
+    """
+
+    __slots__ = ("records",)
+
+    def __init__(self, records=None):
+        self.records = list(records) if records else []
+
+    def append(self, news) -> None:
+        """
+        Add a [NewsArticle] or an [ArticleRecord] to the batch
+        """
+        if not isinstance(news, ArticleRecord):
+            news = ArticleRecord.from_article(news)
+
+        self.records.append(news)
+
+    def to_payload(self) -> list:
+        """
+        Convert the batch to the list of dicts expected by `post_news_list`
+        """
+        return [record.to_dict() for record in self.records]
+
+    def dumps(self) -> bytes:
+        return dumps(self.records)
+
+    @classmethod
+    def loads(cls, data: bytes) -> "ArticleBatch":
+        return cls(loads(data))
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+
+def _intern_list(values):
+    """
+    Intern short repeated strings such as author names and tags
+    """
+    if not values:
+        return values
+
+    return [sys.intern(v) if isinstance(v, str) else v for v in values]
+
+
+# --------------------- Binary Serialization ---------------------
+
+
+def _pack_value(value, out: bytearray) -> None:
+    if value is None:
+        out.append(_NONE)
+    elif value is True:
+        out.append(_TRUE)
+    elif value is False:
+        out.append(_FALSE)
+    elif isinstance(value, int):
+        out.append(_INT)
+        out += _I64.pack(value)
+    elif isinstance(value, float):
+        out.append(_FLOAT)
+        out += _F64.pack(value)
+    elif isinstance(value, str):
+        data = value.encode("utf-8")
+        out.append(_STR)
+        out += _U32.pack(len(data))
+        out += data
+    elif isinstance(value, (list, tuple)):
+        out.append(_LIST)
+        out += _U32.pack(len(value))
+        for item in value:
+            _pack_value(item, out)
+    elif isinstance(value, datetime):
+        data = value.isoformat().encode("utf-8")
+        out.append(_DATETIME)
+        out += _U32.pack(len(data))
+        out += data
+    else:
+        raise TypeError(f"Unsupported value in article record: {type(value)}")
+
+
+def _unpack_value(data: bytes, offset: int):
+    tag = data[offset]
+    offset += 1
+
+    if tag == _NONE:
+        return None, offset
+    if tag == _TRUE:
+        return True, offset
+    if tag == _FALSE:
+        return False, offset
+    if tag == _INT:
+        return _I64.unpack_from(data, offset)[0], offset + _I64.size
+    if tag == _FLOAT:
+        return _F64.unpack_from(data, offset)[0], offset + _F64.size
+    if tag in (_STR, _DATETIME):
+        (length,) = _U32.unpack_from(data, offset)
+        offset += _U32.size
+        text = data[offset : offset + length].decode("utf-8")
+        if tag == _DATETIME:
+            return datetime.fromisoformat(text), offset + length
+        return text, offset + length
+    if tag == _LIST:
+        (count,) = _U32.unpack_from(data, offset)
+        offset += _U32.size
+        items = []
+        for _ in range(count):
+            item, offset = _unpack_value(data, offset)
+            items.append(item)
+        return items, offset
+
+    raise ValueError(f"Corrupted article record, unknown tag {tag!r}")
+
+
+def dump_record(record: ArticleRecord) -> bytes:
+    """
+    Serialize a single [ArticleRecord] to bytes
+    """
+    out = bytearray()
+    for field in FIELDS:
+        _pack_value(getattr(record, field), out)
+    return bytes(out)
+
+
+def load_record(data: bytes, offset: int = 0):
+    """
+    Deserialize a single [ArticleRecord], returns the record and the offset
+    right after it
+    """
+    values = []
+    for _ in FIELDS:
+        value, offset = _unpack_value(data, offset)
+        values.append(value)
+    return ArticleRecord(*values), offset
+
+
+def dumps(records) -> bytes:
+    """
+    Serialize [records] to a compact binary payload
+    """
+    records = list(records)
+    out = bytearray(MAGIC)
+    out += _U32.pack(len(records))
+
+    for record in records:
+        out += dump_record(record)
+
+    return bytes(out)
+
+
+def loads(data: bytes) -> list:
+    """
+    Deserialize a payload produced by [dumps]
+    """
+    if data[: len(MAGIC)] != MAGIC:
+        raise ValueError("Not an article record payload")
+
+    (count,) = _U32.unpack_from(data, len(MAGIC))
+    offset = len(MAGIC) + _U32.size
+    records = []
+
+    for _ in range(count):
+        record, offset = load_record(data, offset)
+        records.append(record)
+
+    return records
+
+
+# --------------------- Spooling ---------------------
+
+
+def spool(path: str, records) -> None:
+    """
+    Append [records] to the spool file at [path], one length-prefixed
+    frame per record
+    """
+    with open(path, "ab") as fp:
+        for record in records:
+            frame = dump_record(record)
+            fp.write(_U32.pack(len(frame)))
+            fp.write(frame)
+
+
+def read_spool(path: str):
+    """
+    Stream [ArticleRecord] back from the spool file at [path]
+    """
+    with open(path, "rb") as fp:
+        while True:
+            header = fp.read(_U32.size)
+            if len(header) < _U32.size:
+                return
+
+            (length,) = _U32.unpack(header)
+            record, _ = load_record(fp.read(length))
+            yield record
@@ -0,0 +1,190 @@
+import os
+import time
+import heapq
+import logging as Logger
+
+from collections import deque
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from utils.dates import IST
+from utils.discovery import feed_date
+from utils.urls import canonical_url
+
+
+# --------------------- Constants ---------------------
+
+
+# Wall clock budget of a run in seconds, counted from the start of the
+# process. 0 disables the deadline.
+RUN_BUDGET = float(os.getenv("HISTRAL_RUN_BUDGET", "0"))
+
+# Seconds kept at the end of the budget to summarize and post the articles
+FLUSH_RESERVE = float(os.getenv("HISTRAL_FLUSH_RESERVE", "30"))
+
+# Number of articles fetched at the same time
+FETCH_WORKERS = max(int(os.getenv("HISTRAL_FETCH_WORKERS", "1")), 1)
+
+# Number of discovered links ordered together before the first of them is
+# fetched, the listing keeps being walked while they are fetched
+SCHEDULE_WINDOW = max(int(os.getenv("HISTRAL_SCHEDULE_WINDOW", "50")), 1)
+
+# Listing positions an article moves down per hour since it was published
+RECENCY_WEIGHT = 1.0
+
+_STARTED_AT = time.monotonic()
+
+# Whether a scheduled fetch was dropped because the budget ran out
+_CUT_SHORT = False
+
+
+# --------------------- Common Functions ---------------------
+
+
+def remaining() -> float | None:
+    """
+    Seconds left before the articles must be flushed, **None** without a
+    run budget
+    """
+    if RUN_BUDGET <= 0:
+        return None
+
+    return RUN_BUDGET - FLUSH_RESERVE - (time.monotonic() - _STARTED_AT)
+
+
+def expired() -> bool:
+    """
+    Whether the run budget is spent and the articles must be flushed now
+    """
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def cut_short() -> bool:
+    """
+    Whether the run budget left links unfetched, the crawl frontier must
+    then be kept for the next run instead of completed
+    """
+    return _CUT_SHORT or expired()
+
+
+def priority(position: int, link: str) -> float:
+    """
+    Priority of [link] found at [position] of the listing, lower first.
+    Articles with a known publication date (from the feeds) sink one
+    position per `RECENCY_WEIGHT` hours of age.
+    """
+    published = feed_date(link)
+
+    if published is None:
+        return position
+
+    age = (datetime.now(IST) - published).total_seconds() / 3600
+    return position + RECENCY_WEIGHT * max(age, 0)
+
+
+def prioritize(links):
+    """
+    Unique [links] ordered by listing position and recency within a window
+    of `SCHEDULE_WINDOW` discovered links, variants of the same canonical
+    URL count once. [links] is consumed lazily so fetches start while the
+    listing is still being walked.
+    """
+    window, seen = [], set()
+
+    for link in links:
+        key = canonical_url(link)
+
+        if key in seen:
+            continue
+
+        position = len(seen)
+        seen.add(key)
+        heapq.heappush(window, (priority(position, link), position, link))
+
+        if len(window) >= SCHEDULE_WINDOW:
+            yield heapq.heappop(window)[2]
+
+    while window:
+        yield heapq.heappop(window)[2]
+
+
+def _timed(fetch, link: str) -> tuple:
+    start = time.perf_counter()
+    return fetch(link), time.perf_counter() - start
+
+
+def scheduled(links, fetch):
+    """
+    Run [fetch] over [links] in priority order and yield (link, result).
+
+    With a run budget, links are no longer started once the time left is
+    shorter than an average fetch, and fetches still running when the
+    budget is spent are abandoned. The caller always gets control back
+    `FLUSH_RESERVE` seconds before the deadline to post what it has.
+    """
+    global _CUT_SHORT
+
+    ordered = prioritize(links)
+
+    if RUN_BUDGET <= 0 and FETCH_WORKERS == 1:
+        for link in ordered:
+            yield link, fetch(link)
+        return
+
+    executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS)
+    in_flight = {}
+    started, fetched, spent = 0, 0, 0.0
+    exhausted = False
+
+    try:
+        while not exhausted or in_flight:
+            if expired():
+                break
+
+            left = remaining()
+
+            average = spent / fetched if fetched else 0.0
+
+            while not exhausted and len(in_flight) < FETCH_WORKERS:
+                # Not enough time left for another fetch
+                if left is not None and left < average:
+                    break
+
+                link = next(ordered, None)
+
+                if link is None:
+                    exhausted = True
+                    break
+
+                in_flight[executor.submit(_timed, fetch, link)] = link
+                started += 1
+
+            if not in_flight:
+                break
+
+            done, _ = wait(in_flight, timeout=left, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                link = in_flight.pop(future)
+
+                try:
+                    result, duration = future.result()
+                except Exception as e:
+                    Logger.error(f"ERROR: Unable to fetch {link}: {e}")
+                    continue
+
+                fetched += 1
+                spent += duration
+                yield link, result
+    finally:
+        # Running fetches can't be interrupted, their results are ignored
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        # Links not yet discovered are not counted, the listing is left as is
+        if not exhausted or in_flight:
+            _CUT_SHORT = True
+            Logger.warning(
+                f"WARN: Run budget spent, dropped the links left after "
+                f"{started - len(in_flight)} fetches"
+            )
@@ -0,0 +1,290 @@
+import os
+import sys
+import json
+import sqlite3
+import argparse
+import threading
+import logging as Logger
+
+from datetime import date, datetime
+from histral_core.firebase import Category, OutletCode
+
+from utils.codec import decode_body
+from utils.logs import setup_logging
+from utils.records import ArticleBatch, ArticleRecord
+from utils.sinks import EXPORT_DIR
+from utils.urls import article_id
+
+
+# --------------------- Constants ---------------------
+
+
+# Every flushed run is also indexed into a local full text store, set
+# `HISTRAL_SEARCH_INDEX=0` to skip it
+SEARCH_INDEX = os.getenv("HISTRAL_SEARCH_INDEX", "1") == "1"
+
+SEARCH_DB = "search.sqlite3"
+
+# Articles are clustered by (date, category, outlet), the FTS5 index is an
+# external content table over them kept in sync by triggers
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    run_date TEXT NOT NULL,
+    category TEXT NOT NULL,
+    outlet_code TEXT NOT NULL,
+    article_id TEXT NOT NULL,
+    src TEXT NOT NULL,
+    title TEXT,
+    sub_heading TEXT,
+    body TEXT,
+    tags TEXT,
+    author TEXT,
+    timestamp TEXT,
+    content_hash TEXT NOT NULL,
+    UNIQUE (run_date, category, outlet_code, article_id)
+);
+CREATE INDEX IF NOT EXISTS articles_article_id ON articles (article_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5 (
+    title, sub_heading, body, tags,
+    content = 'articles', content_rowid = 'id',
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts (rowid, title, sub_heading, body, tags)
+    VALUES (new.id, new.title, new.sub_heading, new.body, new.tags);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, sub_heading, body, tags)
+    VALUES ('delete', old.id, old.title, old.sub_heading, old.body, old.tags);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, sub_heading, body, tags)
+    VALUES ('delete', old.id, old.title, old.sub_heading, old.body, old.tags);
+    INSERT INTO articles_fts (rowid, title, sub_heading, body, tags)
+    VALUES (new.id, new.title, new.sub_heading, new.body, new.tags);
+END;
+"""
+
+# Unchanged articles are left alone, so the FTS index is only rewritten
+# for new or updated ones
+_UPSERT = """
+INSERT INTO articles (
+    run_date, category, outlet_code, article_id, src, title, sub_heading,
+    body, tags, author, timestamp, content_hash
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (run_date, category, outlet_code, article_id) DO UPDATE SET
+    src = excluded.src,
+    title = excluded.title,
+    sub_heading = excluded.sub_heading,
+    body = excluded.body,
+    tags = excluded.tags,
+    author = excluded.author,
+    timestamp = excluded.timestamp,
+    content_hash = excluded.content_hash
+WHERE content_hash != excluded.content_hash
+"""
+
+_LOCAL = threading.local()
+
+
+# --------------------- Common Functions ---------------------
+
+
+def _conn() -> sqlite3.Connection:
+    if not hasattr(_LOCAL, "conn"):
+        os.makedirs(EXPORT_DIR, exist_ok=True)
+        _LOCAL.conn = sqlite3.connect(os.path.join(EXPORT_DIR, SEARCH_DB), timeout=30)
+        _LOCAL.conn.execute("PRAGMA journal_mode=WAL")
+        _LOCAL.conn.execute("PRAGMA synchronous=NORMAL")
+        _LOCAL.conn.executescript(_SCHEMA)
+
+    return _LOCAL.conn
+
+
+def _body(payload: str | None) -> str:
+    try:
+        return decode_body(payload) if payload else ""
+    except Exception:
+        # Bodies of batch mode articles are plain text until summarized
+        return payload
+
+
+def _row(record: ArticleRecord, run: tuple) -> tuple:
+    timestamp = record.timestamp
+
+    return (
+        *run,
+        record.article_id,
+        record.src,
+        record.title,
+        record.sub_heading,
+        _body(record.body),
+        " ".join(record.tags or []),
+        json.dumps(record.author or [], ensure_ascii=False),
+        timestamp.isoformat() if isinstance(timestamp, datetime) else timestamp,
+        record.content_hash(),
+    )
+
+
+def index_batch(
+    batch: ArticleBatch,
+    current_date: date,
+    category: Category,
+    outlet_code: OutletCode,
+) -> int:
+    """
+    Bulk insert the articles of a run in one transaction, replacing the
+    changed ones, returns the number of rows written
+    """
+    run = (current_date.isoformat(), category.name, outlet_code.name)
+    conn = _conn()
+
+    with conn:
+        cursor = conn.executemany(_UPSERT, (_row(record, run) for record in batch))
+
+    return cursor.rowcount
+
+
+def index_run(batch, current_date, category, outlet_code) -> None:
+    """
+    Index a flushed run if `HISTRAL_SEARCH_INDEX` is on, the run itself
+    never fails because of the local store
+    """
+    if not SEARCH_INDEX:
+        return
+
+    try:
+        written = index_batch(batch, current_date, category, outlet_code)
+        Logger.info(f"TRACE: Indexed {written} of {len(batch)} articles locally")
+    except Exception as e:
+        Logger.warning(f"WARN: Unable to index articles locally: {e}")
+
+
+def search(
+    query: str = None,
+    first: date = None,
+    last: date = None,
+    category: str = None,
+    outlet: str = None,
+    limit: int = 20,
+) -> list:
+    """
+    Articles matching the FTS5 [query] (all of them without one) within
+    the given partitions, best matches first, as dicts with a snippet
+    """
+    filters, params = [], []
+
+    for column, value in (("category", category), ("outlet_code", outlet)):
+        if value:
+            filters.append(f"a.{column} = ?")
+            params.append(value.upper())
+
+    if first:
+        filters.append("a.run_date >= ?")
+        params.append(first.isoformat())
+    if last:
+        filters.append("a.run_date <= ?")
+        params.append(last.isoformat())
+
+    columns = "a.run_date, a.category, a.outlet_code, a.title, a.src, a.timestamp"
+
+    if query:
+        sql = (
+            f"SELECT {columns}, snippet(articles_fts, 2, '[', ']', '...', 12) "
+            "FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid "
+            "WHERE articles_fts MATCH ?"
+        )
+        params.insert(0, query)
+        order = "bm25(articles_fts)"
+    else:
+        sql = f"SELECT {columns}, substr(a.body, 1, 80) FROM articles a WHERE 1"
+        order = "a.run_date DESC, a.timestamp DESC"
+
+    sql += "".join(f" AND {condition}" for condition in filters)
+    sql += f" ORDER BY {order} LIMIT ?"
+
+    fields = ("date", "category", "outlet", "title", "src", "timestamp", "snippet")
+    return [dict(zip(fields, row)) for row in _conn().execute(sql, (*params, limit))]
+
+
+def seen(URL: str) -> list:
+    """
+    (date, category, outlet) of every run the article at [URL] was part of
+    """
+    cursor = _conn().execute(
+        "SELECT run_date, category, outlet_code FROM articles "
+        "WHERE article_id = ? ORDER BY run_date",
+        (article_id(URL),),
+    )
+    return cursor.fetchall()
+
+
+def import_exports(paths: list) -> int:
+    """
+    Index the JSONL exports at [paths], named `<date>/<outlet>-<category>.jsonl`
+    """
+    total = 0
+
+    for path in paths:
+        day = os.path.basename(os.path.dirname(os.path.abspath(path)))
+        outlet, _, category = os.path.basename(path).rsplit(".", 1)[0].partition("-")
+
+        with open(path, encoding="utf-8") as file:
+            batch = ArticleBatch(ArticleRecord(**json.loads(line)) for line in file)
+
+        total += index_batch(
+            batch, date.fromisoformat(day), Category[category], OutletCode[outlet]
+        )
+
+    return total
+
+
+# --------------------- Main Execution ---------------------
+
+
+if __name__ == "__main__":
+    setup_logging()
+
+    parser = argparse.ArgumentParser(description="Local full text article store")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    query_parser = commands.add_parser("query", help="Search the indexed articles")
+    query_parser.add_argument("query", nargs="?", help="FTS5 query, e.g. 'title:rbi'")
+    query_parser.add_argument("--from", dest="first", type=date.fromisoformat)
+    query_parser.add_argument("--to", dest="last", type=date.fromisoformat)
+    query_parser.add_argument("--category", help="e.g. BUSINESS")
+    query_parser.add_argument("--outlet", help="e.g. NDTV")
+    query_parser.add_argument("--limit", type=int, default=20)
+
+    seen_parser = commands.add_parser("seen", help="Runs an article was part of")
+    seen_parser.add_argument("url")
+
+    import_parser = commands.add_parser("import", help="Index JSONL exports")
+    import_parser.add_argument("exports", nargs="+")
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == "query":
+            rows = search(
+                args.query,
+                args.first,
+                args.last,
+                args.category,
+                args.outlet,
+                args.limit,
+            )
+            for row in rows:
+                print(
+                    f"{row['date']}  {row['outlet']:<6} {row['category']:<11} "
+                    f"{row['title']}\n    {row['src']}\n    {row['snippet']}"
+                )
+        elif args.command == "seen":
+            for day, category, outlet in seen(args.url):
+                print(f"{day}  {outlet:<6} {category}")
+        else:
+            Logger.info(f"INFO: Indexed {import_exports(args.exports)} articles")
+    except Exception as e:
+        Logger.critical(f"FATAL: Unable to {args.command} the article store: {e}")
+        sys.exit(1)
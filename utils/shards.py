@@ -0,0 +1,281 @@
+import os
+import sys
+import json
+import time
+import argparse
+import logging as Logger
+
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+from histral_core.firebase import Category, OutletCode
+
+from utils.logs import setup_logging
+
+
+# --------------------- Constants ---------------------
+
+
+# Firestore documents are limited to 1 MiB, chunks stay well below it to
+# leave room for field names and the encoding overhead
+CHUNK_BYTES = int(os.getenv("HISTRAL_CHUNK_BYTES", str(512 * 1024)))
+
+# Chunk documents written at the same time
+CHUNK_WORKERS = max(int(os.getenv("HISTRAL_CHUNK_WORKERS", "8")), 1)
+
+# Root collection of the chunked layout, `<root>/<date>/runs/<OUTLET>-<CATEGORY>`
+# holds the manifest and its `chunks` subcollection the articles
+CHUNK_COLLECTION = os.getenv("HISTRAL_CHUNK_COLLECTION", "news_chunks")
+
+# Firestore commits at most 500 writes at once
+ARTICLE_BATCH = 500
+
+
+# --------------------- Layout ---------------------
+
+
+def service_account() -> dict | None:
+    """
+    Service account of the `FIREBASE_*` variables the workflows export,
+    **None** when they are not set
+    """
+    if not os.getenv("FIREBASE_PRIVATE_KEY"):
+        return None
+
+    return {
+        "type": "service_account",
+        "project_id": os.getenv("FIREBASE_PROJECT_ID"),
+        "private_key_id": os.getenv("FIREBASE_PRIVATE_KEY_ID"),
+        # Secrets keep the line breaks of the key escaped
+        "private_key": os.getenv("FIREBASE_PRIVATE_KEY").replace("\\n", "\n"),
+        "client_email": os.getenv("FIREBASE_CLIENT_EMAIL"),
+        "client_id": os.getenv("FIREBASE_CLIENT_ID"),
+        "auth_uri": "https://accounts.google.com/o/oauth2/auth",
+        "token_uri": "https://oauth2.googleapis.com/token",
+        "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
+        "client_x509_cert_url": os.getenv("FIREBASE_CLIENT_X509_CERT_URL"),
+    }
+
+
+def firestore_client():
+    """
+    Firestore client of the default Firebase app. When `histral_core` did
+    not initialize it already, it is initialized from the `FIREBASE_*`
+    variables, or the application default credentials without them.
+    """
+    try:
+        import firebase_admin
+        from firebase_admin import credentials, firestore
+    except ImportError as e:
+        raise ImportError(
+            "The chunked and article firestore layouts require firebase-admin, "
+            "install it with `pip install firebase-admin`"
+        ) from e
+
+    try:
+        firebase_admin.get_app()
+    except ValueError:
+        account = service_account()
+        firebase_admin.initialize_app(
+            credentials.Certificate(account) if account else None
+        )
+
+    return firestore.client()
+
+
+def payload_size(article: dict) -> int:
+    """
+    Approximate stored size of [article] in bytes
+    """
+    return len(json.dumps(article, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+def split_payload(payload: list, limit: int = CHUNK_BYTES) -> list:
+    """
+    Consecutive articles of [payload] grouped into chunks of at most
+    [limit] bytes, a larger article makes a chunk of its own
+    """
+    chunks, chunk, size = [], [], 0
+
+    for article in payload:
+        article_size = payload_size(article)
+
+        if chunk and size + article_size > limit:
+            chunks.append(chunk)
+            chunk, size = [], 0
+
+        chunk.append(article)
+        size += article_size
+
+    if chunk:
+        chunks.append(chunk)
+
+    return chunks
+
+
+def manifest_ref(db, current_date: date, category: Category, outlet_code: OutletCode):
+    return (
+        db.collection(CHUNK_COLLECTION)
+        .document(current_date.isoformat())
+        .collection("runs")
+        .document(f"{outlet_code.name}-{category.name}")
+    )
+
+
+def articles_ref(db, current_date: date, category: Category, outlet_code: OutletCode):
+    return manifest_ref(db, current_date, category, outlet_code).collection("articles")
+
+
+# --------------------- Writer & Reader ---------------------
+
+
+def write_chunked(db, payload: list, current_date, category, outlet_code) -> int:
+    """
+    Write the daily list [payload] as chunk documents in parallel, then
+    point the manifest at them and delete the chunks of the previous
+    write. Readers always see either the previous or the new list.
+    """
+    manifest = manifest_ref(db, current_date, category, outlet_code)
+    chunks_ref = manifest.collection("chunks")
+
+    previous_ids = (manifest.get().to_dict() or {}).get("chunks", [])
+
+    generation = str(time.time_ns())
+    chunks = split_payload(payload)
+    chunk_ids = [f"{generation}-{index:04d}" for index in range(len(chunks))]
+
+    def write_chunk(chunk_id, articles):
+        chunks_ref.document(chunk_id).set({"articles": articles})
+
+    def delete_chunk(chunk_id):
+        chunks_ref.document(chunk_id).delete()
+
+    with ThreadPoolExecutor(CHUNK_WORKERS) as executor:
+        list(executor.map(write_chunk, chunk_ids, chunks))
+
+    manifest.set(
+        {
+            "generation": generation,
+            "chunks": chunk_ids,
+            "count": len(payload),
+            "bytes": sum(payload_size(article) for article in payload),
+            "updated_at": time.time(),
+        }
+    )
+
+    stale = [chunk_id for chunk_id in previous_ids if chunk_id not in chunk_ids]
+
+    with ThreadPoolExecutor(CHUNK_WORKERS) as executor:
+        list(executor.map(delete_chunk, stale))
+
+    Logger.info(
+        f"TRACE: Wrote {len(payload)} articles in {len(chunks)} chunks for "
+        f"{current_date} {outlet_code.name} {category.name}"
+    )
+    return len(payload)
+
+
+def read_chunked(db, current_date, category, outlet_code) -> list:
+    """
+    Daily list of articles written by `write_chunked`, in its original
+    order, fetched with one manifest read and one batched chunk read
+    """
+    manifest = manifest_ref(db, current_date, category, outlet_code).get()
+
+    if not manifest.exists:
+        return []
+
+    chunk_ids = manifest.to_dict().get("chunks", [])
+    chunks_ref = manifest.reference.collection("chunks")
+
+    # `get_all` returns the documents in any order
+    chunks = {
+        snapshot.id: snapshot.to_dict().get("articles", [])
+        for snapshot in db.get_all(
+            [chunks_ref.document(chunk_id) for chunk_id in chunk_ids]
+        )
+        if snapshot.exists
+    }
+
+    missing = [chunk_id for chunk_id in chunk_ids if chunk_id not in chunks]
+
+    if missing:
+        Logger.warning(f"WARN: {len(missing)} chunks of the list are missing")
+
+    return [article for chunk_id in chunk_ids for article in chunks.get(chunk_id, [])]
+
+
+def write_articles(db, batch, current_date, category, outlet_code) -> int:
+    """
+    Upsert every article of [batch] as its own document of the `articles`
+    subcollection of the run, keyed by its article id. Writes are batched
+    by `ARTICLE_BATCH` and the batches committed in parallel.
+    """
+    articles = articles_ref(db, current_date, category, outlet_code)
+    records = list(batch)
+    groups = [
+        records[index : index + ARTICLE_BATCH]
+        for index in range(0, len(records), ARTICLE_BATCH)
+    ]
+
+    def commit(group):
+        writes = db.batch()
+
+        for record in group:
+            writes.set(articles.document(record.article_id), record.to_dict())
+
+        writes.commit()
+
+    with ThreadPoolExecutor(CHUNK_WORKERS) as executor:
+        list(executor.map(commit, groups))
+
+    Logger.info(
+        f"TRACE: Upserted {len(records)} article documents for "
+        f"{current_date} {outlet_code.name} {category.name}"
+    )
+    return len(records)
+
+
+def read_articles(db, current_date, category, outlet_code) -> list:
+    """
+    Articles written by `write_articles` for a run, newest first
+    """
+    snapshots = articles_ref(db, current_date, category, outlet_code).stream()
+    articles = [snapshot.to_dict() for snapshot in snapshots]
+
+    return sorted(
+        articles, key=lambda article: str(article.get("timestamp")), reverse=True
+    )
+
+
+# --------------------- Main Execution ---------------------
+
+
+if __name__ == "__main__":
+    setup_logging()
+
+    parser = argparse.ArgumentParser(description="Chunked daily lists in Firestore")
+    parser.add_argument("date", type=date.fromisoformat)
+    parser.add_argument("category", help="e.g. BUSINESS")
+    parser.add_argument("outlet", help="e.g. NDTV")
+    parser.add_argument(
+        "--articles",
+        action="store_true",
+        help="Read the article documents of `firestore_articles` instead",
+    )
+
+    args = parser.parse_args()
+    read = read_articles if args.articles else read_chunked
+
+    try:
+        articles = read(
+            firestore_client(),
+            args.date,
+            Category[args.category.upper()],
+            OutletCode[args.outlet.upper()],
+        )
+
+        for article in articles:
+            print(json.dumps(article, ensure_ascii=False, default=str))
+    except Exception as e:
+        Logger.critical(f"FATAL: Unable to read the articles: {e}")
+        sys.exit(1)
@@ -0,0 +1,319 @@
+import os
+import json
+import sqlite3
+import logging as Logger
+
+from datetime import date, datetime
+from histral_core.firebase import post_news_list, Category, OutletCode
+
+from utils.records import FIELDS, ArticleBatch
+from utils.shards import firestore_client, write_articles, write_chunked
+from utils.urls import article_id
+
+
+# --------------------- Constants ---------------------
+
+
+# Destination of the articles of a run: `firestore`, `firestore_chunked`,
+# `firestore_articles`, `null`, `jsonl`, `sqlite` or `parquet`
+SINK = os.getenv("HISTRAL_SINK", "firestore")
+
+# Directory of the local exports written by the file based sinks
+EXPORT_DIR = os.getenv("HISTRAL_EXPORT_DIR", "exports")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    run_date TEXT NOT NULL,
+    category TEXT NOT NULL,
+    outlet_code TEXT NOT NULL,
+    article_id TEXT NOT NULL,
+    src TEXT NOT NULL,
+    title TEXT,
+    sub_heading TEXT,
+    body TEXT,
+    tags TEXT,
+    author TEXT,
+    timestamp TEXT,
+    PRIMARY KEY (run_date, category, outlet_code, article_id)
+)
+"""
+
+
+# --------------------- Common Functions ---------------------
+
+
+def _plain(value):
+    """
+    [value] as a JSON / columnar friendly value, timestamps as ISO strings
+    """
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def export_path(current_date: date, category: Category, outlet_code: OutletCode, ext):
+    """
+    Path of the export file of a run, one directory per day
+    """
+    directory = os.path.join(EXPORT_DIR, current_date.isoformat())
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"{outlet_code.name}-{category.name}.{ext}")
+
+
+# --------------------- Sinks ---------------------
+
+
+class Sink:
+    """
+    Destination of the articles of a run.
+
+    Every [write] receives the whole batch of a run, like `post_news_list`
+    does, so writing the same run again replaces its earlier content.
+    Sinks with [upserts] only receive the new or changed articles of a run
+    in the `changed` write mode.
+    """
+
+    name = None
+    upserts = False
+
+    def write(
+        self,
+        batch: ArticleBatch,
+        current_date: date,
+        category: Category,
+        outlet_code: OutletCode,
+    ) -> int:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class FirestoreSink(Sink):
+    """
+    Daily list of `post_news_list`, a single document rewritten as a whole
+    on every write, even in the `changed` write mode
+    """
+
+    name = "firestore"
+
+    def write(self, batch, current_date, category, outlet_code) -> int:
+        post_news_list(
+            DATA=batch.to_payload(),
+            current_date=current_date,
+            category=category,
+            outlet_code=outlet_code,
+        )
+        return len(batch)
+
+
+class ChunkedFirestoreSink(Sink):
+    """
+    Daily lists split into size bounded chunk documents under a manifest,
+    see `utils.shards`, requires `firebase-admin`
+    """
+
+    name = "firestore_chunked"
+
+    def __init__(self):
+        self.db = firestore_client()
+
+    def write(self, batch, current_date, category, outlet_code) -> int:
+        return write_chunked(
+            self.db, batch.to_payload(), current_date, category, outlet_code
+        )
+
+
+class ArticlesFirestoreSink(Sink):
+    """
+    One document per article keyed by its article id, see `utils.shards`.
+    Only the new or changed articles are written in the `changed` write
+    mode, requires `firebase-admin`
+    """
+
+    name = "firestore_articles"
+    upserts = True
+
+    def __init__(self):
+        self.db = firestore_client()
+
+    def write(self, batch, current_date, category, outlet_code) -> int:
+        return write_articles(self.db, batch, current_date, category, outlet_code)
+
+
+class NullSink(Sink):
+    """
+    Drops every article, to measure the scraping path alone
+    """
+
+    name = "null"
+
+    def __init__(self):
+        self.written = 0
+
+    def write(self, batch, current_date, category, outlet_code) -> int:
+        self.written += len(batch)
+        return len(batch)
+
+
+class JsonlSink(Sink):
+    """
+    One JSON line per article in `<EXPORT_DIR>/<date>/<outlet>-<category>.jsonl`
+    """
+
+    name = "jsonl"
+
+    def write(self, batch, current_date, category, outlet_code) -> int:
+        path = export_path(current_date, category, outlet_code, "jsonl")
+
+        # Streamed to a temporary file so readers never see a partial run
+        with open(f"{path}.tmp", "w", encoding="utf-8") as file:
+            for record in batch:
+                data = {field: _plain(getattr(record, field)) for field in FIELDS}
+                file.write(json.dumps(data, ensure_ascii=False) + "\n")
+
+        os.replace(f"{path}.tmp", path)
+        return len(batch)
+
+
+class SqliteSink(Sink):
+    """
+    Articles of every run in the `articles` table of
+    `<EXPORT_DIR>/articles.sqlite3`
+    """
+
+    name = "sqlite"
+    upserts = True
+
+    def __init__(self):
+        os.makedirs(EXPORT_DIR, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(EXPORT_DIR, "articles.sqlite3"))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(_SCHEMA)
+        self._migrate()
+
+    def _migrate(self) -> None:
+        """
+        Rekey an export written before articles were keyed by `article_id`
+        """
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(articles)")]
+
+        if "article_id" in columns:
+            return
+
+        self.conn.create_function("article_id", 1, article_id)
+        self.conn.executescript(
+            "BEGIN;"
+            "ALTER TABLE articles RENAME TO articles_src;"
+            f"{_SCHEMA};"
+            "INSERT OR REPLACE INTO articles SELECT run_date, category, "
+            "outlet_code, article_id(src), src, title, sub_heading, body, tags, "
+            "author, timestamp FROM articles_src;"
+            "DROP TABLE articles_src;"
+            "COMMIT;"
+        )
+
+    def write(self, batch, current_date, category, outlet_code) -> int:
+        run = (current_date.isoformat(), category.name, outlet_code.name)
+
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO articles "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        *run,
+                        record.article_id,
+                        record.src,
+                        record.title,
+                        record.sub_heading,
+                        record.body,
+                        json.dumps(record.tags or [], ensure_ascii=False),
+                        json.dumps(record.author or [], ensure_ascii=False),
+                        _plain(record.timestamp),
+                    )
+                    for record in batch
+                ),
+            )
+
+        return len(batch)
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class ParquetSink(Sink):
+    """
+    Columnar export of a run to `<EXPORT_DIR>/<date>/<outlet>-<category>.parquet`,
+    requires `pyarrow`
+    """
+
+    name = "parquet"
+
+    def __init__(self):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ImportError(
+                "The parquet sink requires pyarrow, install it with "
+                "`pip install pyarrow`"
+            ) from e
+
+        self.pa = pyarrow
+        self.pq = pyarrow.parquet
+
+    def write(self, batch, current_date, category, outlet_code) -> int:
+        string_list = self.pa.list_(self.pa.string())
+        schema = self.pa.schema(
+            [
+                ("title", self.pa.string()),
+                ("sub_heading", self.pa.string()),
+                ("body", self.pa.string()),
+                ("tags", string_list),
+                ("author", string_list),
+                ("timestamp", self.pa.string()),
+                ("src", self.pa.string()),
+            ]
+        )
+        columns = {
+            field: [_plain(getattr(record, field)) for record in batch]
+            for field in FIELDS
+        }
+
+        path = export_path(current_date, category, outlet_code, "parquet")
+        self.pq.write_table(
+            self.pa.Table.from_pydict(columns, schema=schema),
+            f"{path}.tmp",
+            compression="zstd",
+        )
+        os.replace(f"{path}.tmp", path)
+
+        return len(batch)
+
+
+SINKS = {
+    sink.name: sink
+    for sink in (
+        FirestoreSink,
+        ChunkedFirestoreSink,
+        ArticlesFirestoreSink,
+        NullSink,
+        JsonlSink,
+        SqliteSink,
+        ParquetSink,
+    )
+}
+
+
+def get_sink(name: str = None) -> Sink:
+    """
+    Sink configured by `HISTRAL_SINK`, or the sink called [name]
+    """
+    name = name or SINK
+
+    if name not in SINKS:
+        raise ValueError(f"Unknown sink '{name}', expected one of {', '.join(SINKS)}")
+
+    Logger.info(f"TRACE: Writing articles to the {name} sink")
+    return SINKS[name]()
@@ -0,0 +1,31 @@
+import os
+import sqlite3
+
+
+# --------------------- Constants ---------------------
+
+
+# Directory holding the local state of the scrapers (outbox, checkpoints...)
+STATE_DIR = os.getenv("HISTRAL_STATE_DIR", ".histral")
+
+
+# --------------------- Common Functions ---------------------
+
+
+def state_path(name: str) -> str:
+    """
+    Path of the file [name] inside the state directory
+    """
+    os.makedirs(STATE_DIR, exist_ok=True)
+    return os.path.join(STATE_DIR, name)
+
+
+def connect(name: str) -> sqlite3.Connection:
+    """
+    Open the SQLite database [name] from the state directory, tuned for
+    durable appends from one writer and concurrent readers
+    """
+    conn = sqlite3.connect(state_path(name), timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
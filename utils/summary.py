@@ -0,0 +1,197 @@
+import os
+import re
+import math
+import numpy as np
+import logging as Logger
+
+from histral_core.summery import extractive_summary
+
+from utils.codec import encode_body
+
+
+# --------------------- Constants ---------------------
+
+
+# Set `HISTRAL_BATCH_SUMMARY=1` to summarize the articles of a run together
+# instead of one `extractive_summary` call per text
+BATCH_SUMMARY = os.getenv("HISTRAL_BATCH_SUMMARY", "0") == "1"
+
+# Number of articles summarized together
+SUMMARY_BATCH_SIZE = int(os.getenv("HISTRAL_SUMMARY_BATCH_SIZE", "64"))
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+STOP_WORDS = frozenset(
+    "a an and are as at be been but by for from had has have he her his i if in "
+    "into is it its of on or our she so than that the their them there these "
+    "they this to was we were which while who will with would you".split()
+)
+
+# Links of the articles whose bodies were summarized in chunks when they
+# were fetched, see `utils.liveblog`
+_CHUNKED = set()
+
+
+# --------------------- Batch Engine ---------------------
+
+
+def split_sentences(text: str) -> list:
+    return [sentence for sentence in _SENTENCE_RE.split(text.strip()) if sentence]
+
+
+def summarize_batch(texts: list, percentages: list) -> list:
+    """
+    Extractive summaries of [texts], keeping the given fraction of the
+    sentences of each text (see [percentages]) in their original order.
+
+    All texts are tokenized once into a shared term matrix, sentences are
+    scored by the mean TF-IDF weight of their terms within their text.
+    """
+    sentences = [split_sentences(text or "") for text in texts]
+
+    vocabulary = {}
+    sentence_doc, token_sentence, token_term = [], [], []
+
+    for doc, doc_sentences in enumerate(sentences):
+        for sentence in doc_sentences:
+            index = len(sentence_doc)
+            sentence_doc.append(doc)
+
+            for token in _TOKEN_RE.findall(sentence.lower()):
+                if token in STOP_WORDS:
+                    continue
+
+                token_sentence.append(index)
+                token_term.append(vocabulary.setdefault(token, len(vocabulary)))
+
+    if not sentence_doc:
+        return [text or "" for text in texts]
+
+    docs = len(texts)
+    terms = max(len(vocabulary), 1)
+    sentence_doc = np.asarray(sentence_doc, dtype=np.int64)
+    token_sentence = np.asarray(token_sentence, dtype=np.int64)
+    token_term = np.asarray(token_term, dtype=np.int64)
+    token_doc = sentence_doc[token_sentence]
+
+    # Sparse (doc, term) counts, as flat keys into the doc x term matrix
+    keys, key_index, counts = np.unique(
+        token_doc * terms + token_term,
+        return_inverse=True,
+        return_counts=True,
+    )
+    doc_frequency = np.bincount(keys % terms, minlength=terms)
+    idf = np.log((1 + docs) / (1 + doc_frequency)) + 1
+
+    doc_length = np.bincount(token_doc, minlength=docs).astype(np.float64)
+    weights = counts / doc_length[keys // terms] * idf[keys % terms]
+
+    sentence_count = len(sentence_doc)
+    scores = np.bincount(
+        token_sentence, weights=weights[key_index], minlength=sentence_count
+    )
+    scores /= np.maximum(np.bincount(token_sentence, minlength=sentence_count), 1)
+
+    # Rank the sentences of each text by score, keep the top share of each
+    order = np.lexsort((np.arange(sentence_count), -scores, sentence_doc))
+    first = np.searchsorted(sentence_doc[order], np.arange(docs))
+    rank = np.arange(sentence_count) - first[sentence_doc[order]]
+
+    per_doc = np.bincount(sentence_doc, minlength=docs)
+    keep_count = np.array(
+        [
+            max(1, math.ceil(count * percentage)) if count else 0
+            for count, percentage in zip(per_doc, percentages)
+        ]
+    )
+    keep = np.zeros(sentence_count, dtype=bool)
+    keep[order[rank < keep_count[sentence_doc[order]]]] = True
+
+    flat = [sentence for doc_sentences in sentences for sentence in doc_sentences]
+    summaries = [[] for _ in texts]
+
+    for index in np.flatnonzero(keep):
+        summaries[sentence_doc[index]].append(flat[index])
+
+    return [" ".join(summary) for summary in summaries]
+
+
+# --------------------- Common Functions ---------------------
+
+
+def summarize(text: str, percentage: float, encode: bool = False) -> str:
+    """
+    Summary of [text] keeping [percentage] of it, encoded when [encode].
+
+    In batch mode the text is returned as is, it is summarized later with
+    the rest of the run by `SummaryBatcher`.
+    """
+    if BATCH_SUMMARY:
+        return text
+
+    summary = extractive_summary(text, percentage=percentage)
+    return encode_body(summary) if encode else summary
+
+
+def mark_chunked(URL: str) -> None:
+    """
+    Record that the body of [URL] is already summarized and encoded
+    """
+    _CHUNKED.add(URL)
+
+
+def is_chunked(URL: str) -> bool:
+    return URL in _CHUNKED
+
+
+class SummaryBatcher:
+    """
+    Hands finished articles to [sink], summarizing their bodies and sub
+    headings in batches of `SUMMARY_BATCH_SIZE` when running in batch mode.
+    Bodies summarized in chunks are kept, only their sub headings are.
+    """
+
+    def __init__(self, sink, size: int = SUMMARY_BATCH_SIZE):
+        self.sink = sink
+        self.size = size
+        self.pending = []
+
+    def add(self, news, body_percentage: float, sub_heading_percentage: float = 0.8):
+        if not BATCH_SUMMARY:
+            self.sink(news)
+            return
+
+        self.pending.append((news, body_percentage, sub_heading_percentage))
+
+        if len(self.pending) >= self.size:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Summarize the pending articles together and hand them to the sink,
+        returns the number of articles flushed
+        """
+        if not self.pending:
+            return 0
+
+        texts, percentages = [], []
+
+        for news, body_percentage, sub_heading_percentage in self.pending:
+            body = "" if is_chunked(news.src) else news.body or ""
+            texts += [body, news.sub_heading or ""]
+            percentages += [body_percentage, sub_heading_percentage]
+
+        summaries = summarize_batch(texts, percentages)
+        Logger.info(f"TRACE: Summarized {len(self.pending)} articles in one batch")
+
+        pending, self.pending = self.pending, []
+
+        for index, (news, _, _) in enumerate(pending):
+            if not is_chunked(news.src):
+                news.body = encode_body(summaries[2 * index])
+
+            news.sub_heading = summaries[2 * index + 1] if news.sub_heading else ""
+            self.sink(news)
+
+        return len(pending)
@@ -0,0 +1,39 @@
+import os
+
+
+# --------------------- Constants ---------------------
+
+
+# Scrape unit handed to the entry point by the job runner, either an ISN
+# section URL or an NDTV page range like `pages:1-3`
+UNIT_SECTION = os.getenv("HISTRAL_SECTION", "")
+
+
+# --------------------- Common Functions ---------------------
+
+
+def unit_run_key(run_key: str) -> str:
+    """
+    Key of the crawl frontier for the current unit, so units of the same
+    run checkpoint independently
+    """
+    return f"{run_key}#{UNIT_SECTION}" if UNIT_SECTION else run_key
+
+
+def unit_sections(sections: list) -> list:
+    """
+    Sections to walk for the current unit, all of them outside the runner
+    """
+    return [UNIT_SECTION] if UNIT_SECTION else sections
+
+
+def unit_page_range() -> tuple:
+    """
+    (first, last) listing pages of the current unit, `last` is **None**
+    when the walk should only stop on the time window, e.g. for `pages:5-`
+    """
+    if not UNIT_SECTION.startswith("pages:"):
+        return 1, None
+
+    first, last = UNIT_SECTION.removeprefix("pages:").split("-")
+    return int(first), int(last) if last else None
@@ -0,0 +1,116 @@
+import re
+import hashlib
+
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
+
+
+# --------------------- Constants ---------------------
+
+
+# Query parameters only used to track clicks and campaigns, they never
+# select the content of a page
+TRACKING_PARAMS = frozenset(
+    {
+        "fbclid",
+        "gclid",
+        "dclid",
+        "msclkid",
+        "yclid",
+        "igshid",
+        "mc_cid",
+        "mc_eid",
+        "_ga",
+        "ref",
+        "ref_src",
+        "cmpid",
+        "ncid",
+        "ocid",
+        "amp_referrer",
+    }
+)
+TRACKING_PREFIXES = ("utm_", "itm_", "pk_", "mtm_")
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+_SLASHES_RE = re.compile(r"/{2,}")
+
+
+# --------------------- Common Functions ---------------------
+
+
+def _tracking(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def _remove_dots(path: str) -> str:
+    """
+    [path] without `.` and `..` segments
+    """
+    segments = []
+
+    for segment in path.split("/"):
+        if segment == "..":
+            if len(segments) > 1:
+                segments.pop()
+        elif segment != ".":
+            segments.append(segment)
+
+    # A path ending with a dot segment still names a directory
+    if path.endswith(("/.", "/..")):
+        segments.append("")
+
+    return "/".join(segments)
+
+
+def clean_url(URL: str, base: str = None) -> str:
+    """
+    Fetchable form of the link [URL] found on the page [base]: resolved
+    against it, with lower case scheme and host, no default port, no
+    tracking parameters, no fragment and no duplicate slashes
+    """
+    URL = URL.strip()
+
+    if base:
+        URL = urljoin(base, URL)
+
+    parts = urlsplit(URL)
+    scheme = (parts.scheme or "https").lower()
+    host = (parts.hostname or "").rstrip(".")
+
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    query = parts.query
+    params = parse_qsl(query, keep_blank_values=True)
+
+    # The query is only rebuilt when something is dropped, so its encoding
+    # is kept as the outlet wrote it
+    if any(_tracking(name) for name, _ in params):
+        query = urlencode(
+            [(name, value) for name, value in params if not _tracking(name)]
+        )
+
+    path = _remove_dots(_SLASHES_RE.sub("/", parts.path)) or "/"
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def canonical_url(URL: str, base: str = None) -> str:
+    """
+    Canonical form of the article [URL] that caches, dedup indexes and ids
+    key on: its clean form (see `clean_url`) without a trailing slash and
+    with sorted query parameters
+    """
+    parts = urlsplit(clean_url(URL, base))
+    path = parts.path.rstrip("/") or "/"
+    query = parse_qsl(parts.query, keep_blank_values=True)
+
+    return urlunsplit((parts.scheme, parts.netloc, path, urlencode(sorted(query)), ""))
+
+
+def article_id(URL: str) -> str:
+    """
+    Deterministic id of the article at [URL], the same for every variant
+    of its link
+    """
+    return hashlib.sha1(canonical_url(URL).encode("utf-8")).hexdigest()